@@ -0,0 +1,46 @@
+import logging
+import os
+
+from dotenv import load_dotenv
+
+import fluxcrystal
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+
+bot = fluxcrystal.GatewayBot(os.environ["FLUXER_TOKEN"])
+commands = fluxcrystal.CommandRouter(bot, prefixes="!")
+
+
+@commands.command()
+async def ping(ctx: fluxcrystal.Context) -> None:
+    """Replies with pong."""
+    _ = await ctx.reply("Pong! 🏓")
+
+
+# arguments are converted using the type hints, and everything after `*`
+# gets the rest of the message
+@commands.command(aliases=("say",))
+async def echo(ctx: fluxcrystal.Context, times: int = 1, *, text: str) -> None:
+    _ = await ctx.reply("\n".join([text] * min(times, 5)))
+
+
+@commands.command()
+async def tag(ctx: fluxcrystal.Context) -> None:
+    _ = await ctx.reply("Try `!tag show <name>`")
+
+
+# subcommands: `!tag show something`
+@tag.command()
+async def show(ctx: fluxcrystal.Context, name: str) -> None:
+    _ = await ctx.reply(f"There's no tag called {name!r} yet :(")
+
+
+@commands.on_error
+async def on_command_error(ctx: fluxcrystal.Context, error: fluxcrystal.CommandError) -> None:
+    _ = await ctx.reply(f"Oops: {error}")
+
+
+if __name__ == "__main__":
+    bot.run()
@@ -1,7 +1,25 @@
 from fluxcrystal.bot import GatewayBot as GatewayBot
+from fluxcrystal.broker import EventPublisher as EventPublisher, WorkerBot as WorkerBot
 
 from fluxcrystal.cache import Cache as Cache
 
+from fluxcrystal.cooldowns import (
+    BucketType as BucketType,
+    Cooldown as Cooldown,
+    FixedWindowCooldown as FixedWindowCooldown,
+    TokenBucketCooldown as TokenBucketCooldown,
+)
+
+from fluxcrystal.detection import RaidDetector as RaidDetector, SpamDetector as SpamDetector
+
+from fluxcrystal.filters import FilterEngine as FilterEngine, FilterRule as FilterRule
+
+from fluxcrystal.commands import (
+    Command as Command,
+    CommandRouter as CommandRouter,
+    Context as Context,
+)
+
 from fluxcrystal.events.base import Event as Event
 from fluxcrystal.events.channels import (
     ChannelCreateEvent as ChannelCreateEvent,
@@ -25,22 +43,64 @@ from fluxcrystal.events.messages import (
     MessageDeleteEvent as MessageDeleteEvent,
     MessageUpdateEvent as MessageUpdateEvent,
 )
+from fluxcrystal.events.moderation import (
+    RaidDetectedEvent as RaidDetectedEvent,
+    SpamDetectedEvent as SpamDetectedEvent,
+)
 
-from fluxcrystal.models.channels import Channel as Channel
+from fluxcrystal.models.channels import Channel as Channel, PermissionOverwrite as PermissionOverwrite
 from fluxcrystal.models.guilds import Guild as Guild, GuildMember as GuildMember, Role as Role
-from fluxcrystal.models.messages import Message as Message, RichEmbed as RichEmbed
+from fluxcrystal.models.messages import (
+    EmbedBuilder as EmbedBuilder,
+    EmbedTemplate as EmbedTemplate,
+    Message as Message,
+    RichEmbed as RichEmbed,
+)
+from fluxcrystal.models.permissions import Permissions as Permissions
+from fluxcrystal.models.serialization import decode_model as decode_model, encode_model as encode_model
+from fluxcrystal.models.snowflake import Snowflake as Snowflake, SnowflakeLike as SnowflakeLike
 from fluxcrystal.models.upload import Attachment as Attachment, AttachmentUpload as AttachmentUpload
 from fluxcrystal.models.users import User as User
 
+from fluxcrystal.bulk import (
+    BatchResult as BatchResult,
+    BulkOperation as BulkOperation,
+    BulkResult as BulkResult,
+    RequestBatch as RequestBatch,
+)
+from fluxcrystal.ratelimits import Priority as Priority, WaitStats as WaitStats
 from fluxcrystal.endpoint_client import RESTClient as RESTClient
 
-from fluxcrystal.errors import FluxCrystalError as FluxCrystalError, RateLimitedError as RateLimitedError
+from fluxcrystal.errors import (
+    ArgumentError as ArgumentError,
+    CommandError as CommandError,
+    CommandOnCooldownError as CommandOnCooldownError,
+    FluxCrystalError as FluxCrystalError,
+    RateLimitedError as RateLimitedError,
+)
 
 __all__ = [
     # Bot
     "GatewayBot",
+    "EventPublisher",
+    "WorkerBot",
     # Cache
     "Cache",
+    # Cooldowns
+    "BucketType",
+    "Cooldown",
+    "FixedWindowCooldown",
+    "TokenBucketCooldown",
+    # Detection
+    "RaidDetector",
+    "SpamDetector",
+    # Filters
+    "FilterEngine",
+    "FilterRule",
+    # Commands
+    "Command",
+    "CommandRouter",
+    "Context",
     # Events / gateway lifecycle
     "ReadyEvent",
     # Events / messages
@@ -62,6 +122,9 @@ __all__ = [
     "ChannelDeleteEvent",
     "ChannelUpdateEvent",
     "TypingStartEvent",
+    # Events / moderation
+    "RaidDetectedEvent",
+    "SpamDetectedEvent",
     # Models
     "Attachment",
     "AttachmentUpload",
@@ -69,12 +132,29 @@ __all__ = [
     "Guild",
     "GuildMember",
     "Message",
+    "PermissionOverwrite",
+    "Permissions",
     "RichEmbed",
+    "EmbedBuilder",
+    "EmbedTemplate",
     "Role",
+    "Snowflake",
+    "SnowflakeLike",
     "User",
+    "decode_model",
+    "encode_model",
     # REST
     "RESTClient",
+    "BulkOperation",
+    "BulkResult",
+    "RequestBatch",
+    "BatchResult",
+    "Priority",
+    "WaitStats",
     # Errors
+    "ArgumentError",
+    "CommandError",
+    "CommandOnCooldownError",
     "FluxCrystalError",
     "RateLimitedError",
 ]
@@ -7,11 +7,12 @@ import inspect
 import logging
 from collections import defaultdict
 from collections.abc import Callable, Coroutine
-from typing import TYPE_CHECKING, Any, TypeVar, get_type_hints, overload
+from typing import TYPE_CHECKING, Any, TypeVar, cast, get_type_hints, overload
 
 import anyio
 
 from fluxcrystal.cache import Cache
+from fluxcrystal.cooldowns import Cooldown
 from fluxcrystal.endpoint_client import RESTClient
 from fluxcrystal.endpoints import _REST_ENDPOINT
 from fluxcrystal.events.base import Event
@@ -47,6 +48,8 @@ EventT = TypeVar("EventT", bound=Event)
 
 # Callback type alias
 ListenerT = Callable[..., Coroutine[Any, Any, None]]
+# Raw hooks get the dispatch name and the untouched payload.
+RawListenerT = Callable[[str, dict[str, Any]], Coroutine[Any, Any, None]]
 
 # Gateway dispatch event name → event class factory.
 # Built automatically from event_name() classmethods so adding a new event
@@ -92,6 +95,10 @@ class GatewayBot:
     Args:
         token: Your bot token from the Fluxer developer portal.
         base_url: Override this if you're running against a self-hosted Fluxer instance.
+        max_messages: How many messages to keep in the cache across all
+            channels. Off (``0``) by default.
+        max_messages_per_channel: How many recent messages to keep per channel
+            when the message cache is on (at least 1).
     """
 
     # REST client (messages, guilds, etc)
@@ -105,12 +112,22 @@ class GatewayBot:
         token: str,
         *,
         base_url: str = _REST_ENDPOINT,
+        max_messages: int = 0,
+        max_messages_per_channel: int = 100,
     ) -> None:
         self._token = token
         self.rest = RESTClient(base_url=base_url, token=token)
-        self.cache = Cache()
+        self.cache = Cache(
+            max_messages=max_messages,
+            max_messages_per_channel=max_messages_per_channel,
+        )
         # event_class → list of async callbacks
         self._listeners: defaultdict[type[Event], list[ListenerT]] = defaultdict(list)
+        # (event_class, callback) → cooldown it was registered with (only ones
+        # that have one); the same callback can listen to several events
+        self._cooldowns: dict[tuple[type[Event], ListenerT], Cooldown] = {}
+        # dispatch name (None = every dispatch) → list of raw hooks
+        self._raw_listeners: defaultdict[str | None, list[RawListenerT]] = defaultdict(list)
         # Cancel scope for programmatic stop
         self._cancel_scope: anyio.CancelScope | None = None
 
@@ -118,9 +135,18 @@ class GatewayBot:
         self,
         event_type: type[EventT],
         callback: Callable[[EventT], Coroutine[Any, Any, None]],
+        *,
+        cooldown: Cooldown | None = None,
     ) -> None:
-        """Register a callback to fire when `event_type` events come in."""
+        """
+        Register a callback to fire when `event_type` events come in.
+
+        If a `cooldown` is given, events that hit it are dropped before the
+        callback runs.
+        """
         self._listeners[event_type].append(callback)
+        if cooldown is not None:
+            self._cooldowns[(event_type, callback)] = cooldown
 
     def unsubscribe(
         self,
@@ -128,27 +154,57 @@ class GatewayBot:
         callback: Callable[[EventT], Coroutine[Any, Any, None]],
     ) -> None:
         """Stop a previously-registered callback from firing."""
+        listeners = self._listeners[event_type]
         try:
-            self._listeners[event_type].remove(callback)
+            listeners.remove(callback)
         except ValueError:
             pass
+        if callback not in listeners:
+            self._cooldowns.pop((event_type, callback), None)
+
+    def subscribe_raw(self, callback: RawListenerT, *event_names: str) -> None:
+        """
+        Register a hook that gets gateway dispatches as raw payloads, before
+        any event object is built. Called as ``callback(event_name, data)``
+        for each of `event_names` (ie ``"MESSAGE_CREATE"``), or for every
+        dispatch if none are given.
+
+        Hooks run after the cache has been updated. Treat `data` as
+        read-only, it's the same dict the event gets built from.
+        """
+        for name in event_names or (None,):
+            self._raw_listeners[name].append(callback)
+
+    def unsubscribe_raw(self, callback: RawListenerT, *event_names: str) -> None:
+        """Remove a hook registered with `subscribe_raw`."""
+        for name in event_names or (None,):
+            try:
+                self._raw_listeners[name].remove(callback)
+            except ValueError:
+                pass
 
     @overload
     def listen(
         self,
         event_type: type[EventT],
+        *,
+        cooldown: Cooldown | None = None,
     ) -> Callable[[Callable[[EventT], Coroutine[Any, Any, None]]], Callable[[EventT], Coroutine[Any, Any, None]]]:
         ...
 
     @overload
     def listen(
         self,
+        *,
+        cooldown: Cooldown | None = None,
     ) -> Callable[[Callable[[EventT], Coroutine[Any, Any, None]]], Callable[[EventT], Coroutine[Any, Any, None]]]:
         ...
 
     def listen(
         self,
         event_type: type[EventT] | None = None,
+        *,
+        cooldown: Cooldown | None = None,
     ) -> Callable[..., Any]:
         """
         Decorator to register an async function as an event listener.
@@ -167,6 +223,8 @@ class GatewayBot:
             @bot.listen()
             async def on_message(event: fluxcrystal.MessageCreateEvent) -> None:
                 ...
+
+        Pass a `fluxcrystal.Cooldown` as `cooldown` to rate limit the listener.
         """
 
         def decorator(
@@ -191,7 +249,7 @@ class GatewayBot:
                         "type explicitly: @bot.listen(SomeEvent)."
                     )
 
-            self.subscribe(resolved, func)
+            self.subscribe(resolved, func, cooldown=cooldown)
             return func
 
         return decorator
@@ -208,7 +266,13 @@ class GatewayBot:
         events (useful for testing).
         """
         event_type = type(event)
+        cooldowns = self._cooldowns
         for listener in list(self._listeners.get(event_type, [])):
+            if cooldowns:
+                cooldown = cooldowns.get((event_type, listener))
+                if cooldown is not None and cooldown.hit(event):
+                    log.debug("Listener %r is on cooldown, skipping", listener)
+                    continue
             try:
                 await listener(event)
             except Exception:
@@ -227,14 +291,31 @@ class GatewayBot:
     ) -> None:
         """Called by the gateway when a DISPATCH event comes in."""
         # Update cache before dispatching to listeners.
-        self.cache._update(event_name, data)
+        previous = self.cache._update(event_name, data)
+
+        raw_listeners = self._raw_listeners
+        if raw_listeners:
+            for hooks in (raw_listeners.get(event_name), raw_listeners.get(None)):
+                for hook in list(hooks or ()):
+                    try:
+                        await hook(event_name, data)
+                    except Exception:
+                        log.exception(
+                            "Unhandled exception in raw hook %r for %r", hook, event_name
+                        )
 
         event_cls = _EVENT_REGISTRY.get(event_name)
         if event_cls is None:
-            return  # No listener registered for this event type
+            return  # No event class for this dispatch
+        if not self._listeners.get(event_cls):
+            return  # Nobody's listening, so don't bother building the event
 
         try:
-            event: Event = event_cls(self, data)
+            if previous is None:
+                event: Event = event_cls(self, data)
+            else:
+                # Events that can carry cached "before" state take it third.
+                event = cast(Any, event_cls)(self, data, previous)
         except Exception:
             log.exception(
                 "Failed to construct event %r from gateway data", event_name
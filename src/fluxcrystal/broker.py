@@ -0,0 +1,263 @@
+"""
+Fan gateway events out to worker processes.
+
+One process owns the gateway connection and cache, and publishes every
+dispatch over a Unix socket:
+
+    bot = fluxcrystal.GatewayBot(token)
+    publisher = fluxcrystal.EventPublisher(bot, "/tmp/fluxcrystal.sock")
+
+    async def main() -> None:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(publisher.serve)
+            await bot.start()
+
+Any number of workers connect to it and run listeners as usual, with no
+WebSocket of their own:
+
+    worker = fluxcrystal.WorkerBot(token, "/tmp/fluxcrystal.sock")
+
+    @worker.listen()
+    async def on_message(event: fluxcrystal.MessageCreateEvent) -> None:
+        ...
+
+    worker.run()
+
+Workers only get the dispatches they have listeners for (or the names
+given as `events`), and can drop more with a `filter` before any event is
+built. Frames are a 4-byte big-endian length followed by JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import anyio
+from anyio.abc import ByteStream, SocketStream
+from anyio.streams.buffered import BufferedByteReceiveStream
+from anyio.streams.memory import MemoryObjectSendStream
+
+from fluxcrystal.bot import _EVENT_REGISTRY, GatewayBot
+from fluxcrystal.endpoints import _REST_ENDPOINT
+
+log = logging.getLogger("fluxcrystal.broker")
+
+# Frames bigger than this are a corrupt stream, not a real payload.
+_MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Dispatches buffered per worker before new ones get dropped for it.
+_WORKER_BUFFER = 10_000
+
+# Subscription filter for one worker: None means every dispatch.
+_Subscription = frozenset[str] | None
+
+# Worker-side filter: return False to drop a dispatch.
+DispatchFilter = Callable[[str, dict[str, Any]], bool]
+
+
+def _encode_frame(obj: Any) -> bytes:
+    payload = json.dumps(obj, separators=(",", ":")).encode()
+    return len(payload).to_bytes(4, "big") + payload
+
+
+async def _receive_frame(stream: BufferedByteReceiveStream) -> Any:
+    size = int.from_bytes(await stream.receive_exactly(4), "big")
+    if size > _MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {size} bytes is too big")
+    return json.loads(await stream.receive_exactly(size))
+
+
+class _Worker:
+    __slots__ = ("name", "events", "send")
+
+    def __init__(self, name: str, send: MemoryObjectSendStream[bytes]) -> None:
+        self.name = name
+        self.events: _Subscription = frozenset()
+        self.send = send
+
+
+class EventPublisher:
+    """
+    The gateway side: publishes `bot`'s raw dispatches (after its cache has
+    been updated) to every connected `WorkerBot`.
+
+    Args:
+        bot: The bot that owns the gateway connection.
+        path: Where to create the Unix socket.
+    """
+
+    def __init__(self, bot: GatewayBot, path: str | os.PathLike[str]) -> None:
+        self.bot = bot
+        self.path = os.fspath(path)
+        self._workers: list[_Worker] = []
+        self._count = 0
+        bot.subscribe_raw(self._publish)
+
+    @property
+    def workers(self) -> int:
+        """How many workers are connected."""
+        return len(self._workers)
+
+    def close(self) -> None:
+        """Stop publishing. `serve` keeps running until cancelled."""
+        self.bot.unsubscribe_raw(self._publish)
+
+    async def serve(self) -> None:
+        """Accept workers until cancelled."""
+        listener = await anyio.create_unix_listener(self.path)
+        log.info("Publishing events on %s", self.path)
+        try:
+            async with listener:
+                await listener.serve(self._handle_worker)
+        finally:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    async def _publish(self, event_name: str, data: dict[str, Any]) -> None:
+        frame: bytes | None = None
+        for worker in self._workers:
+            if worker.events is not None and event_name not in worker.events:
+                continue
+            if frame is None:
+                # Only encoded if someone wants it, and only once.
+                frame = _encode_frame([event_name, data])
+            try:
+                worker.send.send_nowait(frame)
+            except anyio.WouldBlock:
+                log.warning("Worker %s is falling behind, dropped %s", worker.name, event_name)
+
+    async def _handle_worker(self, stream: SocketStream) -> None:
+        self._count += 1
+        send, receive = anyio.create_memory_object_stream[bytes](_WORKER_BUFFER)
+        worker = _Worker(f"#{self._count}", send)
+        self._workers.append(worker)
+        log.info("Worker %s connected", worker.name)
+        try:
+            async with stream, receive, anyio.create_task_group() as tg:
+                tg.start_soon(self._read_subscriptions, worker, stream, tg.cancel_scope)
+                async for frame in receive:
+                    await stream.send(frame)
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+            pass
+        finally:
+            self._workers.remove(worker)
+            send.close()
+            log.info("Worker %s disconnected", worker.name)
+
+    async def _read_subscriptions(
+        self, worker: _Worker, stream: ByteStream, scope: anyio.CancelScope
+    ) -> None:
+        # Workers send their subscription on connect, and again whenever it
+        # changes. The stream ending means the worker's gone.
+        buffered = BufferedByteReceiveStream(stream)
+        try:
+            while True:
+                message = await _receive_frame(buffered)
+                events = message.get("events")
+                worker.events = None if events is None else frozenset(events)
+                log.debug("Worker %s subscribed to %s", worker.name, events or "everything")
+        except (anyio.IncompleteRead, anyio.EndOfStream, anyio.BrokenResourceError):
+            pass
+        except (ValueError, AttributeError) as e:
+            log.warning("Bad frame from worker %s: %s", worker.name, e)
+        scope.cancel()
+
+
+class WorkerBot(GatewayBot):
+    """
+    A `GatewayBot` that gets its events from an `EventPublisher` instead of
+    connecting to the gateway itself. Listeners, raw hooks, commands and the
+    REST client all work as usual.
+
+    The cache only sees the dispatches this worker receives, so it's much
+    emptier than the publisher's - fetch what you need over REST.
+
+    Args:
+        token: Your bot token (used for REST).
+        path: The publisher's Unix socket.
+        events: Dispatch names to subscribe to (ie ``"MESSAGE_CREATE"``).
+            By default, whatever this bot has listeners or raw hooks for
+            when it connects.
+        filter: Called as ``filter(event_name, data)`` for each dispatch;
+            returning False drops it before the cache or any listener sees
+            it.
+        base_url: As for `GatewayBot`.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        path: str | os.PathLike[str],
+        *,
+        events: Iterable[str] | None = None,
+        filter: DispatchFilter | None = None,
+        base_url: str = _REST_ENDPOINT,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(token, base_url=base_url, **kwargs)
+        self.path = os.fspath(path)
+        self.events: frozenset[str] | None = None if events is None else frozenset(events)
+        self.filter = filter
+        self._stream: SocketStream | None = None
+
+    def subscriptions(self) -> frozenset[str] | None:
+        """The dispatch names this worker asks for (None for everything)."""
+        if self.events is not None:
+            return self.events
+        if self._raw_listeners.get(None):
+            return None
+        names = {name for name, hooks in self._raw_listeners.items() if name and hooks}
+        for name, event_cls in _EVENT_REGISTRY.items():
+            if self._listeners.get(event_cls):
+                names.add(name)
+        return frozenset(names)
+
+    async def resubscribe(self) -> None:
+        """Tell the publisher about listeners added since connecting."""
+        if self._stream is not None:
+            await self._send_subscriptions(self._stream)
+
+    async def _send_subscriptions(self, stream: SocketStream) -> None:
+        events = self.subscriptions()
+        await stream.send(_encode_frame({"events": None if events is None else sorted(events)}))
+
+    async def start(self) -> None:
+        """Connect to the publisher and process events until stopped."""
+        async with self.rest:
+            with anyio.CancelScope() as self._cancel_scope:
+                while True:
+                    try:
+                        await self._consume()
+                    except (
+                        OSError,
+                        anyio.EndOfStream,
+                        anyio.IncompleteRead,
+                        anyio.BrokenResourceError,
+                    ) as e:
+                        log.warning(
+                            "Lost the publisher (%s: %s), reconnecting…", type(e).__name__, e
+                        )
+                    except ValueError as e:
+                        log.warning("Bad frame from the publisher (%s), reconnecting…", e)
+                    await anyio.sleep(2.0)
+
+    async def _consume(self) -> None:
+        async with await anyio.connect_unix(self.path) as stream:
+            log.info("Connected to publisher at %s", self.path)
+            self._stream = stream
+            try:
+                await self._send_subscriptions(stream)
+                buffered = BufferedByteReceiveStream(stream)
+                while True:
+                    event_name, data = await _receive_frame(buffered)
+                    if self.filter is not None and not self.filter(event_name, data):
+                        continue
+                    await self._on_raw_dispatch(event_name, data)
+            finally:
+                self._stream = None
@@ -0,0 +1,374 @@
+"""
+Bulk REST operations that run concurrently and report progress.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Iterable
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+import anyio
+from anyio.abc import TaskGroup
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+from fluxcrystal.models.snowflake import Snowflake, SnowflakeLike
+from fluxcrystal.ratelimits import Priority, _current_priority
+
+# How many requests run at once per route on routes whose limits we haven't
+# seen yet.
+_DEFAULT_BULK_CONCURRENCY = 5
+
+if TYPE_CHECKING:
+    from fluxcrystal.endpoint_client import RESTClient
+
+# The batch the current task's requests belong to, so `RESTClient._request`
+# can hold them to the batch's per-bucket concurrency.
+_current_batch: ContextVar[RequestBatch | None] = ContextVar("fluxcrystal_batch", default=None)
+
+
+class BulkResult:
+    """How one item of a `BulkOperation` went."""
+
+    __slots__ = ("id", "error")
+
+    def __init__(self, id: Snowflake, error: Exception | None = None) -> None:
+        #: The user (or other thing) this result is for.
+        self.id: Snowflake = id
+        #: What went wrong, or None if it worked.
+        self.error: Exception | None = error
+
+    @property
+    def ok(self) -> bool:
+        """True if the request succeeded."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"<BulkResult id={self.id!r} ok={self.ok!r}>"
+
+
+class BulkOperation:
+    """
+    The same request run for a lot of IDs at once (ie banning every user in
+    a raid), as many at a time as the route's rate limit allows.
+
+    Use it as an async context manager and iterate it to get a `BulkResult`
+    per ID as each one finishes:
+
+        async with bot.rest.bulk_ban(guild_id, raiders, reason="raid") as op:
+            async for result in op:
+                if not result.ok:
+                    log.warning("Couldn't ban %s: %s", result.id, result.error)
+
+    Leaving the block waits for every ID to finish. Leaving it with an
+    exception (or calling `cancel`) stops it instead; anything not done yet
+    is in `remaining`, which you can pass to a new bulk call to pick up
+    where it left off.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[Snowflake], Awaitable[Any]],
+        ids: Iterable[SnowflakeLike],
+        *,
+        concurrency: int,
+    ) -> None:
+        self._func = func
+        # Dedupe but keep order, so `remaining` is a stable checkpoint.
+        self._pending: dict[Snowflake, None] = dict.fromkeys(Snowflake(i) for i in ids)
+        self._queue: deque[Snowflake] = deque(self._pending)
+        self._concurrency = max(1, min(concurrency, len(self._pending) or 1))
+        self.succeeded: int = 0
+        self.failed: list[BulkResult] = []
+        self._task_group: TaskGroup | None = None
+        # Only covers the workers, so cancelling doesn't interrupt the
+        # caller's `async with` body.
+        self._scope = anyio.CancelScope()
+        self._send: MemoryObjectSendStream[BulkResult] | None = None
+        self._receive: MemoryObjectReceiveStream[BulkResult] | None = None
+
+    @property
+    def total(self) -> int:
+        """How many IDs this operation started with (after removing duplicates)."""
+        return self.succeeded + len(self.failed) + len(self._pending)
+
+    @property
+    def remaining(self) -> list[Snowflake]:
+        """IDs that haven't finished yet, in their original order."""
+        return list(self._pending)
+
+    async def __aenter__(self) -> BulkOperation:
+        self._send, self._receive = anyio.create_memory_object_stream[BulkResult](math.inf)
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+        self._task_group.start_soon(self._run)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> bool | None:
+        assert self._task_group is not None and self._receive is not None
+        if exc_info[0] is not None:
+            self._scope.cancel()
+        try:
+            # The body's exception (if any) propagates on its own; passing it
+            # in would get it wrapped in an ExceptionGroup.
+            await self._task_group.__aexit__(None, None, None)
+        finally:
+            self._receive.close()
+        return None
+
+    def __aiter__(self) -> AsyncIterator[BulkResult]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[BulkResult]:
+        if self._receive is None:
+            raise RuntimeError("Use `async with` on a BulkOperation before iterating it")
+        async for result in self._receive:
+            yield result
+
+    async def wait(self) -> list[BulkResult]:
+        """Run to the end and return every result (in completion order)."""
+        return [result async for result in self]
+
+    def cancel(self) -> None:
+        """Stop starting new requests and abandon the in-flight ones."""
+        self._scope.cancel()
+
+    async def _run(self) -> None:
+        assert self._send is not None
+        async with self._send:
+            with self._scope:
+                async with anyio.create_task_group() as tg:
+                    for _ in range(self._concurrency):
+                        tg.start_soon(self._worker)
+
+    async def _worker(self) -> None:
+        assert self._send is not None
+        queue = self._queue
+        while queue:
+            id = queue.popleft()
+            try:
+                await self._func(id)
+            except Exception as e:
+                result = BulkResult(id, e)
+                self.failed.append(result)
+            else:
+                result = BulkResult(id)
+                self.succeeded += 1
+            self._pending.pop(id, None)
+            await self._send.send(result)
+
+    def __repr__(self) -> str:
+        return (
+            f"<BulkOperation succeeded={self.succeeded} failed={len(self.failed)} "
+            f"remaining={len(self._pending)}>"
+        )
+
+
+class BatchResult:
+    """
+    One call queued on a `RequestBatch`. Filled in once the call finishes.
+    """
+
+    __slots__ = ("method", "args", "kwargs", "value", "error", "_done")
+
+    def __init__(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        #: The `RESTClient` method called, ie ``"fetch_user"``.
+        self.method: str = method
+        self.args: tuple[Any, ...] = args
+        self.kwargs: dict[str, Any] = kwargs
+        #: What the call returned, once it has.
+        self.value: Any = None
+        #: What went wrong, or None if it worked (or hasn't finished).
+        self.error: Exception | None = None
+        self._done = anyio.Event()
+
+    @property
+    def done(self) -> bool:
+        """True once the call has finished, either way."""
+        return self._done.is_set()
+
+    @property
+    def ok(self) -> bool:
+        """True if the call finished and succeeded."""
+        return self.done and self.error is None
+
+    def unwrap(self) -> Any:
+        """The call's return value, raising its error if it failed."""
+        if not self.done:
+            raise RuntimeError(f"{self.method} hasn't finished yet")
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    async def wait(self) -> Any:
+        """Wait for the call to finish, then `unwrap` it."""
+        await self._done.wait()
+        return self.unwrap()
+
+    def __repr__(self) -> str:
+        state = "pending" if not self.done else "ok" if self.error is None else "failed"
+        return f"<BatchResult {self.method}{self.args!r} {state}>"
+
+
+_READ_ONLY_PREFIXES = ("fetch_", "get_")
+
+
+def _call_key(method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable | None:
+    if not method.startswith(_READ_ONLY_PREFIXES):
+        return None  # sending a message or banning twice has to happen twice
+    # IDs passed as strings and ints are the same call.
+    def norm(value: Any) -> Any:
+        return Snowflake(value) if isinstance(value, str) and value.isdigit() else value
+
+    key = (method, tuple(map(norm, args)), tuple(sorted((k, norm(v)) for k, v in kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None  # unhashable arguments just don't get deduplicated
+    return key
+
+
+class RequestBatch:
+    """
+    A lot of independent REST calls (fetching 500 members, say) run
+    concurrently, without one failure sinking the rest. Get one with
+    `RESTClient.batch`:
+
+        async with bot.rest.batch() as batch:
+            for user_id in user_ids:
+                batch.fetch_guild_member(guild_id, user_id)
+            async for result in batch:  # as they finish
+                ...
+        members = [r.value for r in batch.results if r.ok]  # in call order
+
+    Any public `RESTClient` method can be queued by calling it on the batch;
+    calls start straight away and are run as many at a time per rate limit
+    bucket as the bucket allows (or `concurrency`). Identical reads
+    (``fetch_*`` and ``get_*`` calls) are only sent once and share a
+    `BatchResult`; everything else is sent as many times as it's queued.
+    Leaving the block waits for
+    everything queued; leaving it with an exception cancels what's left.
+    """
+
+    def __init__(
+        self,
+        rest: RESTClient,
+        *,
+        concurrency: int | None = None,
+        priority: Priority | None = None,
+    ) -> None:
+        self._rest = rest
+        self._concurrency = concurrency
+        self._priority = priority
+        #: Every queued call's result, in the order they were queued.
+        self.results: list[BatchResult] = []
+        self._unique: dict[Hashable, BatchResult] = {}
+        self._started: int = 0
+        self._yielded: int = 0
+        # bucket id (or the bucket itself, until the API names it) → limiter
+        self._limiters: dict[Hashable, anyio.CapacityLimiter] = {}
+        self._task_group: TaskGroup | None = None
+        self._send: MemoryObjectSendStream[BatchResult] | None = None
+        self._receive: MemoryObjectReceiveStream[BatchResult] | None = None
+
+    async def __aenter__(self) -> RequestBatch:
+        self._send, self._receive = anyio.create_memory_object_stream[BatchResult](math.inf)
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> bool | None:
+        assert self._task_group is not None and self._send is not None
+        if exc_info[0] is not None:
+            self._task_group.cancel_scope.cancel()
+        try:
+            # The body's exception propagates as it is; only failures from the
+            # task group itself (there shouldn't be any) come out of here.
+            await self._task_group.__aexit__(None, None, None)
+        finally:
+            self._send.close()
+            self._task_group = None
+        return None
+
+    def __getattr__(self, name: str) -> Callable[..., BatchResult]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        getattr(self._rest, name)  # raise AttributeError for typos now
+
+        def queue(*args: Any, **kwargs: Any) -> BatchResult:
+            return self.call(name, *args, **kwargs)
+
+        queue.__name__ = name
+        return queue
+
+    def call(self, method: str, /, *args: Any, **kwargs: Any) -> BatchResult:
+        """
+        Queue ``rest.<method>(*args, **kwargs)``. ``batch.call("fetch_user",
+        id)`` is the same as ``batch.fetch_user(id)``.
+        """
+        if self._task_group is None:
+            raise RuntimeError("Use `async with` on a RequestBatch before queueing calls")
+        key = _call_key(method, args, kwargs)
+        result = self._unique.get(key) if key is not None else None
+        if result is None:
+            result = BatchResult(method, args, kwargs)
+            if key is not None:
+                self._unique[key] = result
+            self._started += 1
+            self._task_group.start_soon(self._run, result, getattr(self._rest, method))
+        self.results.append(result)
+        return result
+
+    async def _run(self, result: BatchResult, func: Callable[..., Awaitable[Any]]) -> None:
+        assert self._send is not None
+        _current_batch.set(self)
+        if self._priority is not None:
+            _current_priority.set(self._priority)
+        try:
+            result.value = await func(*result.args, **result.kwargs)
+        except Exception as e:
+            result.error = e
+        result._done.set()
+        await self._send.send(result)
+
+    def _limiter(self, key: str) -> anyio.CapacityLimiter:
+        """
+        The limiter for requests on route `key`, sized to its bucket. Routes
+        the API says share a bucket share a limiter too.
+        """
+        bucket = self._rest.ratelimits.bucket(key)
+        capacity = bucket.limit or _DEFAULT_BULK_CONCURRENCY
+        if self._concurrency is not None:
+            capacity = min(capacity, self._concurrency)
+        bucket_key: Hashable = bucket.id if bucket.id is not None else bucket
+        limiter = self._limiters.get(bucket_key)
+        if limiter is None:
+            limiter = self._limiters[bucket_key] = anyio.CapacityLimiter(capacity)
+        elif limiter.total_tokens != capacity:
+            # The bucket's real limit has turned up since.
+            limiter.total_tokens = capacity
+        return limiter
+
+    def __aiter__(self) -> AsyncIterator[BatchResult]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[BatchResult]:
+        """Each distinct call's result as it finishes, until all queued so far are done."""
+        if self._receive is None:
+            raise RuntimeError("Use `async with` on a RequestBatch before iterating it")
+        while self._yielded < self._started:
+            result = await self._receive.receive()
+            self._yielded += 1
+            yield result
+
+    async def wait(self) -> list[BatchResult]:
+        """Wait for everything queued so far and return `results`."""
+        for result in list(self.results):
+            await result._done.wait()
+        return self.results
+
+    def __repr__(self) -> str:
+        done = sum(1 for r in self.results if r.done)
+        return f"<RequestBatch calls={len(self.results)} done={done}>"
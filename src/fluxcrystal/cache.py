@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import bisect
+import copy
 import logging
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 from fluxcrystal.models.channels import Channel
-from fluxcrystal.models.guilds import Guild
+from fluxcrystal.models.guilds import Guild, GuildMember, Role
+from fluxcrystal.models.messages import Message
+from fluxcrystal.models.permissions import Permissions
+from fluxcrystal.models.snowflake import Snowflake, SnowflakeLike
 from fluxcrystal.models.users import User
 
 log = logging.getLogger("fluxcrystal.cache")
@@ -12,37 +19,440 @@ log = logging.getLogger("fluxcrystal.cache")
 
 class Cache:
     """
-    Caches guilds, channels, and users from the gateway.
+    Caches guilds, channels, users, and guild members from the gateway.
+
+    Messages are only cached if you opt in with `max_messages`.
+
+    Args:
+        max_messages: Upper bound on cached messages across all channels.
+            ``0`` (the default) disables the message cache.
+        max_messages_per_channel: How many of the most recent messages to
+            keep for each channel. At least 1.
+
+    Raises:
+        ValueError: If `max_messages` is negative or
+            `max_messages_per_channel` is below 1.
     """
 
-    def __init__(self) -> None:
-        self.guilds: dict[str, Guild] = {}
-        self.channels: dict[str, Channel] = {}
-        self.users: dict[str, User] = {}
+    def __init__(
+        self,
+        *,
+        max_messages: int = 0,
+        max_messages_per_channel: int = 100,
+    ) -> None:
+        if max_messages < 0:
+            raise ValueError("max_messages can't be negative (use 0 to turn the message cache off)")
+        if max_messages_per_channel < 1:
+            raise ValueError("max_messages_per_channel must be at least 1")
+        self.max_messages = max_messages
+        self.max_messages_per_channel = max_messages_per_channel
+        self.guilds: dict[Snowflake, Guild] = {}
+        self.channels: dict[Snowflake, Channel] = {}
+        self.users: dict[Snowflake, User] = {}
+        #: Guild members keyed by ``(guild_id, user_id)``. Each member's
+        #: ``user`` is the same instance stored in `users`.
+        self.members: dict[tuple[Snowflake, Snowflake], GuildMember] = {}
         self.me: User | None = None
+        # guild_id → ids of the channels in it
+        self._guild_channels: dict[Snowflake, set[Snowflake]] = {}
+        # parent (category) id → (position, channel_id) of its children, kept sorted
+        self._channel_children: dict[Snowflake, list[tuple[int, Snowflake]]] = {}
+        # guild_id → ids of the members we have cached for it
+        self._guild_members: dict[Snowflake, set[Snowflake]] = {}
+        # message_id → message, oldest first so the global ceiling evicts in order
+        self._messages: OrderedDict[Snowflake, Message] = OrderedDict()
+        # channel_id → ring buffer of the most recent message ids in it
+        self._channel_messages: dict[Snowflake, deque[Snowflake]] = {}
+        # guild_id → role_id → ids of the members holding that role
+        self._role_members: dict[Snowflake, dict[Snowflake, set[Snowflake]]] = {}
+        # guild_id → counter bumped whenever the guild's roles change
+        self._role_versions: dict[Snowflake, int] = {}
+        # guild_id → (role version, member roles → resolved permissions)
+        self._permission_memo: dict[
+            Snowflake, tuple[int, dict[frozenset[Snowflake], Permissions]]
+        ] = {}
 
-    def get_guild(self, guild_id: str) -> Guild | None:
+    def get_guild(self, guild_id: SnowflakeLike) -> Guild | None:
         """Grab a guild by ID, or None if we haven't seen it."""
-        return self.guilds.get(guild_id)
+        return self.guilds.get(Snowflake(guild_id))
 
-    def get_channel(self, channel_id: str) -> Channel | None:
+    def get_channel(self, channel_id: SnowflakeLike) -> Channel | None:
         """Grab a channel by ID, or None if we haven't seen it."""
-        return self.channels.get(channel_id)
+        return self.channels.get(Snowflake(channel_id))
+
+    def guild_channels(self, guild_id: SnowflakeLike) -> list[Channel]:
+        """Every cached channel in a guild, in no particular order."""
+        channels = self.channels
+        return [channels[cid] for cid in self._guild_channels.get(Snowflake(guild_id), ())]
+
+    def children(self, category_id: SnowflakeLike) -> list[Channel]:
+        """The channels under a category, ordered by position."""
+        channels = self.channels
+        return [
+            channels[cid]
+            for _, cid in self._channel_children.get(Snowflake(category_id), ())
+        ]
 
-    def get_user(self, user_id: str) -> User | None:
+    def get_message(self, message_id: SnowflakeLike) -> Message | None:
+        """Grab a cached message by ID, or None if it isn't (or is no longer) cached."""
+        return self._messages.get(Snowflake(message_id))
+
+    def channel_messages(self, channel_id: SnowflakeLike) -> list[Message]:
+        """The cached messages for a channel, oldest first."""
+        messages = self._messages
+        return [
+            messages[mid]
+            for mid in self._channel_messages.get(Snowflake(channel_id), ())
+        ]
+
+    def get_user(self, user_id: SnowflakeLike) -> User | None:
         """Grab a user by ID, or None if we haven't seen them."""
-        return self.users.get(user_id)
+        return self.users.get(Snowflake(user_id))
+
+    def get_member(
+        self, guild_id: SnowflakeLike, user_id: SnowflakeLike
+    ) -> GuildMember | None:
+        """Grab a guild member, or None if we haven't seen them in that guild."""
+        return self.members.get((Snowflake(guild_id), Snowflake(user_id)))
+
+    def iter_members(self, guild_id: SnowflakeLike) -> Iterator[GuildMember]:
+        """Iterate over every cached member of a guild."""
+        gid = Snowflake(guild_id)
+        for user_id in tuple(self._guild_members.get(gid, ())):
+            member = self.members.get((gid, user_id))
+            if member is not None:
+                yield member
+
+    def members_with_role(
+        self, guild_id: SnowflakeLike, role_id: SnowflakeLike
+    ) -> list[GuildMember]:
+        """Every cached member of a guild that has the given role."""
+        gid = Snowflake(guild_id)
+        user_ids = self._role_members.get(gid, {}).get(Snowflake(role_id))
+        if not user_ids:
+            return []
+        members = self.members
+        return [members[(gid, uid)] for uid in user_ids if (gid, uid) in members]
+
+    def get_role(self, guild_id: SnowflakeLike, role_id: SnowflakeLike) -> Role | None:
+        """Grab a role from a cached guild, or None if we don't know it."""
+        guild = self.guilds.get(Snowflake(guild_id))
+        if guild is None:
+            return None
+        return guild.roles.get(Snowflake(role_id))
+
+    # ------------------------------------------------------------------
+    # Permissions
+    # ------------------------------------------------------------------
+
+    def compute_permissions(
+        self, guild_id: SnowflakeLike, user_id: SnowflakeLike
+    ) -> Permissions | None:
+        """
+        Work out a member's guild-wide permissions from cached roles.
+
+        Returns None if the guild or member isn't cached. Results are memoized
+        per (member roles, guild role version), so repeated checks are a dict
+        lookup until the guild's roles change.
+        """
+        guild_id = Snowflake(guild_id)
+        user_id = Snowflake(user_id)
+        guild = self.guilds.get(guild_id)
+        member = self.members.get((guild_id, user_id))
+        if guild is None or member is None:
+            return None
+        if guild.owner_id == user_id:
+            return Permissions.all()
+
+        version = self._role_versions.get(guild_id, 0)
+        memo = self._permission_memo.get(guild_id)
+        if memo is None or memo[0] != version:
+            memo = (version, {})
+            self._permission_memo[guild_id] = memo
+        table = memo[1]
+
+        # Order doesn't matter, so members with the same roles share an entry.
+        key = frozenset(member.roles)
+        perms = table.get(key)
+        if perms is None:
+            roles = guild.roles
+            everyone = roles.get(guild_id)
+            value = everyone.permissions if everyone is not None else 0
+            for role_id in key:
+                role = roles.get(role_id)
+                if role is not None:
+                    value |= role.permissions
+            if value & Permissions.ADMINISTRATOR:
+                perms = Permissions.all()
+            else:
+                perms = Permissions(value)
+            table[key] = perms
+        return perms
+
+    def compute_channel_permissions(
+        self, channel_id: SnowflakeLike, user_id: SnowflakeLike
+    ) -> Permissions | None:
+        """
+        Work out a member's permissions in a specific channel, applying the
+        channel's overwrites on top of their guild permissions.
+
+        Returns None for DM channels or when the channel, guild or member
+        isn't cached.
+        """
+        channel = self.channels.get(Snowflake(channel_id))
+        if channel is None or channel.guild_id is None:
+            return None
+        guild_id = channel.guild_id
+        user_id = Snowflake(user_id)
+        base = self.compute_permissions(guild_id, user_id)
+        if base is None or base & Permissions.ADMINISTRATOR:
+            return base
+
+        overwrites = channel.permission_overwrites
+        if not overwrites:
+            return base
+
+        value = int(base)
+        everyone = overwrites.get(guild_id)
+        if everyone is not None:
+            value = (value & ~everyone.deny) | everyone.allow
+
+        allow = deny = 0
+        member = self.members[(guild_id, user_id)]
+        for role_id in member.roles:
+            overwrite = overwrites.get(role_id)
+            if overwrite is not None:
+                allow |= overwrite.allow
+                deny |= overwrite.deny
+        value = (value & ~deny) | allow
+
+        own = overwrites.get(user_id)
+        if own is not None:
+            value = (value & ~own.deny) | own.allow
+        return Permissions(value)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _store_guild(self, data: dict[str, Any]) -> Guild:
+        """Cache a guild, patching the existing instance if we already know it."""
+        guild = self.guilds.get(Snowflake(data["id"]))
+        if guild is None:
+            guild = Guild(data)
+            self.guilds[guild.id] = guild
+            self._bump_role_version(guild.id)
+        elif guild._apply(data) and "roles" in data:
+            self._bump_role_version(guild.id)
+        return guild
+
+    def _store_channel(self, data: dict[str, Any]) -> Channel:
+        """
+        Cache a channel, patching the existing instance if we already know it,
+        and keep the guild/parent indexes in sync.
+        """
+        channel = self.channels.get(Snowflake(data["id"]))
+        if channel is None:
+            channel = Channel(data)
+            self.channels[channel.id] = channel
+            self._index_channel(channel)
+            return channel
+
+        guild_id, parent_id, position = channel.guild_id, channel.parent_id, channel.position
+        if channel._apply(data) and (
+            channel.guild_id != guild_id
+            or channel.parent_id != parent_id
+            or channel.position != position
+        ):
+            self._unindex_channel(channel.id, guild_id, parent_id, position)
+            self._index_channel(channel)
+        return channel
+
+    def _index_channel(self, channel: Channel) -> None:
+        if channel.guild_id is not None:
+            self._guild_channels.setdefault(channel.guild_id, set()).add(channel.id)
+        if channel.parent_id is not None:
+            bisect.insort(
+                self._channel_children.setdefault(channel.parent_id, []),
+                (channel.position or 0, channel.id),
+            )
+
+    def _remove_channel(self, channel_id: Snowflake) -> Channel | None:
+        channel = self.channels.pop(channel_id, None)
+        if channel is not None:
+            self._unindex_channel(
+                channel.id, channel.guild_id, channel.parent_id, channel.position
+            )
+        # A deleted category's children get their own CHANNEL_UPDATEs.
+        self._channel_children.pop(channel_id, None)
+        return channel
+
+    def _unindex_channel(
+        self,
+        channel_id: Snowflake,
+        guild_id: Snowflake | None,
+        parent_id: Snowflake | None,
+        position: int | None,
+    ) -> None:
+        if guild_id is not None:
+            ids = self._guild_channels.get(guild_id)
+            if ids is not None:
+                ids.discard(channel_id)
+                if not ids:
+                    del self._guild_channels[guild_id]
+        if parent_id is not None:
+            siblings = self._channel_children.get(parent_id)
+            if siblings is not None:
+                key = (position or 0, channel_id)
+                i = bisect.bisect_left(siblings, key)
+                if i < len(siblings) and siblings[i] == key:
+                    del siblings[i]
+                if not siblings:
+                    del self._channel_children[parent_id]
+
+    def _remove_guild_channels(self, guild_id: Snowflake) -> None:
+        for channel_id in self._guild_channels.pop(guild_id, ()):
+            self.channels.pop(channel_id, None)
+            self._channel_children.pop(channel_id, None)
+            self._remove_channel_messages(channel_id)
+
+    def _store_message(self, message: Message) -> None:
+        """Push a message into its channel's ring buffer, evicting as needed."""
+        if message.id in self._messages:
+            self._messages[message.id] = message
+            return
+
+        ring = self._channel_messages.get(message.channel_id)
+        if ring is None:
+            ring = deque(maxlen=self.max_messages_per_channel)
+            self._channel_messages[message.channel_id] = ring
+        if len(ring) == ring.maxlen:
+            # The append below drops the oldest id from the ring; drop it here too.
+            self._messages.pop(ring[0], None)
+        ring.append(message.id)
+        self._messages[message.id] = message
+
+        while len(self._messages) > self.max_messages:
+            old_id, old = self._messages.popitem(last=False)
+            self._unlink_message(old_id, old.channel_id)
+
+    def _remove_message(self, message_id: Snowflake) -> Message | None:
+        message = self._messages.pop(message_id, None)
+        if message is not None:
+            self._unlink_message(message_id, message.channel_id)
+        return message
+
+    def _unlink_message(self, message_id: Snowflake, channel_id: Snowflake) -> None:
+        ring = self._channel_messages.get(channel_id)
+        if ring is None:
+            return
+        # Evictions are nearly always the oldest entry, so check that first.
+        if ring and ring[0] == message_id:
+            ring.popleft()
+        else:
+            try:
+                ring.remove(message_id)
+            except ValueError:
+                pass
+        if not ring:
+            del self._channel_messages[channel_id]
+
+    def _remove_channel_messages(self, channel_id: Snowflake) -> None:
+        for message_id in self._channel_messages.pop(channel_id, ()):
+            self._messages.pop(message_id, None)
+
+    def _bump_role_version(self, guild_id: Snowflake) -> None:
+        """Invalidate memoized permissions for a guild."""
+        self._role_versions[guild_id] = self._role_versions.get(guild_id, 0) + 1
+
+    def _store_user(self, data: dict[str, Any]) -> User:
+        """Cache a user, patching the existing instance if we already know them."""
+        user = self.users.get(Snowflake(data["id"]))
+        if user is None:
+            user = User(data)
+            self.users[user.id] = user
+        else:
+            user._apply(data)
+        return user
+
+    def _store_member(self, guild_id: Snowflake, data: dict[str, Any]) -> GuildMember | None:
+        """Cache (or patch) a guild member and keep the role index in sync."""
+        user_data = data.get("user")
+        if not user_data:
+            return None
+        user = self._store_user(user_data)
+        key = (guild_id, user.id)
+        member = self.members.get(key)
+        if member is None:
+            try:
+                member = GuildMember(data, user=user)
+            except Exception:
+                return None  # Partial data – skip
+            self.members[key] = member
+            self._guild_members.setdefault(guild_id, set()).add(user.id)
+            self._index_roles(guild_id, user.id, (), member.roles)
+        else:
+            old_roles = member.roles
+            member._apply(data)
+            if member.roles is not old_roles:
+                self._index_roles(guild_id, user.id, old_roles, member.roles)
+        return member
+
+    def _remove_member(self, guild_id: Snowflake, user_id: Snowflake) -> GuildMember | None:
+        member = self.members.pop((guild_id, user_id), None)
+        if member is None:
+            return None
+        ids = self._guild_members.get(guild_id)
+        if ids is not None:
+            ids.discard(user_id)
+            if not ids:
+                del self._guild_members[guild_id]
+        self._index_roles(guild_id, user_id, member.roles, ())
+        return member
+
+    def _remove_guild_members(self, guild_id: Snowflake) -> None:
+        for user_id in self._guild_members.pop(guild_id, ()):
+            self.members.pop((guild_id, user_id), None)
+        self._role_members.pop(guild_id, None)
+
+    def _index_roles(
+        self,
+        guild_id: Snowflake,
+        user_id: Snowflake,
+        old_roles: Iterable[Snowflake],
+        new_roles: Iterable[Snowflake],
+    ) -> None:
+        old = set(old_roles)
+        new = set(new_roles)
+        if old == new:
+            return
+        index = self._role_members.setdefault(guild_id, {})
+        for role_id in old - new:
+            holders = index.get(role_id)
+            if holders is not None:
+                holders.discard(user_id)
+                if not holders:
+                    del index[role_id]
+        for role_id in new - old:
+            index.setdefault(role_id, set()).add(user_id)
+        if not index:
+            del self._role_members[guild_id]
 
-    def _update(self, event_name: str, data: dict[str, Any]) -> None:
+    def _update(self, event_name: str, data: dict[str, Any]) -> Any:
         """
         Update the cache when gateway events come in.
 
         This fires *before* listeners get the event, so your handlers
         always see fresh data.
+
+        Returns a snapshot of the cached object as it was before the event
+        changed or removed it (ie the channel before a CHANNEL_UPDATE), or
+        None if we didn't have it cached.
         """
+        previous: Any = None
         try:
             if event_name == "READY":
-                self.me = User(data["user"])
+                self.me = self._store_user(data["user"])
                 # Cache all guilds received in READY (they may be partial/unavailable)
                 for guild_data in data.get("guilds", []):
                     gid = guild_data.get("id")
@@ -50,71 +460,126 @@ class Cache:
                         # Unavailable guilds only have id + unavailable=True
                         if not guild_data.get("unavailable"):
                             try:
-                                self.guilds[gid] = Guild(guild_data)
+                                self._store_guild(guild_data)
                             except Exception:
                                 pass  # Partial data – skip
 
             elif event_name in ("GUILD_CREATE", "GUILD_UPDATE"):
-                guild = Guild(data)
-                self.guilds[guild.id] = guild
+                if event_name == "GUILD_UPDATE":
+                    cached_guild = self.guilds.get(Snowflake(data["id"]))
+                    if cached_guild is not None:
+                        previous = copy.copy(cached_guild)
+                        # Roles are patched in place, so the snapshot needs its own.
+                        previous.roles = {
+                            rid: copy.copy(role) for rid, role in cached_guild.roles.items()
+                        }
+                guild = self._store_guild(data)
                 # Cache channels sent with GUILD_CREATE
                 for ch_data in data.get("channels", []):
-                    ch_data.setdefault("guild_id", guild.id)
-                    channel = Channel(ch_data)
-                    self.channels[channel.id] = channel
+                    ch_data.setdefault("guild_id", data["id"])
+                    self._store_channel(ch_data)
                 # Cache members sent with GUILD_CREATE
                 for member_data in data.get("members", []):
-                    user_data = member_data.get("user")
-                    if user_data:
-                        try:
-                            user = User(user_data)
-                            self.users[user.id] = user
-                        except Exception:
-                            pass
+                    try:
+                        self._store_member(guild.id, member_data)
+                    except Exception:
+                        pass
 
             elif event_name == "GUILD_DELETE":
-                gid = data.get("id")
-                if gid:
+                if data.get("id"):
+                    gid = Snowflake(data["id"])
                     self.guilds.pop(gid, None)
+                    self._remove_guild_members(gid)
+                    self._remove_guild_channels(gid)
+                    self._role_versions.pop(gid, None)
+                    self._permission_memo.pop(gid, None)
+
+            elif event_name in ("GUILD_ROLE_CREATE", "GUILD_ROLE_UPDATE"):
+                guild = self.guilds.get(Snowflake(data["guild_id"]))
+                role_data = data.get("role")
+                if guild is not None and role_data:
+                    role = guild.roles.get(Snowflake(role_data["id"]))
+                    if role is None:
+                        role = Role(role_data)
+                        guild.roles[role.id] = role
+                        self._bump_role_version(guild.id)
+                    elif role._apply(role_data):
+                        self._bump_role_version(guild.id)
+
+            elif event_name == "GUILD_ROLE_DELETE":
+                guild = self.guilds.get(Snowflake(data["guild_id"]))
+                role_id = data.get("role_id")
+                if guild is not None and role_id:
+                    role_id = Snowflake(role_id)
+                    guild.roles.pop(role_id, None)
+                    index = self._role_members.get(guild.id)
+                    if index is not None:
+                        index.pop(role_id, None)
+                        if not index:
+                            del self._role_members[guild.id]
+                    self._bump_role_version(guild.id)
 
             elif event_name in ("CHANNEL_CREATE", "CHANNEL_UPDATE"):
-                channel = Channel(data)
-                self.channels[channel.id] = channel
+                if event_name == "CHANNEL_UPDATE":
+                    cached_channel = self.channels.get(Snowflake(data["id"]))
+                    if cached_channel is not None:
+                        previous = copy.copy(cached_channel)
+                self._store_channel(data)
 
             elif event_name == "CHANNEL_DELETE":
-                cid = data.get("id")
-                if cid:
-                    self.channels.pop(cid, None)
+                if data.get("id"):
+                    cid = Snowflake(data["id"])
+                    self._remove_channel(cid)
+                    self._remove_channel_messages(cid)
 
             elif event_name in ("MESSAGE_CREATE", "MESSAGE_UPDATE"):
                 # Cache the author
+                author: User | None = None
                 author_data = data.get("author")
                 if author_data:
                     try:
-                        user = User(author_data)
-                        self.users[user.id] = user
+                        author = self._store_user(author_data)
                     except Exception:
                         pass
+                if self.max_messages > 0:
+                    cached = self._messages.get(Snowflake(data["id"]))
+                    if cached is not None and event_name == "MESSAGE_UPDATE":
+                        # Snapshot first so listeners can see what changed.
+                        previous = copy.copy(cached)
+                        cached._apply(data)
+                    elif event_name == "MESSAGE_CREATE":
+                        self._store_message(Message(data, author=author, cache=self))
 
-            elif event_name == "GUILD_MEMBER_ADD":
-                user_data = data.get("user")
-                if user_data:
-                    try:
-                        user = User(user_data)
-                        self.users[user.id] = user
-                    except Exception:
-                        pass
+            elif event_name == "MESSAGE_DELETE":
+                previous = self._remove_message(Snowflake(data["id"]))
+
+            elif event_name == "MESSAGE_DELETE_BULK":
+                for message_id in data.get("ids", []):
+                    self._remove_message(Snowflake(message_id))
+
+            elif event_name in ("GUILD_MEMBER_ADD", "GUILD_MEMBER_UPDATE"):
+                if data.get("guild_id"):
+                    gid = Snowflake(data["guild_id"])
+                    if event_name == "GUILD_MEMBER_UPDATE" and data.get("user"):
+                        cached_member = self.members.get(
+                            (gid, Snowflake(data["user"]["id"]))
+                        )
+                        if cached_member is not None:
+                            previous = copy.copy(cached_member)
+                            # The shared User is patched in place too.
+                            previous.user = copy.copy(cached_member.user)
+                    self._store_member(gid, data)
 
-            elif event_name == "GUILD_MEMBER_UPDATE":
+            elif event_name == "GUILD_MEMBER_REMOVE":
                 user_data = data.get("user")
-                if user_data:
-                    try:
-                        user = User(user_data)
-                        self.users[user.id] = user
-                    except Exception:
-                        pass
+                if data.get("guild_id") and user_data:
+                    self._remove_member(
+                        Snowflake(data["guild_id"]), Snowflake(user_data["id"])
+                    )
 
         except Exception:
             log.debug(
                 "Cache update silently failed for event %r", event_name, exc_info=True
             )
+
+        return previous
@@ -0,0 +1,597 @@
+"""
+Prefix commands.
+
+A `CommandRouter` hangs off a `GatewayBot` and turns messages like
+``!ban @someone being rude`` into calls to your command functions:
+
+    router = fluxcrystal.CommandRouter(bot, prefixes=("!", "?"))
+
+    @router.command(aliases=("b",))
+    async def ban(ctx: fluxcrystal.Context, user: fluxcrystal.Snowflake, *, reason: str = "") -> None:
+        ...
+
+    @router.command()
+    async def tag(ctx: fluxcrystal.Context) -> None:
+        ...
+
+    @tag.command()
+    async def add(ctx: fluxcrystal.Context, name: str, *, text: str) -> None:
+        ...
+
+Arguments are split on whitespace and converted according to the
+function's type hints. A keyword-only parameter (after ``*``) takes the
+rest of the message as-is, and ``*args`` takes every remaining word. If a
+word doesn't convert for a positional parameter with a default, that
+parameter gets its default and the word is left for the next one.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import re
+import types
+from collections.abc import Callable, Coroutine, Iterable
+from typing import TYPE_CHECKING, Any, Union, get_args, get_origin, get_type_hints
+
+from fluxcrystal.cooldowns import Cooldown
+from fluxcrystal.errors import ArgumentError, CommandError, CommandOnCooldownError
+from fluxcrystal.events.base import _resolve_user
+from fluxcrystal.models.channels import Channel
+from fluxcrystal.models.guilds import GuildMember, Role
+from fluxcrystal.models.messages import Message
+from fluxcrystal.models.snowflake import Snowflake
+from fluxcrystal.models.users import User
+
+if TYPE_CHECKING:
+    from fluxcrystal.bot import GatewayBot
+
+log = logging.getLogger("fluxcrystal.commands")
+
+CommandCallbackT = Callable[..., Coroutine[Any, Any, None]]
+ErrorHandlerT = Callable[["Context", CommandError], Coroutine[Any, Any, None]]
+# Converters get the invocation context and the raw argument text.
+ConverterT = Callable[["Context", str], Any]
+
+_MENTION_RE = re.compile(r"<(?:@[!&]?|#)(\d+)>")
+
+_TRUE_WORDS = frozenset(("yes", "y", "true", "t", "1", "on", "enable", "enabled"))
+_FALSE_WORDS = frozenset(("no", "n", "false", "f", "0", "off", "disable", "disabled"))
+
+
+class Context:
+    """Everything about a single command invocation."""
+
+    __slots__ = ("bot", "message", "command", "prefix", "invoked_with")
+
+    def __init__(
+        self,
+        bot: GatewayBot,
+        message: Message,
+        command: Command,
+        prefix: str,
+        invoked_with: str,
+    ) -> None:
+        self.bot: GatewayBot = bot
+        self.message: Message = message
+        #: The command being run.
+        self.command: Command = command
+        #: Which prefix the message used.
+        self.prefix: str = prefix
+        #: The name or alias the command was called by.
+        self.invoked_with: str = invoked_with
+
+    @property
+    def author(self) -> User:
+        """The user who ran the command."""
+        author = self.message.author
+        assert author is not None  # commands only run on new messages
+        return author
+
+    @property
+    def channel_id(self) -> Snowflake:
+        """The ID of the channel the command was run in."""
+        return self.message.channel_id
+
+    @property
+    def guild_id(self) -> Snowflake | None:
+        """The ID of the guild, if the command was run in one."""
+        return self.message.guild_id
+
+    async def reply(self, content: str | None = None, **kwargs: Any) -> Message:
+        """Reply to the message that ran the command. Takes the same options as `RESTClient.create_message`."""
+        kwargs.setdefault("message_reference", self.message.into_reply())
+        return await self.bot.rest.create_message(
+            self.message.channel_id, content=content, **kwargs
+        )
+
+    def __repr__(self) -> str:
+        return f"<Context command={self.command.qualified_name!r} prefix={self.prefix!r}>"
+
+
+class _Parameter:
+    __slots__ = ("name", "converter", "default", "kind", "nullable")
+
+    def __init__(
+        self, name: str, converter: ConverterT, default: Any, kind: Any, nullable: bool
+    ) -> None:
+        self.name = name
+        self.converter = converter
+        self.default = default
+        self.kind = kind
+        # Annotated `X | None`, so a word that doesn't fit can always be skipped.
+        self.nullable = nullable
+
+
+class Command:
+    """
+    A registered prefix command. Made with `CommandRouter.command`, or
+    `Command.command` for subcommands.
+    """
+
+    __slots__ = (
+        "name",
+        "aliases",
+        "callback",
+        "description",
+        "parent",
+        "children",
+        "cooldown",
+        "_case_insensitive",
+        "_params",
+    )
+
+    def __init__(
+        self,
+        callback: CommandCallbackT,
+        *,
+        name: str | None = None,
+        aliases: Iterable[str] = (),
+        description: str | None = None,
+        parent: Command | None = None,
+        cooldown: Cooldown | None = None,
+    ) -> None:
+        self.name: str = name or callback.__name__
+        self.aliases: tuple[str, ...] = tuple(aliases)
+        self.callback: CommandCallbackT = callback
+        self.description: str | None = description or inspect.getdoc(callback)
+        self.parent: Command | None = parent
+        #: Subcommands, keyed by name and by each alias.
+        self.children: dict[str, Command] = {}
+        #: Checked against the `Context` before the command runs.
+        self.cooldown: Cooldown | None = cooldown
+        # Whether `children` is keyed by lowercased name; follows the router.
+        self._case_insensitive: bool = parent._case_insensitive if parent is not None else False
+        # Converters are worked out once here rather than on every call.
+        self._params: tuple[_Parameter, ...] = _build_parameters(callback)
+
+    @property
+    def qualified_name(self) -> str:
+        """The full name including parent commands (ie ``"tag add"``)."""
+        if self.parent is None:
+            return self.name
+        return f"{self.parent.qualified_name} {self.name}"
+
+    def command(
+        self,
+        name: str | None = None,
+        *,
+        aliases: Iterable[str] = (),
+        description: str | None = None,
+        cooldown: Cooldown | None = None,
+    ) -> Callable[[CommandCallbackT], Command]:
+        """Decorator to register a subcommand under this command."""
+
+        def decorator(func: CommandCallbackT) -> Command:
+            command = Command(
+                func,
+                name=name,
+                aliases=aliases,
+                description=description,
+                parent=self,
+                cooldown=cooldown,
+            )
+            _add_to(self.children, command, lower=self._case_insensitive)
+            return command
+
+        return decorator
+
+    def _set_case_insensitive(self, value: bool) -> None:
+        """Re-key subcommands (all the way down) for a router's case setting."""
+        if value == self._case_insensitive:
+            return
+        self._case_insensitive = value
+        children = set(self.children.values())
+        self.children = {}
+        for child in children:
+            child._set_case_insensitive(value)
+            _add_to(self.children, child, lower=value)
+
+    async def _convert(self, ctx: Context, text: str) -> tuple[list[Any], dict[str, Any]]:
+        args: list[Any] = []
+        kwargs: dict[str, Any] = {}
+        # Set when an optional argument skipped a word; cleared once a later
+        # parameter takes that word, otherwise it's raised at the end.
+        skipped: ArgumentError | None = None
+        for param in self._params:
+            if param.kind is inspect.Parameter.KEYWORD_ONLY:
+                text = text.strip()
+                if text:
+                    kwargs[param.name] = await _run_converter(param, ctx, text)
+                    skipped = None
+                elif param.default is not inspect.Parameter.empty:
+                    kwargs[param.name] = param.default
+                else:
+                    raise ArgumentError(f"Missing argument {param.name!r}")
+                text = ""
+            elif param.kind is inspect.Parameter.VAR_POSITIONAL:
+                for word in text.split():
+                    args.append(await _run_converter(param, ctx, word))
+                    skipped = None
+                text = ""
+            else:
+                parts = text.split(None, 1)
+                if parts:
+                    try:
+                        args.append(await _run_converter(param, ctx, parts[0]))
+                    except ArgumentError as e:
+                        if param.default is inspect.Parameter.empty:
+                            raise
+                        # Optional and the word doesn't fit: skip it, and
+                        # leave the word for the next parameter.
+                        args.append(param.default)
+                        if not param.nullable and skipped is None:
+                            skipped = e
+                    else:
+                        text = parts[1] if len(parts) > 1 else ""
+                        skipped = None
+                elif param.default is not inspect.Parameter.empty:
+                    args.append(param.default)
+                else:
+                    raise ArgumentError(f"Missing argument {param.name!r}")
+        if skipped is not None:
+            # Nothing took the word, so it would just be dropped.
+            raise skipped
+        return args, kwargs
+
+    def __repr__(self) -> str:
+        return f"<Command name={self.qualified_name!r} aliases={self.aliases!r}>"
+
+
+class CommandRouter:
+    """
+    Routes prefixed messages to commands.
+
+    Commands are kept in a trie keyed by whole words, so finding the command
+    for a message is one dict lookup per word (``!tag add`` is two) no
+    matter how many commands are registered. Messages that don't start with
+    one of the prefixes are thrown away straight from the raw gateway
+    payload, before any `Message` or event is built.
+
+    Args:
+        bot: The bot to take messages from.
+        prefixes: What commands have to start with.
+        case_insensitive: Match command names regardless of case.
+        ignore_bots: Ignore messages from bot accounts.
+    """
+
+    def __init__(
+        self,
+        bot: GatewayBot,
+        prefixes: str | Iterable[str] = "!",
+        *,
+        case_insensitive: bool = False,
+        ignore_bots: bool = True,
+    ) -> None:
+        self.bot = bot
+        self.case_insensitive = case_insensitive
+        self.ignore_bots = ignore_bots
+        #: Top-level commands, keyed by name and by each alias.
+        self.commands: dict[str, Command] = {}
+        self._error_handler: ErrorHandlerT | None = None
+        self._prefixes: tuple[str, ...] = ()
+        self._prefix_trie: dict[str, Any] = {}
+        self.set_prefixes(prefixes)
+        bot.subscribe_raw(self._on_message_create, "MESSAGE_CREATE")
+
+    def set_prefixes(self, prefixes: str | Iterable[str]) -> None:
+        """Replace the prefixes commands have to start with."""
+        if isinstance(prefixes, str):
+            prefixes = (prefixes,)
+        self._prefixes = tuple(p for p in prefixes if p)
+        if not self._prefixes:
+            raise ValueError("At least one non-empty prefix is needed")
+        # Character trie so overlapping prefixes ("!" and "!!") pick the longest.
+        trie: dict[str, Any] = {}
+        for prefix in self._prefixes:
+            node = trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[""] = prefix
+        self._prefix_trie = trie
+
+    def command(
+        self,
+        name: str | None = None,
+        *,
+        aliases: Iterable[str] = (),
+        description: str | None = None,
+        cooldown: Cooldown | None = None,
+    ) -> Callable[[CommandCallbackT], Command]:
+        """Decorator to register a top-level command."""
+
+        def decorator(func: CommandCallbackT) -> Command:
+            command = Command(
+                func, name=name, aliases=aliases, description=description, cooldown=cooldown
+            )
+            self.add_command(command)
+            return command
+
+        return decorator
+
+    def add_command(self, command: Command) -> None:
+        """Register a top-level command made elsewhere."""
+        _add_to(self.commands, command, lower=self.case_insensitive)
+        command._set_case_insensitive(self.case_insensitive)
+
+    def remove_command(self, name: str) -> Command | None:
+        """Remove a top-level command (and its aliases) by name."""
+        command = self.commands.get(name.lower() if self.case_insensitive else name)
+        if command is None:
+            return None
+        for key in (command.name, *command.aliases):
+            self.commands.pop(key.lower() if self.case_insensitive else key, None)
+        return command
+
+    def on_error(self, func: ErrorHandlerT) -> ErrorHandlerT:
+        """
+        Decorator to set the handler for `CommandError`s (ie bad arguments).
+        Without one they're just logged.
+        """
+        self._error_handler = func
+        return func
+
+    def resolve(self, content: str) -> tuple[Command, str, str, str] | None:
+        """
+        Find the command a message would run.
+
+        Returns ``(command, prefix, invoked_with, remaining_text)``, or None
+        if the message isn't a command.
+        """
+        prefix = self._match_prefix(content)
+        if prefix is None:
+            return None
+        text = content[len(prefix):]
+        parts = text.split(None, 1)
+        if not parts or text[0].isspace():
+            return None
+        word = parts[0]
+        command = self.commands.get(word.lower() if self.case_insensitive else word)
+        if command is None:
+            return None
+        invoked_with = word
+        rest = parts[1] if len(parts) > 1 else ""
+        # Walk down into subcommands while the next word names one.
+        while command.children and rest:
+            parts = rest.split(None, 1)
+            child = command.children.get(
+                parts[0].lower() if self.case_insensitive else parts[0]
+            )
+            if child is None:
+                break
+            command = child
+            invoked_with = parts[0]
+            rest = parts[1] if len(parts) > 1 else ""
+        return command, prefix, invoked_with, rest
+
+    def _match_prefix(self, content: str) -> str | None:
+        node = self._prefix_trie
+        matched: str | None = None
+        for char in content:
+            node = node.get(char)  # type: ignore[assignment]
+            if node is None:
+                break
+            matched = node.get("", matched)
+        return matched
+
+    async def _on_message_create(self, event_name: str, data: dict[str, Any]) -> None:
+        content = data.get("content")
+        # Cheap checks on the raw payload first; almost every message fails here.
+        if not content or not content.startswith(self._prefixes):
+            return
+        author = data.get("author")
+        if author is None or (self.ignore_bots and author.get("bot")):
+            return
+        resolved = self.resolve(content)
+        if resolved is None:
+            return
+        command, prefix, invoked_with, rest = resolved
+
+        message = Message(
+            data, author=_resolve_user(self.bot, author), cache=getattr(self.bot, "cache", None)
+        )
+        ctx = Context(self.bot, message, command, prefix, invoked_with)
+        try:
+            if command.cooldown is not None:
+                retry_after = command.cooldown.hit(ctx)
+                if retry_after:
+                    raise CommandOnCooldownError(
+                        f"{command.qualified_name!r} is on cooldown, try again in {retry_after:.1f}s",
+                        retry_after,
+                    )
+            args, kwargs = await command._convert(ctx, rest)
+            await command.callback(ctx, *args, **kwargs)
+        except CommandError as e:
+            if self._error_handler is None:
+                log.warning("Command %r failed: %s", command.qualified_name, e)
+                return
+            try:
+                await self._error_handler(ctx, e)
+            except Exception:
+                log.exception("Unhandled exception in command error handler")
+        except Exception:
+            log.exception("Unhandled exception in command %r", command.qualified_name)
+
+
+def _add_to(table: dict[str, Command], command: Command, *, lower: bool = False) -> None:
+    for key in (command.name, *command.aliases):
+        if lower:
+            key = key.lower()
+        existing = table.get(key)
+        if existing is not None and existing is not command:
+            raise ValueError(
+                f"{key!r} is already used by command {existing.qualified_name!r}"
+            )
+        table[key] = command
+
+
+# ---------------------------------------------------------------------------
+# Argument conversion
+# ---------------------------------------------------------------------------
+
+
+def _build_parameters(callback: CommandCallbackT) -> tuple[_Parameter, ...]:
+    signature = inspect.signature(callback)
+    try:
+        hints = get_type_hints(callback)
+    except Exception:
+        hints = {}
+    params = list(signature.parameters.values())
+    if not params:
+        raise TypeError(
+            f"Command {callback.__qualname__!r} needs to take a Context as its first argument"
+        )
+    built: list[_Parameter] = []
+    for param in params[1:]:
+        if param.kind is inspect.Parameter.VAR_KEYWORD:
+            continue
+        annotation = hints.get(param.name, str)
+        built.append(
+            _Parameter(
+                param.name,
+                _converter_for(annotation),
+                param.default,
+                param.kind,
+                _is_nullable(annotation),
+            )
+        )
+    return tuple(built)
+
+
+def _is_nullable(annotation: Any) -> bool:
+    origin = get_origin(annotation)
+    return (origin is Union or origin is types.UnionType) and type(None) in get_args(annotation)
+
+
+def _converter_for(annotation: Any) -> ConverterT:
+    origin = get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        # `X | None` just makes the argument optional; convert as X.
+        options = [a for a in get_args(annotation) if a is not type(None)]
+        if len(options) == 1:
+            return _converter_for(options[0])
+        converters = [_converter_for(a) for a in options]
+        return _first_of(converters)
+    if annotation is str or annotation is Any or annotation is inspect.Parameter.empty:
+        return _to_str
+    if annotation is bool:
+        return _to_bool
+    if annotation is Snowflake:
+        return _to_snowflake
+    if annotation is User:
+        return _to_user
+    if annotation is GuildMember:
+        return _to_member
+    if annotation is Channel:
+        return _to_channel
+    if annotation is Role:
+        return _to_role
+    if callable(annotation):
+        # int, float, enums, or anything else that takes a string.
+        return lambda ctx, arg: annotation(arg)
+    raise TypeError(f"Don't know how to convert command arguments to {annotation!r}")
+
+
+def _first_of(converters: list[ConverterT]) -> ConverterT:
+    def convert(ctx: Context, arg: str) -> Any:
+        for converter in converters:
+            try:
+                return converter(ctx, arg)
+            except (ArgumentError, ValueError, TypeError):
+                continue
+        raise ArgumentError(f"Couldn't convert {arg!r}")
+
+    return convert
+
+
+async def _run_converter(param: _Parameter, ctx: Context, arg: str) -> Any:
+    try:
+        value = param.converter(ctx, arg)
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+    except ArgumentError:
+        raise
+    except (ValueError, TypeError) as e:
+        raise ArgumentError(f"Bad value for {param.name!r}: {arg!r} ({e})") from e
+
+
+def _to_str(ctx: Context, arg: str) -> str:
+    return arg
+
+
+def _to_bool(ctx: Context, arg: str) -> bool:
+    lowered = arg.lower()
+    if lowered in _TRUE_WORDS:
+        return True
+    if lowered in _FALSE_WORDS:
+        return False
+    raise ArgumentError(f"{arg!r} isn't a yes/no value")
+
+
+def _to_snowflake(ctx: Context, arg: str) -> Snowflake:
+    """Take a raw ID or a user/role/channel mention."""
+    match = _MENTION_RE.fullmatch(arg)
+    if match is not None:
+        return Snowflake(match.group(1))
+    if not arg.isdigit():
+        raise ArgumentError(f"{arg!r} isn't an ID or mention")
+    return Snowflake(arg)
+
+
+def _to_user(ctx: Context, arg: str) -> User:
+    user = ctx.bot.cache.get_user(_to_snowflake(ctx, arg))
+    if user is None:
+        raise ArgumentError(f"Couldn't find user {arg!r}")
+    return user
+
+
+def _to_member(ctx: Context, arg: str) -> GuildMember:
+    guild_id = ctx.guild_id
+    member = (
+        None
+        if guild_id is None
+        else ctx.bot.cache.get_member(guild_id, _to_snowflake(ctx, arg))
+    )
+    if member is None:
+        raise ArgumentError(f"Couldn't find member {arg!r}")
+    return member
+
+
+def _to_channel(ctx: Context, arg: str) -> Channel:
+    channel = ctx.bot.cache.get_channel(_to_snowflake(ctx, arg))
+    if channel is None:
+        raise ArgumentError(f"Couldn't find channel {arg!r}")
+    return channel
+
+
+def _to_role(ctx: Context, arg: str) -> Role:
+    guild_id = ctx.guild_id
+    role = (
+        None
+        if guild_id is None
+        else ctx.bot.cache.get_role(guild_id, _to_snowflake(ctx, arg))
+    )
+    if role is None:
+        raise ArgumentError(f"Couldn't find role {arg!r}")
+    return role
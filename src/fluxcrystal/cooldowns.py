@@ -0,0 +1,303 @@
+"""
+Cooldowns for rate limiting your own users.
+
+    slow = fluxcrystal.FixedWindowCooldown(3, 10.0)  # 3 uses per 10s per user
+
+    @bot.listen(fluxcrystal.MessageCreateEvent, cooldown=slow)
+    async def on_message(event: fluxcrystal.MessageCreateEvent) -> None:
+        ...
+
+    @router.command(cooldown=fluxcrystal.TokenBucketCooldown(5, 60.0, bucket=fluxcrystal.BucketType.CHANNEL))
+    async def roll(ctx: fluxcrystal.Context) -> None:
+        ...
+
+Listeners that are on cooldown are just skipped. Commands raise
+`CommandOnCooldownError` so your error handler can tell the user how long
+to wait.
+
+Each cooldown only keeps state for keys that were used recently; entries
+are dropped by a timer wheel once they've fully recovered.
+"""
+
+from __future__ import annotations
+
+import enum
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class BucketType(enum.Enum):
+    """What a cooldown is counted per."""
+
+    #: One bucket shared by everyone.
+    GLOBAL = enum.auto()
+    #: Per user, across all guilds.
+    USER = enum.auto()
+    #: Per user, per guild.
+    MEMBER = enum.auto()
+    #: Per channel.
+    CHANNEL = enum.auto()
+    #: Per guild (per channel in DMs).
+    GUILD = enum.auto()
+
+
+# The key everything shares under `BucketType.GLOBAL`. (None means the key
+# couldn't be worked out, and isn't limited.)
+_GLOBAL_KEY = "global"
+
+
+def _user_id(obj: Any) -> Any:
+    # Message, MessageCreateEvent and Context have `author`; most other
+    # events have `user` or `user_id`, and member events have `member`.
+    for attr in ("author", "user"):
+        user = getattr(obj, attr, None)
+        if user is not None:
+            return user.id
+    member = getattr(obj, "member", None)
+    if member is not None:
+        return member.user.id
+    return getattr(obj, "user_id", None)
+
+
+def _bucket_key(bucket: BucketType, obj: Any) -> Hashable:
+    if bucket is BucketType.USER:
+        return _user_id(obj)
+    if bucket is BucketType.CHANNEL:
+        return getattr(obj, "channel_id", None)
+    if bucket is BucketType.GUILD:
+        guild_id = getattr(obj, "guild_id", None)
+        if guild_id is not None:
+            return guild_id
+        channel_id = getattr(obj, "channel_id", None)
+        return None if channel_id is None else ("channel", channel_id)
+    if bucket is BucketType.MEMBER:
+        user_id = _user_id(obj)
+        return None if user_id is None else (getattr(obj, "guild_id", None), user_id)
+    return _GLOBAL_KEY
+
+
+class _TimerWheel:
+    """
+    Buckets keys by the tick they're due in, so finding expired keys costs
+    time proportional to the ticks passed rather than to the number of keys.
+    Keys further out than the wheel's horizon go in the last slot and get
+    rescheduled when it comes round.
+    """
+
+    __slots__ = ("_tick", "_slots", "_current")
+
+    def __init__(self, tick: float, size: int = 32) -> None:
+        self._tick = tick
+        self._slots: list[list[Hashable]] = [[] for _ in range(size)]
+        self._current: int | None = None
+
+    def schedule(self, key: Hashable, when: float) -> None:
+        size = len(self._slots)
+        target = int(when / self._tick)
+        current = self._current if self._current is not None else target - 1
+        target = min(max(target, current + 1), current + size - 1)
+        self._slots[target % size].append(key)
+
+    def due(self, now: float) -> list[Hashable]:
+        """Pop every key scheduled for a tick that has now passed."""
+        target = int(now / self._tick)
+        current = self._current
+        self._current = target
+        if current is None or target <= current:
+            return []
+        size = len(self._slots)
+        keys: list[Hashable] = []
+        for step in range(current + 1, current + 1 + min(target - current, size)):
+            slot = self._slots[step % size]
+            if slot:
+                keys.extend(slot)
+                self._slots[step % size] = []
+        return keys
+
+
+class Cooldown(ABC):
+    """
+    Base class for cooldowns. Use `FixedWindowCooldown` or
+    `TokenBucketCooldown`.
+
+    Args:
+        rate: How many uses are allowed...
+        per: ...per this many seconds.
+        bucket: What the uses are counted per.
+        key: Work out the bucket key yourself instead (gets the event,
+            `Context` or `Message` being checked).
+
+    Things the bucket key can't be worked out for (ie a per-user cooldown on
+    an event with no user, or `key` returning None) aren't limited at all,
+    rather than all sharing one bucket.
+    """
+
+    __slots__ = ("rate", "per", "bucket", "_key", "_entries", "_wheel")
+
+    def __init__(
+        self,
+        rate: int,
+        per: float,
+        *,
+        bucket: BucketType = BucketType.USER,
+        key: Callable[[Any], Hashable] | None = None,
+    ) -> None:
+        if rate < 1 or per <= 0:
+            raise ValueError("Cooldowns need rate >= 1 and per > 0")
+        self.rate: int = rate
+        self.per: float = per
+        self.bucket: BucketType = bucket
+        self._key = key
+        self._entries: dict[Hashable, Any] = {}
+        self._wheel = _TimerWheel(per / 16)
+
+    def key_for(self, obj: Any) -> Hashable:
+        """The bucket key `obj` is counted under."""
+        if self._key is not None:
+            return self._key(obj)
+        return _bucket_key(self.bucket, obj)
+
+    def hit(self, obj: Any, *, now: float | None = None) -> float:
+        """
+        Count one use against `obj`'s bucket.
+
+        Returns 0.0 if it's allowed, otherwise how many seconds until it
+        would be (and the use isn't counted).
+        """
+        if now is None:
+            now = time.monotonic()
+        self._expire(now)
+        key = self.key_for(obj)
+        if key is None:
+            return 0.0
+        return self._hit(key, now)
+
+    def retry_after(self, obj: Any, *, now: float | None = None) -> float:
+        """Like `hit`, but only checks - nothing is counted."""
+        if now is None:
+            now = time.monotonic()
+        key = self.key_for(obj)
+        if key is None:
+            return 0.0
+        return self._peek(key, now)
+
+    def reset(self, obj: Any | None = None) -> None:
+        """Forget `obj`'s bucket, or every bucket if no `obj` is given."""
+        if obj is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self.key_for(obj), None)
+
+    def __len__(self) -> int:
+        """The number of buckets currently being tracked."""
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        entries = self._entries
+        for key in self._wheel.due(now):
+            entry = entries.get(key)
+            if entry is None:
+                continue
+            if entry.expires <= now:
+                del entries[key]
+            else:
+                self._wheel.schedule(key, entry.expires)
+
+    @abstractmethod
+    def _hit(self, key: Hashable, now: float) -> float:
+        """Count a use against `key` if allowed; see `hit`."""
+
+    @abstractmethod
+    def _peek(self, key: Hashable, now: float) -> float:
+        """How long until `key` could be used, without counting anything."""
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} rate={self.rate} per={self.per} bucket={self.bucket.name}>"
+
+
+class _Window:
+    __slots__ = ("count", "expires")
+
+    def __init__(self, count: int, expires: float) -> None:
+        self.count = count
+        self.expires = expires
+
+
+class FixedWindowCooldown(Cooldown):
+    """
+    Allows `rate` uses per window of `per` seconds. The window starts at the
+    first use and everything resets when it ends.
+    """
+
+    __slots__ = ()
+
+    def _hit(self, key: Hashable, now: float) -> float:
+        entry: _Window | None = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Window(0, now + self.per)
+            self._wheel.schedule(key, entry.expires)
+        elif entry.expires <= now:
+            # The wheel will see the new expiry when the old slot comes round.
+            entry.count = 0
+            entry.expires = now + self.per
+        if entry.count >= self.rate:
+            return entry.expires - now
+        entry.count += 1
+        return 0.0
+
+    def _peek(self, key: Hashable, now: float) -> float:
+        entry: _Window | None = self._entries.get(key)
+        if entry is None or entry.expires <= now or entry.count < self.rate:
+            return 0.0
+        return entry.expires - now
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "expires")
+
+    def __init__(self, tokens: float, updated: float, expires: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+        # When the bucket will be full again (and can be forgotten).
+        self.expires = expires
+
+
+class TokenBucketCooldown(Cooldown):
+    """
+    Allows bursts of up to `rate` uses, refilling at `rate` uses per `per`
+    seconds. Smoother than `FixedWindowCooldown`, which lets a full window's
+    worth through at each window edge.
+    """
+
+    __slots__ = ()
+
+    def _refill(self, entry: _Bucket, now: float) -> None:
+        if now > entry.updated:
+            entry.tokens = min(
+                self.rate, entry.tokens + (now - entry.updated) * self.rate / self.per
+            )
+            entry.updated = now
+
+    def _hit(self, key: Hashable, now: float) -> float:
+        entry: _Bucket | None = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Bucket(self.rate, now, now)
+            self._wheel.schedule(key, now + self.per)
+        else:
+            self._refill(entry, now)
+        if entry.tokens < 1:
+            return (1 - entry.tokens) * self.per / self.rate
+        entry.tokens -= 1
+        entry.expires = now + (self.rate - entry.tokens) * self.per / self.rate
+        return 0.0
+
+    def _peek(self, key: Hashable, now: float) -> float:
+        entry: _Bucket | None = self._entries.get(key)
+        if entry is None:
+            return 0.0
+        tokens = min(self.rate, entry.tokens + max(now - entry.updated, 0) * self.rate / self.per)
+        if tokens >= 1:
+            return 0.0
+        return (1 - tokens) * self.per / self.rate
@@ -0,0 +1,273 @@
+"""
+Spam and raid detection.
+
+Detectors hook straight into the bot's raw gateway dispatches and fire
+`SpamDetectedEvent`/`RaidDetectedEvent` when something trips:
+
+    fluxcrystal.SpamDetector(bot, message_limit=5, message_window=4.0)
+    fluxcrystal.RaidDetector(bot, join_limit=10, join_window=10.0)
+
+    @bot.listen()
+    async def on_spam(event: fluxcrystal.SpamDetectedEvent) -> None:
+        ...
+
+Each event is O(1) to process. State is kept in small fixed-size ring
+buffers, and only for the most recently active users/guilds.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Any
+
+from fluxcrystal.events.moderation import RaidDetectedEvent, SpamDetectedEvent
+from fluxcrystal.models.snowflake import Snowflake, SnowflakeLike, _optional_snowflake
+
+if TYPE_CHECKING:
+    from fluxcrystal.bot import GatewayBot
+
+log = logging.getLogger("fluxcrystal.detection")
+
+
+class _UserActivity:
+    __slots__ = ("recent", "fingerprints", "counts")
+
+    def __init__(self, message_limit: int, duplicate_history: int) -> None:
+        # (time, message id) of the last `message_limit` messages.
+        self.recent: deque[tuple[float, Snowflake]] = deque(maxlen=message_limit)
+        # (time, content hash, message id), trimmed to the duplicate window.
+        self.fingerprints: deque[tuple[float, int, Snowflake]] = deque()
+        # content hash → how many times it's in `fingerprints`
+        self.counts: dict[int, int] = {}
+
+
+class SpamDetector:
+    """
+    Watches MESSAGE_CREATE for users sending messages too quickly
+    (``"flood"``) or repeating the same content (``"duplicate"``).
+
+    Once a user trips the detector their history is cleared, so a single
+    burst fires one event.
+
+    Args:
+        bot: The bot to watch.
+        message_limit: How many messages...
+        message_window: ...in how many seconds count as a flood.
+        duplicate_limit: How many identical messages...
+        duplicate_window: ...in how many seconds count as duplicate spam.
+        duplicate_history: How many recent messages per user are
+            fingerprinted for duplicate checks.
+        max_tracked_users: Users beyond this are forgotten, least recently
+            active first.
+        ignore_bots: Don't track bot accounts.
+    """
+
+    def __init__(
+        self,
+        bot: GatewayBot,
+        *,
+        message_limit: int = 5,
+        message_window: float = 5.0,
+        duplicate_limit: int = 3,
+        duplicate_window: float = 30.0,
+        duplicate_history: int = 16,
+        max_tracked_users: int = 10_000,
+        ignore_bots: bool = True,
+    ) -> None:
+        if message_limit < 1 or duplicate_limit < 1 or max_tracked_users < 1:
+            raise ValueError(
+                "SpamDetector needs message_limit, duplicate_limit and max_tracked_users >= 1"
+            )
+        if message_window <= 0 or duplicate_window <= 0:
+            raise ValueError("SpamDetector needs message_window and duplicate_window > 0")
+        self.bot = bot
+        self.message_limit = message_limit
+        self.message_window = message_window
+        self.duplicate_limit = duplicate_limit
+        self.duplicate_window = duplicate_window
+        self.duplicate_history = max(duplicate_history, duplicate_limit)
+        self.max_tracked_users = max_tracked_users
+        self.ignore_bots = ignore_bots
+        # (guild id, user id) → activity, least recently active first
+        self._users: OrderedDict[tuple[Snowflake | None, Snowflake], _UserActivity] = OrderedDict()
+        bot.subscribe_raw(self._on_message_create, "MESSAGE_CREATE")
+
+    def close(self) -> None:
+        """Stop watching and drop all tracked state."""
+        self.bot.unsubscribe_raw(self._on_message_create, "MESSAGE_CREATE")
+        self._users.clear()
+
+    def __len__(self) -> int:
+        """The number of users currently being tracked."""
+        return len(self._users)
+
+    async def _on_message_create(self, event_name: str, data: dict[str, Any]) -> None:
+        author = data.get("author")
+        if author is None or (self.ignore_bots and author.get("bot")):
+            return
+        result = self.observe(
+            data.get("guild_id"), author["id"], data["id"], data.get("content", "")
+        )
+        if result is None:
+            return
+        reason, message_ids = result
+        await self.bot.dispatch(
+            SpamDetectedEvent(
+                self.bot,
+                {
+                    "guild_id": data.get("guild_id"),
+                    "channel_id": data["channel_id"],
+                    "user_id": author["id"],
+                    "reason": reason,
+                    "message_ids": message_ids,
+                },
+            )
+        )
+
+    def observe(
+        self,
+        guild_id: SnowflakeLike | None,
+        user_id: SnowflakeLike,
+        message_id: SnowflakeLike,
+        content: str,
+        *,
+        now: float | None = None,
+    ) -> tuple[str, list[Snowflake]] | None:
+        """
+        Record a message and check it. Returns ``(reason, message_ids)`` if
+        the user just tripped the detector, otherwise None.
+
+        Called for you on every MESSAGE_CREATE; exposed for feeding in
+        messages from elsewhere.
+        """
+        if now is None:
+            now = time.monotonic()
+        key = (_optional_snowflake(guild_id), Snowflake(user_id))
+        message_id = Snowflake(message_id)
+        users = self._users
+        activity = users.get(key)
+        if activity is None:
+            activity = users[key] = _UserActivity(self.message_limit, self.duplicate_history)
+            if len(users) > self.max_tracked_users:
+                users.popitem(last=False)
+        else:
+            users.move_to_end(key)
+
+        recent = activity.recent
+        recent.append((now, message_id))
+        if len(recent) == recent.maxlen and now - recent[0][0] <= self.message_window:
+            del users[key]
+            return "flood", [m for _, m in recent]
+
+        if content:
+            fingerprints = activity.fingerprints
+            counts = activity.counts
+            # Drop fingerprints that are too old or over the history size.
+            while fingerprints and (
+                now - fingerprints[0][0] > self.duplicate_window
+                or len(fingerprints) >= self.duplicate_history
+            ):
+                _, old, _ = fingerprints.popleft()
+                if counts[old] == 1:
+                    del counts[old]
+                else:
+                    counts[old] -= 1
+            fingerprint = hash(content.casefold().strip())
+            fingerprints.append((now, fingerprint, message_id))
+            count = counts[fingerprint] = counts.get(fingerprint, 0) + 1
+            if count >= self.duplicate_limit:
+                del users[key]
+                return "duplicate", [m for _, h, m in fingerprints if h == fingerprint]
+        return None
+
+
+class RaidDetector:
+    """
+    Watches GUILD_MEMBER_ADD for bursts of joins.
+
+    Fires once when a guild gets `join_limit` joins within `join_window`
+    seconds, then stays quiet for that guild until joins drop back below
+    the limit.
+
+    Args:
+        bot: The bot to watch.
+        join_limit: How many joins...
+        join_window: ...in how many seconds count as a raid.
+        max_tracked_guilds: Guilds beyond this are forgotten, least
+            recently joined first.
+    """
+
+    def __init__(
+        self,
+        bot: GatewayBot,
+        *,
+        join_limit: int = 10,
+        join_window: float = 10.0,
+        max_tracked_guilds: int = 10_000,
+    ) -> None:
+        if join_limit < 1 or max_tracked_guilds < 1 or join_window <= 0:
+            raise ValueError(
+                "RaidDetector needs join_limit >= 1, max_tracked_guilds >= 1 and join_window > 0"
+            )
+        self.bot = bot
+        self.join_limit = join_limit
+        self.join_window = join_window
+        self.max_tracked_guilds = max_tracked_guilds
+        # guild id → (time, user id) of the last `join_limit` joins
+        self._joins: OrderedDict[Snowflake, deque[tuple[float, Snowflake]]] = OrderedDict()
+        # Guilds that have already had an event for the current burst.
+        self._raiding: set[Snowflake] = set()
+        bot.subscribe_raw(self._on_member_add, "GUILD_MEMBER_ADD")
+
+    def close(self) -> None:
+        """Stop watching and drop all tracked state."""
+        self.bot.unsubscribe_raw(self._on_member_add, "GUILD_MEMBER_ADD")
+        self._joins.clear()
+        self._raiding.clear()
+
+    def is_raiding(self, guild_id: SnowflakeLike) -> bool:
+        """True if `guild_id` is in the middle of a detected raid."""
+        return Snowflake(guild_id) in self._raiding
+
+    async def _on_member_add(self, event_name: str, data: dict[str, Any]) -> None:
+        user = data.get("user")
+        if user is None:
+            return
+        user_ids = self.observe(data["guild_id"], user["id"])
+        if user_ids is None:
+            return
+        await self.bot.dispatch(
+            RaidDetectedEvent(self.bot, {"guild_id": data["guild_id"], "user_ids": user_ids})
+        )
+
+    def observe(
+        self, guild_id: SnowflakeLike, user_id: SnowflakeLike, *, now: float | None = None
+    ) -> list[Snowflake] | None:
+        """
+        Record a join and check it. Returns the IDs of the users in the burst
+        if this join started a raid, otherwise None.
+        """
+        if now is None:
+            now = time.monotonic()
+        guild_id = Snowflake(guild_id)
+        joins_by_guild = self._joins
+        joins = joins_by_guild.get(guild_id)
+        if joins is None:
+            joins = joins_by_guild[guild_id] = deque(maxlen=self.join_limit)
+            if len(joins_by_guild) > self.max_tracked_guilds:
+                old, _ = joins_by_guild.popitem(last=False)
+                self._raiding.discard(old)
+        else:
+            joins_by_guild.move_to_end(guild_id)
+
+        joins.append((now, Snowflake(user_id)))
+        burst = len(joins) == joins.maxlen and now - joins[0][0] <= self.join_window
+        if not burst:
+            self._raiding.discard(guild_id)
+            return None
+        if guild_id in self._raiding:
+            return None
+        self._raiding.add(guild_id)
+        return [u for _, u in joins]
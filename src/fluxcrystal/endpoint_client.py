@@ -1,28 +1,83 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
 from typing import Any
 
+import anyio
 import httpx
 
-from fluxcrystal.errors import RateLimitedError, try_raise_error
+from fluxcrystal.bulk import (
+    _DEFAULT_BULK_CONCURRENCY,
+    BulkOperation,
+    BulkResult,
+    RequestBatch,
+    _current_batch,
+)
+from fluxcrystal.endpoints import _REST_ENDPOINT
+from fluxcrystal.errors import FluxCrystalError, RateLimitedError, try_raise_error
 from fluxcrystal.models.channels import Channel
 from fluxcrystal.models.guilds import Guild, GuildMember
-from fluxcrystal.models.messages import Message, MessageReference, RichEmbed
+from fluxcrystal.models.messages import EmbedBuilder, Message, MessageReference, RichEmbed
+from fluxcrystal.models.snowflake import Snowflake, SnowflakeLike
 from fluxcrystal.models.upload import AttachmentUpload
 from fluxcrystal.models.users import User
+from fluxcrystal.ratelimits import Priority, RateLimiter, _current_priority, route_key
 
 log = logging.getLogger("fluxcrystal.rest")
 
 # Max automatic retries on 429 before giving up.
 _MAX_RATE_LIMIT_RETRIES = 5
 
+# Bulk delete takes at most this many messages per request...
+_BULK_DELETE_MAX = 100
+# ...and none older than this (less a minute so we don't race the cutoff).
+_BULK_DELETE_MAX_AGE_MS = (14 * 24 * 60 * 60 - 60) * 1000
+
+
+class _PendingEdit:
+    """An edit waiting out the flush interval; later edits merge into it."""
+
+    __slots__ = ("fields", "done", "result", "error")
+
+    def __init__(self, fields: dict[str, Any]) -> None:
+        self.fields = fields
+        self.done = anyio.Event()
+        self.result: Message | None = None
+        self.error: Exception | None = None
+
+    async def wait(self) -> Message:
+        await self.done.wait()
+        if self.error is not None:
+            raise self.error
+        assert self.result is not None
+        return self.result
+
+
+def _embed_payload(embed: RichEmbed | EmbedBuilder | dict[str, Any]) -> dict[str, Any]:
+    """Dicts are payloads that are already built (ie from `EmbedTemplate.render`)."""
+    if isinstance(embed, dict):
+        return embed
+    return embed.to_payload()
+
 
 class RESTClient:
     """
     HTTP client for Fluxer's REST API.
+
+    Args:
+        base_url: The API to talk to, or a `fluxcrystal.restproxy` in front of it.
+        token: The bot token to authorize with.
+        edit_flush_interval: How long `queue_edit` waits for more edits
+            before sending.
+        client_id: How a REST proxy tells this client apart from other
+            processes when sharing out rate limits. Defaults to a random ID
+            made once per client; only sent when `base_url` isn't the
+            public API.
     """
 
     _client: httpx.AsyncClient
@@ -30,14 +85,33 @@ class RESTClient:
 
     def __init__(
         self,
-        base_url: str = "https://api.fluxer.app/v1",
+        base_url: str = _REST_ENDPOINT,
         token: str | None = None,
+        *,
+        edit_flush_interval: float = 0.5,
+        client_id: str | None = None,
     ) -> None:
+        #: Identifies this client to a REST proxy (see `fluxcrystal.restproxy`).
+        self.client_id: str = client_id or uuid.uuid4().hex
+        headers = {}
+        if base_url.rstrip("/") != _REST_ENDPOINT:
+            # Every pooled connection carries the same ID, so a proxy gives
+            # this process one share of each bucket however many it opens.
+            headers["X-FluxCrystal-Client"] = self.client_id
         self._client = httpx.AsyncClient(
             base_url=base_url,
+            headers=headers,
             timeout=httpx.Timeout(30.0),
         )
         self._token = token
+        #: Rate limit buckets learned from response headers.
+        self.ratelimits = RateLimiter()
+        #: How long `queue_edit` waits for more edits before sending.
+        self.edit_flush_interval = edit_flush_interval
+        # (channel id, message id) → edit that hasn't been sent yet
+        self._pending_edits: dict[tuple[Snowflake, Snowflake], _PendingEdit] = {}
+        # Serializes sends per channel and edits per message.
+        self._outbox_locks: dict[Any, anyio.Lock] = {}
 
     async def __aenter__(self) -> RESTClient:
         await self._client.__aenter__()
@@ -55,6 +129,40 @@ class RESTClient:
             return {}
         return {"Authorization": f"Bot {self._token}"}
 
+    @contextmanager
+    def priority(self, priority: Priority) -> Iterator[None]:
+        """
+        Make every request sent inside the block (including from tasks
+        started in it) use `priority` when waiting on rate limits:
+
+            with bot.rest.priority(fluxcrystal.Priority.LOW):
+                await sync_roles(bot)
+
+        How long each priority has waited is in ``rest.ratelimits.stats``.
+        """
+        token = _current_priority.set(Priority(priority))
+        try:
+            yield
+        finally:
+            _current_priority.reset(token)
+
+    def batch(
+        self, *, concurrency: int | None = None, priority: Priority | None = None
+    ) -> RequestBatch:
+        """
+        Run a lot of calls concurrently, getting a result (or error) for
+        each. See `RequestBatch`:
+
+            async with bot.rest.batch() as batch:
+                for user_id in user_ids:
+                    batch.fetch_user(user_id)
+            users = [r.value for r in batch.results if r.ok]
+
+        `concurrency` caps how many requests per rate limit bucket run at
+        once (by default, as many as the bucket allows).
+        """
+        return RequestBatch(self, concurrency=concurrency, priority=priority)
+
     async def _request(
         self,
         method: str,
@@ -63,11 +171,33 @@ class RESTClient:
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
         files: dict[str, Any] | None = None,
+        priority: Priority | None = None,
     ) -> Any:
         """
         Send a request, automatically retrying on 429 (rate-limit) responses.
+
+        `priority` overrides the one set with `priority()` for this request.
         """
+        key = route_key(method, path)
+        batch = _current_batch.get()
+        async with batch._limiter(key) if batch is not None else nullcontext():
+            return await self._send_request(
+                method, path, key, json=json, params=params, files=files, priority=priority
+            )
+
+    async def _send_request(
+        self,
+        method: str,
+        path: str,
+        key: str,
+        *,
+        json: dict[str, Any] | None,
+        params: dict[str, Any] | None,
+        files: dict[str, Any] | None,
+        priority: Priority | None,
+    ) -> Any:
         for attempt in range(_MAX_RATE_LIMIT_RETRIES):
+            await self.ratelimits.acquire(key, priority)
             response = await self._client.request(
                 method,
                 path,
@@ -77,6 +207,8 @@ class RESTClient:
                 params=params,
             )
 
+            self.ratelimits.update(key, response.headers)
+
             # Empty body (e.g. 204 No Content)
             if response.status_code == 204:
                 return {}
@@ -88,12 +220,18 @@ class RESTClient:
                 retry_after: float = float(
                     body.get("retry_after", 1.0)
                 )
+                self.ratelimits.rate_limited(
+                    key,
+                    retry_after,
+                    is_global=bool(body.get("global"))
+                    or response.headers.get("x-ratelimit-global") == "true",
+                )
                 if attempt < _MAX_RATE_LIMIT_RETRIES - 1:
                     log.warning(
                         "Rate limited on %s %s – retrying in %.2fs (attempt %d/%d)",
                         method, path, retry_after, attempt + 1, _MAX_RATE_LIMIT_RETRIES,
                     )
-                    await asyncio.sleep(retry_after)
+                    await anyio.sleep(retry_after)
                     continue
                 # Exhausted retries – raise.
                 raise RateLimitedError(
@@ -152,17 +290,20 @@ class RESTClient:
 
     async def create_message(
         self,
-        channel_id: str,
+        channel_id: SnowflakeLike,
         *,
         content: str | None = None,
         message_reference: MessageReference | None = None,
         tts: bool = False,
         nonce: str | None = None,
         attachments: list[AttachmentUpload] | None = None,
-        embeds: list[RichEmbed] | None = None,
+        embeds: list[RichEmbed | EmbedBuilder | dict[str, Any]] | None = None,
     ) -> Message:
         """
         Send a message to a channel. To reply or forward messages, please see the details on referencing messages.
+
+        `embeds` can be `RichEmbed`s, `EmbedBuilder`s or payloads rendered
+        from an `EmbedTemplate`.
         """
         body: dict[str, Any] = {"content": content}
         
@@ -175,7 +316,7 @@ class RESTClient:
         
         # Handle embeds
         if embeds is not None:
-            body["embeds"] = [embed._copy_state() for embed in embeds]
+            body["embeds"] = [_embed_payload(embed) for embed in embeds]
         
         # Handle attachments
         files: dict[str, tuple[bytes, str]] | None = None
@@ -209,32 +350,35 @@ class RESTClient:
         data = await self._post(f"/channels/{channel_id}/messages", body, files=files)
         return Message(data)
 
-    async def fetch_message(self, channel_id: str, message_id: str) -> Message:
+    async def fetch_message(self, channel_id: SnowflakeLike, message_id: SnowflakeLike) -> Message:
         """Get a single message."""
         data = await self._get(f"/channels/{channel_id}/messages/{message_id}")
         return Message(data)
 
     async def fetch_messages(
         self,
-        channel_id: str,
+        channel_id: SnowflakeLike,
         *,
         limit: int = 50,
-        before: str | None = None,
-        after: str | None = None,
-        around: str | None = None,
+        before: SnowflakeLike | None = None,
+        after: SnowflakeLike | None = None,
+        around: SnowflakeLike | None = None,
     ) -> list[Message]:
         """
         Fetch up to *limit* messages from a channel.
 
+        Use `Snowflake.from_datetime` to page by time, ie
+        ``before=Snowflake.from_datetime(an_hour_ago)``.
+
         ``GET /channels/{channel_id}/messages``
         """
         params: dict[str, Any] = {"limit": limit}
-        if before:
-            params["before"] = before
-        if after:
-            params["after"] = after
-        if around:
-            params["around"] = around
+        if before is not None:
+            params["before"] = str(before)
+        if after is not None:
+            params["after"] = str(after)
+        if around is not None:
+            params["around"] = str(around)
         data = await self._get(f"/channels/{channel_id}/messages", params=params)
         # The endpoint returns a list, not a dict
         if isinstance(data, list):
@@ -243,31 +387,172 @@ class RESTClient:
 
     async def edit_message(
         self,
-        channel_id: str,
-        message_id: str,
+        channel_id: SnowflakeLike,
+        message_id: SnowflakeLike,
         *,
         content: str | None = None,
-        embeds: list[RichEmbed] | None = None,
+        embeds: list[RichEmbed | EmbedBuilder | dict[str, Any]] | None = None,
     ) -> Message:
         """Edit one of the bot's own messages."""
         body: dict[str, Any] = {}
         if content is not None:
             body["content"] = content
         if embeds is not None:
-            body["embeds"] = [embed._copy_state() for embed in embeds]
+            body["embeds"] = [_embed_payload(embed) for embed in embeds]
         data = await self._patch(f"/channels/{channel_id}/messages/{message_id}", body)
         return Message(data)
 
-    async def delete_message(self, channel_id: str, message_id: str) -> None:
+    async def queue_message(self, channel_id: SnowflakeLike, **kwargs: Any) -> Message:
+        """
+        `create_message`, except that messages queued for the same channel
+        are sent one at a time in the order they were queued.
+        """
+        key = Snowflake(channel_id)
+        async with self._outbox_lock(key):
+            try:
+                return await self.create_message(key, **kwargs)
+            finally:
+                self._release_outbox_lock(key)
+
+    async def queue_edit(
+        self,
+        channel_id: SnowflakeLike,
+        message_id: SnowflakeLike,
+        *,
+        content: str | None = None,
+        embeds: list[RichEmbed | EmbedBuilder | dict[str, Any]] | None = None,
+    ) -> Message:
+        """
+        `edit_message` for messages that change a lot (progress bars, game
+        boards...). The edit is held for `edit_flush_interval` seconds, and
+        any other edits to the same message in that time are merged into it
+        (newest wins), so a burst of edits costs one request.
+
+        Every caller gets back the message as it was after the combined edit.
+        """
+        key = (Snowflake(channel_id), Snowflake(message_id))
+        fields: dict[str, Any] = {}
+        if content is not None:
+            fields["content"] = content
+        if embeds is not None:
+            fields["embeds"] = embeds
+
+        pending = self._pending_edits.get(key)
+        if pending is not None:
+            pending.fields.update(fields)
+            return await pending.wait()
+
+        # First edit in this burst - we're the one that sends it.
+        pending = self._pending_edits[key] = _PendingEdit(fields)
+        try:
+            await anyio.sleep(self.edit_flush_interval)
+            async with self._outbox_lock(key):
+                try:
+                    # Stop merging once it's our turn, so edits made while
+                    # this one is in flight start a new burst.
+                    if self._pending_edits.get(key) is pending:
+                        del self._pending_edits[key]
+                    pending.result = await self.edit_message(*key, **pending.fields)
+                except Exception as e:
+                    pending.error = e
+                finally:
+                    self._release_outbox_lock(key)
+        finally:
+            if not pending.done.is_set():
+                # Cancelled before it was sent; don't leave merged callers hanging.
+                if self._pending_edits.get(key) is pending:
+                    del self._pending_edits[key]
+                if pending.result is None and pending.error is None:
+                    pending.error = FluxCrystalError("The edit was cancelled before it was sent")
+                pending.done.set()
+        return await pending.wait()
+
+    def _outbox_lock(self, key: Any) -> anyio.Lock:
+        lock = self._outbox_locks.get(key)
+        if lock is None:
+            lock = self._outbox_locks[key] = anyio.Lock()
+        return lock
+
+    def _release_outbox_lock(self, key: Any) -> None:
+        # Called while still holding the lock; drop it if nobody else wants it.
+        lock = self._outbox_locks.get(key)
+        if lock is not None and lock.statistics().tasks_waiting == 0:
+            del self._outbox_locks[key]
+
+    async def delete_message(self, channel_id: SnowflakeLike, message_id: SnowflakeLike) -> None:
         """Nuke a message."""
         await self._delete(f"/channels/{channel_id}/messages/{message_id}")
 
-    async def send_typing(self, channel_id: str) -> None:
+    async def bulk_delete_messages(
+        self,
+        channel_id: SnowflakeLike,
+        message_ids: Iterable[SnowflakeLike],
+        *,
+        concurrency: int | None = None,
+    ) -> list[BulkResult]:
+        """
+        Delete a lot of messages from a channel with as few requests as
+        possible.
+
+        Messages are sent to the bulk delete endpoint 100 at a time. Ones
+        too old for it (two weeks, going by their IDs) and odd leftovers
+        are deleted one by one. Requests run concurrently, within the
+        rate limits.
+
+        Returns one `BulkResult` per message, in the order given.
+
+        ``POST /channels/{channel_id}/messages/bulk-delete``
+        """
+        ids = list(dict.fromkeys(Snowflake(m) for m in message_ids))
+        cutoff = int(time.time() * 1000) - _BULK_DELETE_MAX_AGE_MS
+        recent = [m for m in ids if m.timestamp > cutoff]
+        singles = [m for m in ids if m.timestamp <= cutoff]
+        chunks = [
+            recent[i : i + _BULK_DELETE_MAX] for i in range(0, len(recent), _BULK_DELETE_MAX)
+        ]
+        if chunks and len(chunks[-1]) == 1:
+            # The bulk endpoint wants at least two.
+            singles.extend(chunks.pop())
+
+        errors: dict[Snowflake, Exception] = {}
+        limiter = anyio.CapacityLimiter(
+            self._bulk_concurrency(
+                "POST", f"/channels/{channel_id}/messages/bulk-delete", concurrency
+            )
+        )
+
+        async def delete_chunk(chunk: list[Snowflake]) -> None:
+            async with limiter:
+                try:
+                    await self._post(
+                        f"/channels/{channel_id}/messages/bulk-delete",
+                        {"messages": [str(m) for m in chunk]},
+                    )
+                except Exception as e:
+                    for m in chunk:
+                        errors[m] = e
+
+        async def delete_one(message_id: Snowflake) -> None:
+            async with limiter:
+                try:
+                    await self.delete_message(channel_id, message_id)
+                except Exception as e:
+                    errors[message_id] = e
+
+        async with anyio.create_task_group() as tg:
+            for chunk in chunks:
+                tg.start_soon(delete_chunk, chunk)
+            for message_id in singles:
+                tg.start_soon(delete_one, message_id)
+
+        return [BulkResult(m, errors.get(m)) for m in ids]
+
+    async def send_typing(self, channel_id: SnowflakeLike) -> None:
         """Show the "user is typing..." indicator in a channel."""
         await self._post(f"/channels/{channel_id}/typing")
 
     async def add_reaction(
-        self, channel_id: str, message_id: str, emoji: str
+        self, channel_id: SnowflakeLike, message_id: SnowflakeLike, emoji: str
     ) -> None:
         """
         Add a reaction to a message.
@@ -280,7 +565,7 @@ class RESTClient:
         )
 
     async def remove_reaction(
-        self, channel_id: str, message_id: str, emoji: str
+        self, channel_id: SnowflakeLike, message_id: SnowflakeLike, emoji: str
     ) -> None:
         """
         Remove the bot's reaction from a message.
@@ -296,12 +581,12 @@ class RESTClient:
     # Channels
     # ------------------------------------------------------------------
 
-    async def fetch_channel(self, channel_id: str) -> Channel:
+    async def fetch_channel(self, channel_id: SnowflakeLike) -> Channel:
         """Get a channel by its ID."""
         data = await self._get(f"/channels/{channel_id}")
         return Channel(data)
 
-    async def fetch_guild_channels(self, guild_id: str) -> list[Channel]:
+    async def fetch_guild_channels(self, guild_id: SnowflakeLike) -> list[Channel]:
         """Get all channels in a guild."""
         data = await self._get(f"/guilds/{guild_id}/channels")
         if isinstance(data, list):
@@ -312,26 +597,26 @@ class RESTClient:
     # Guilds
     # ------------------------------------------------------------------
 
-    async def fetch_guild(self, guild_id: str) -> Guild:
+    async def fetch_guild(self, guild_id: SnowflakeLike) -> Guild:
         """Get a guild by its ID."""
         data = await self._get(f"/guilds/{guild_id}")
         return Guild(data)
 
     async def fetch_guild_member(
-        self, guild_id: str, user_id: str
+        self, guild_id: SnowflakeLike, user_id: SnowflakeLike
     ) -> GuildMember:
         """Get a specific member of a guild."""
         data = await self._get(f"/guilds/{guild_id}/members/{user_id}")
         return GuildMember(data)
 
-    async def kick_member(self, guild_id: str, user_id: str) -> None:
+    async def kick_member(self, guild_id: SnowflakeLike, user_id: SnowflakeLike) -> None:
         """Kick a user from a guild."""
         await self._delete(f"/guilds/{guild_id}/members/{user_id}")
 
     async def ban_member(
         self,
-        guild_id: str,
-        user_id: str,
+        guild_id: SnowflakeLike,
+        user_id: SnowflakeLike,
         *,
         delete_message_days: int = 0,
         reason: str | None = None,
@@ -342,12 +627,12 @@ class RESTClient:
             body["reason"] = reason
         await self._put(f"/guilds/{guild_id}/bans/{user_id}", body)
 
-    async def unban_member(self, guild_id: str, user_id: str) -> None:
+    async def unban_member(self, guild_id: SnowflakeLike, user_id: SnowflakeLike) -> None:
         """Lift a ban on a user."""
         await self._delete(f"/guilds/{guild_id}/bans/{user_id}")
 
     async def add_member_role(
-        self, guild_id: str, user_id: str, role_id: str
+        self, guild_id: SnowflakeLike, user_id: SnowflakeLike, role_id: SnowflakeLike
     ) -> None:
         """Give a role to a guild member."""
         await self._put(
@@ -355,13 +640,112 @@ class RESTClient:
         )
 
     async def remove_member_role(
-        self, guild_id: str, user_id: str, role_id: str
+        self, guild_id: SnowflakeLike, user_id: SnowflakeLike, role_id: SnowflakeLike
     ) -> None:
         """Take a role away from a guild member."""
         await self._delete(
             f"/guilds/{guild_id}/members/{user_id}/roles/{role_id}"
         )
 
+    # ------------------------------------------------------------------
+    # Bulk moderation
+    # ------------------------------------------------------------------
+
+    def _bulk_concurrency(self, method: str, sample_path: str, concurrency: int | None) -> int:
+        if concurrency is not None:
+            return concurrency
+        capacity = self.ratelimits.capacity(route_key(method, sample_path))
+        return capacity or _DEFAULT_BULK_CONCURRENCY
+
+    def bulk_ban(
+        self,
+        guild_id: SnowflakeLike,
+        user_ids: Iterable[SnowflakeLike],
+        *,
+        delete_message_days: int = 0,
+        reason: str | None = None,
+        concurrency: int | None = None,
+    ) -> BulkOperation:
+        """
+        Ban a lot of users at once. See `BulkOperation` for how to run it and
+        follow progress.
+
+        `concurrency` defaults to the ban route's rate limit, once it's known.
+        """
+
+        async def ban(user_id: Snowflake) -> None:
+            await self.ban_member(
+                guild_id, user_id, delete_message_days=delete_message_days, reason=reason
+            )
+
+        return BulkOperation(
+            ban,
+            user_ids,
+            concurrency=self._bulk_concurrency("PUT", f"/guilds/{guild_id}/bans/0", concurrency),
+        )
+
+    def bulk_kick(
+        self,
+        guild_id: SnowflakeLike,
+        user_ids: Iterable[SnowflakeLike],
+        *,
+        concurrency: int | None = None,
+    ) -> BulkOperation:
+        """Kick a lot of users at once. See `BulkOperation`."""
+
+        async def kick(user_id: Snowflake) -> None:
+            await self.kick_member(guild_id, user_id)
+
+        return BulkOperation(
+            kick,
+            user_ids,
+            concurrency=self._bulk_concurrency(
+                "DELETE", f"/guilds/{guild_id}/members/0", concurrency
+            ),
+        )
+
+    def bulk_add_role(
+        self,
+        guild_id: SnowflakeLike,
+        user_ids: Iterable[SnowflakeLike],
+        role_id: SnowflakeLike,
+        *,
+        concurrency: int | None = None,
+    ) -> BulkOperation:
+        """Give a role to a lot of members at once. See `BulkOperation`."""
+
+        async def add_role(user_id: Snowflake) -> None:
+            await self.add_member_role(guild_id, user_id, role_id)
+
+        return BulkOperation(
+            add_role,
+            user_ids,
+            concurrency=self._bulk_concurrency(
+                "PUT", f"/guilds/{guild_id}/members/0/roles/0", concurrency
+            ),
+        )
+
+    def bulk_remove_role(
+        self,
+        guild_id: SnowflakeLike,
+        user_ids: Iterable[SnowflakeLike],
+        role_id: SnowflakeLike,
+        *,
+        concurrency: int | None = None,
+    ) -> BulkOperation:
+        """Take a role away from a lot of members at once. See `BulkOperation`."""
+
+        async def remove_role(user_id: Snowflake) -> None:
+            await self.remove_member_role(guild_id, user_id, role_id)
+
+        return BulkOperation(
+            remove_role,
+            user_ids,
+            concurrency=self._bulk_concurrency(
+                "DELETE", f"/guilds/{guild_id}/members/0/roles/0", concurrency
+            ),
+        )
+
     # ------------------------------------------------------------------
     # Users
     # ------------------------------------------------------------------
@@ -371,7 +755,7 @@ class RESTClient:
         data = await self._get("/users/@me")
         return User(data)
 
-    async def fetch_user(self, user_id: str) -> User:
+    async def fetch_user(self, user_id: SnowflakeLike) -> User:
         """Get a user by their ID."""
         data = await self._get(f"/users/{user_id}")
         return User(data)
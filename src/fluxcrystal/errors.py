@@ -1292,6 +1292,35 @@ class UsernameNotAvailableError(FluxCrystalError):
     """Username not available."""
 
 
+# ---------------------------------------------------------------------------
+# Client-side validation
+# ---------------------------------------------------------------------------
+
+class EmbedTooLargeError(FluxCrystalError):
+    """Embed is over one of the API's size limits (caught before sending)."""
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+class CommandError(FluxCrystalError):
+    """Base class for errors raised while running a prefix command."""
+
+
+class ArgumentError(CommandError):
+    """A command argument was missing or couldn't be converted."""
+
+
+class CommandOnCooldownError(CommandError):
+    """A command was used too often and is on cooldown."""
+
+    def __init__(self, message: str, retry_after: float = 0.0) -> None:
+        super().__init__(message)
+        #: Seconds until the command can be used again.
+        self.retry_after: float = retry_after
+
+
 # ---------------------------------------------------------------------------
 # Error code → exception class mapping
 # ---------------------------------------------------------------------------
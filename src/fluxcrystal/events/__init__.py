@@ -25,6 +25,10 @@ from fluxcrystal.events.messages import (
     MessageDeleteEvent as MessageDeleteEvent,
     MessageUpdateEvent as MessageUpdateEvent,
 )
+from fluxcrystal.events.moderation import (
+    RaidDetectedEvent as RaidDetectedEvent,
+    SpamDetectedEvent as SpamDetectedEvent,
+)
 
 __all__ = [
     "Event",
@@ -48,4 +52,7 @@ __all__ = [
     "ChannelDeleteEvent",
     "ChannelUpdateEvent",
     "TypingStartEvent",
+    # moderation
+    "RaidDetectedEvent",
+    "SpamDetectedEvent",
 ]
@@ -5,7 +5,13 @@ Base event type for all fluxcrystal events.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from fluxcrystal.models.users import User
+
+_MISSING = object()
 
 
 class Event(ABC):
@@ -30,3 +36,27 @@ class Event(ABC):
         """
         The gateway dispatch event name this event corresponds to (ie `"MESSAGE_CREATE"`).
         """
+
+
+def _resolve_user(app: Any, data: dict[str, Any]) -> User:
+    """
+    Get the shared `User` for a payload from the app's cache, so events and
+    the cache don't each allocate their own copy.
+    """
+    cache = getattr(app, "cache", None)
+    if cache is None:
+        from fluxcrystal.models.users import User
+
+        return User(data)
+    return cache._store_user(data)
+
+
+def _changed_fields(
+    before: object, after: object, fields: Iterable[str]
+) -> frozenset[str]:
+    """The names of the `fields` whose values differ between `before` and `after`."""
+    return frozenset(
+        field
+        for field in fields
+        if getattr(before, field, _MISSING) != getattr(after, field, _MISSING)
+    )
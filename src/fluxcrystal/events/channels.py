@@ -6,8 +6,9 @@ from __future__ import annotations
 
 from typing import Any
 
-from fluxcrystal.events.base import Event
+from fluxcrystal.events.base import Event, _changed_fields
 from fluxcrystal.models.channels import Channel
+from fluxcrystal.models.snowflake import Snowflake, _optional_snowflake
 
 
 class ChannelCreateEvent(Event):
@@ -30,16 +31,38 @@ class ChannelCreateEvent(Event):
 class ChannelUpdateEvent(Event):
     """Fired when a channel is updated."""
 
-    __slots__ = ("channel",)
+    __slots__ = ("channel", "before", "_changes")
 
-    def __init__(self, app: Any, data: dict[str, Any]) -> None:
+    def __init__(
+        self, app: Any, data: dict[str, Any], before: Channel | None = None
+    ) -> None:
         super().__init__(app)
-        self.channel: Channel = Channel(data)
+        cache = getattr(app, "cache", None)
+        channel = cache.get_channel(data["id"]) if cache is not None else None
+        #: The channel after the update; the cached instance when there is
+        #: one, which the cache has already patched in place.
+        self.channel: Channel = channel if channel is not None else Channel(data)
+        #: The channel as it was before the update, if it was cached.
+        self.before: Channel | None = before
+        self._changes: frozenset[str] | None = None
 
     @classmethod
     def event_name(cls) -> str:
         return "CHANNEL_UPDATE"
 
+    @property
+    def changes(self) -> frozenset[str]:
+        """
+        Names of the `Channel` fields that changed (ie ``"name"``), or an
+        empty set if the old state wasn't cached.
+        """
+        if self._changes is None:
+            if self.before is None:
+                self._changes = frozenset()
+            else:
+                self._changes = _changed_fields(self.before, self.channel, Channel.__slots__)
+        return self._changes
+
     def __repr__(self) -> str:
         return f"<ChannelUpdateEvent channel={self.channel!r}>"
 
@@ -68,9 +91,9 @@ class TypingStartEvent(Event):
 
     def __init__(self, app: Any, data: dict[str, Any]) -> None:
         super().__init__(app)
-        self.channel_id: str = data["channel_id"]
-        self.guild_id: str | None = data.get("guild_id")
-        self.user_id: str = data["user_id"]
+        self.channel_id: Snowflake = Snowflake(data["channel_id"])
+        self.guild_id: Snowflake | None = _optional_snowflake(data.get("guild_id"))
+        self.user_id: Snowflake = Snowflake(data["user_id"])
         self.timestamp: int = data.get("timestamp", 0)
 
     @classmethod
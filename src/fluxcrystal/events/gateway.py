@@ -6,7 +6,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from fluxcrystal.events.base import Event
+from fluxcrystal.events.base import Event, _resolve_user
 from fluxcrystal.models.users import User
 
 
@@ -17,7 +17,7 @@ class ReadyEvent(Event):
 
     def __init__(self, app: Any, data: dict[str, Any]) -> None:
         super().__init__(app)
-        self.user: User = User(data["user"])
+        self.user: User = _resolve_user(app, data["user"])
         self.session_id: str = data.get("session_id", "")
         self.resume_gateway_url: str | None = data.get("resume_gateway_url")
 
@@ -6,8 +6,9 @@ from __future__ import annotations
 
 from typing import Any
 
-from fluxcrystal.events.base import Event
-from fluxcrystal.models.guilds import Guild, GuildMember
+from fluxcrystal.events.base import Event, _changed_fields, _resolve_user
+from fluxcrystal.models.guilds import Guild, GuildMember, Role
+from fluxcrystal.models.snowflake import Snowflake
 from fluxcrystal.models.users import User
 
 
@@ -25,7 +26,7 @@ class GuildCreateEvent(Event):
         return "GUILD_CREATE"
 
     @property
-    def guild_id(self) -> str:
+    def guild_id(self) -> Snowflake:
         """The ID of the guild."""
         return self.guild.id
 
@@ -36,16 +37,46 @@ class GuildCreateEvent(Event):
 class GuildUpdateEvent(Event):
     """Fired when a guild's settings are updated."""
 
-    __slots__ = ("guild",)
+    __slots__ = ("guild", "before", "_changes")
 
-    def __init__(self, app: Any, data: dict[str, Any]) -> None:
+    def __init__(
+        self, app: Any, data: dict[str, Any], before: Guild | None = None
+    ) -> None:
         super().__init__(app)
-        self.guild: Guild = Guild(data)
+        cache = getattr(app, "cache", None)
+        guild = cache.get_guild(data["id"]) if cache is not None else None
+        #: The guild after the update; the cached instance when there is one,
+        #: which the cache has already patched in place.
+        self.guild: Guild = guild if guild is not None else Guild(data)
+        #: The guild as it was before the update, if it was cached.
+        self.before: Guild | None = before
+        self._changes: frozenset[str] | None = None
 
     @classmethod
     def event_name(cls) -> str:
         return "GUILD_UPDATE"
 
+    @property
+    def changes(self) -> frozenset[str]:
+        """
+        Names of the `Guild` fields that changed (ie ``"name"``), or an
+        empty set if the old state wasn't cached.
+        """
+        if self._changes is None:
+            if self.before is None:
+                self._changes = frozenset()
+            else:
+                changes = _changed_fields(self.before, self.guild, Guild.__slots__)
+                if "roles" not in changes:
+                    # Roles compare by ID, so also look for edits to the roles themselves.
+                    old_roles = self.before.roles
+                    for role_id, role in self.guild.roles.items():
+                        if _changed_fields(old_roles[role_id], role, Role.__slots__):
+                            changes |= {"roles"}
+                            break
+                self._changes = changes
+        return self._changes
+
     def __repr__(self) -> str:
         return f"<GuildUpdateEvent guild={self.guild!r}>"
 
@@ -57,7 +88,7 @@ class GuildDeleteEvent(Event):
 
     def __init__(self, app: Any, data: dict[str, Any]) -> None:
         super().__init__(app)
-        self.guild_id: str = data["id"]
+        self.guild_id: Snowflake = Snowflake(data["id"])
         self.unavailable: bool = data.get("unavailable", False)
 
     @classmethod
@@ -78,8 +109,10 @@ class GuildMemberAddEvent(Event):
 
     def __init__(self, app: Any, data: dict[str, Any]) -> None:
         super().__init__(app)
-        self.guild_id: str = data["guild_id"]
-        self.member: GuildMember = GuildMember(data)
+        self.guild_id: Snowflake = Snowflake(data["guild_id"])
+        self.member: GuildMember = GuildMember(
+            data, user=_resolve_user(app, data["user"])
+        )
 
     @classmethod
     def event_name(cls) -> str:
@@ -99,8 +132,8 @@ class GuildMemberRemoveEvent(Event):
 
     def __init__(self, app: Any, data: dict[str, Any]) -> None:
         super().__init__(app)
-        self.guild_id: str = data["guild_id"]
-        self.user: User = User(data["user"])
+        self.guild_id: Snowflake = Snowflake(data["guild_id"])
+        self.user: User = _resolve_user(app, data["user"])
 
     @classmethod
     def event_name(cls) -> str:
@@ -116,19 +149,62 @@ class GuildMemberRemoveEvent(Event):
 class GuildMemberUpdateEvent(Event):
     """Fired when a guild member's properties are updated (nick, roles, etc.)."""
 
-    __slots__ = ("guild_id", "user", "nick", "roles")
-
-    def __init__(self, app: Any, data: dict[str, Any]) -> None:
+    __slots__ = (
+        "guild_id",
+        "user",
+        "nick",
+        "roles",
+        "communication_disabled_until",
+        "before",
+        "_present",
+        "_changes",
+    )
+
+    def __init__(
+        self, app: Any, data: dict[str, Any], before: GuildMember | None = None
+    ) -> None:
         super().__init__(app)
-        self.guild_id: str = data["guild_id"]
-        self.user: User = User(data["user"])
+        self.guild_id: Snowflake = Snowflake(data["guild_id"])
+        self.user: User = _resolve_user(app, data["user"])
         self.nick: str | None = data.get("nick")
-        self.roles: list[str] = data.get("roles", [])
+        self.roles: list[Snowflake] = [Snowflake(r) for r in data.get("roles", [])]
+        self.communication_disabled_until: str | None = data.get(
+            "communication_disabled_until"
+        )
+        #: The member as they were before the update, if they were cached.
+        self.before: GuildMember | None = before
+        # Partial updates leave fields out; those can't have changed.
+        self._present: tuple[str, ...] = tuple(
+            f for f in ("nick", "roles", "communication_disabled_until") if f in data
+        )
+        self._changes: frozenset[str] | None = None
 
     @classmethod
     def event_name(cls) -> str:
         return "GUILD_MEMBER_UPDATE"
 
+    @property
+    def changes(self) -> frozenset[str]:
+        """
+        Which of ``"nick"``, ``"roles"``, ``"communication_disabled_until"``
+        and ``"user"`` changed, or an empty set if the old state wasn't cached.
+        """
+        if self._changes is None:
+            if self.before is None:
+                self._changes = frozenset()
+            else:
+                present = self._present
+                changes = _changed_fields(
+                    self.before, self, [f for f in present if f != "roles"]
+                )
+                if "roles" in present and set(self.roles) != set(self.before.roles):
+                    # Roles are a set; the API doesn't keep their order.
+                    changes |= {"roles"}
+                if _changed_fields(self.before.user, self.user, User.__slots__):
+                    changes |= {"user"}
+                self._changes = changes
+        return self._changes
+
     def __repr__(self) -> str:
         return (
             f"<GuildMemberUpdateEvent guild_id={self.guild_id!r} "
@@ -143,8 +219,8 @@ class GuildBanAddEvent(Event):
 
     def __init__(self, app: Any, data: dict[str, Any]) -> None:
         super().__init__(app)
-        self.guild_id: str = data["guild_id"]
-        self.user: User = User(data["user"])
+        self.guild_id: Snowflake = Snowflake(data["guild_id"])
+        self.user: User = _resolve_user(app, data["user"])
 
     @classmethod
     def event_name(cls) -> str:
@@ -163,8 +239,8 @@ class GuildBanRemoveEvent(Event):
 
     def __init__(self, app: Any, data: dict[str, Any]) -> None:
         super().__init__(app)
-        self.guild_id: str = data["guild_id"]
-        self.user: User = User(data["user"])
+        self.guild_id: Snowflake = Snowflake(data["guild_id"])
+        self.user: User = _resolve_user(app, data["user"])
 
     @classmethod
     def event_name(cls) -> str:
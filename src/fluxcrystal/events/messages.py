@@ -4,15 +4,29 @@ Message-related gateway events.
 
 from __future__ import annotations
 
+import copy
 from typing import TYPE_CHECKING, Any
 
-from fluxcrystal.events.base import Event
+from fluxcrystal.events.base import Event, _changed_fields, _resolve_user
 from fluxcrystal.models.messages import Message
+from fluxcrystal.models.snowflake import Snowflake, _optional_snowflake
 from fluxcrystal.models.users import User
 
 if TYPE_CHECKING:
     pass
 
+# Fields a MESSAGE_UPDATE can change, compared for MessageUpdateEvent.changes.
+_UPDATABLE_FIELDS = (
+    "content",
+    "edited_timestamp",
+    "tts",
+    "mention_everyone",
+    "pinned",
+    "flags",
+    "attachments",
+    "embeds",
+)
+
 
 class MessageCreateEvent(Event):
     """Fired when a new message is created in any channel the bot can see."""
@@ -21,7 +35,14 @@ class MessageCreateEvent(Event):
 
     def __init__(self, app: Any, data: dict[str, Any]) -> None:
         super().__init__(app)
-        self.message: Message = Message(data)
+        cache = getattr(app, "cache", None)
+        # With the message cache on, the cache has just built this message.
+        message = cache.get_message(data["id"]) if cache is not None else None
+        if message is None:
+            # The author stays raw until someone asks for it; `Message.author`
+            # then picks up the cache's shared User.
+            message = Message(data, cache=cache)
+        self.message: Message = message
 
     @classmethod
     def event_name(cls) -> str:
@@ -30,34 +51,41 @@ class MessageCreateEvent(Event):
     # ── Convenience pass-throughs ────────────────────────────────────────
 
     @property
-    def channel_id(self) -> str:
+    def channel_id(self) -> Snowflake:
         """The ID of the channel the message was sent in."""
         return self.message.channel_id
 
     @property
-    def guild_id(self) -> str | None:
+    def guild_id(self) -> Snowflake | None:
         """The ID of the guild, if this was a guild message."""
         return self.message.guild_id
 
     @property
     def author(self) -> User:
         """The user who sent the message."""
-        return self.message.author
+        author = self.message.author
+        assert author is not None  # new messages always come with one
+        return author
 
     @property
     def content(self) -> str:
         """The text content of the message."""
         return self.message.content
 
+    @property
+    def mentions_me(self) -> bool:
+        """True if the message mentions the bot's own user."""
+        return self.message.mentions_me
+
     @property
     def is_human(self) -> bool:
         """True if this was sent by a real person, not a bot or webhook."""
-        return not self.message.author.bot and not self.message.is_webhook
+        return not self.author.bot and not self.message.is_webhook
 
     @property
     def is_bot(self) -> bool:
         """True if this was sent by a bot account."""
-        return self.message.author.bot
+        return self.author.bot
 
     def __repr__(self) -> str:
         return f"<MessageCreateEvent message={self.message!r}>"
@@ -66,23 +94,55 @@ class MessageCreateEvent(Event):
 class MessageUpdateEvent(Event):
     """Fired when a message is edited."""
 
-    __slots__ = ("message",)
+    __slots__ = ("message", "before", "_changes")
 
-    def __init__(self, app: Any, data: dict[str, Any]) -> None:
+    def __init__(
+        self, app: Any, data: dict[str, Any], before: Message | None = None
+    ) -> None:
         super().__init__(app)
-        self.message: Message = Message(data)
+        cached = None
+        if before is not None:
+            # The cache has already patched this (possibly partial) update
+            # onto the full message, so that's the best picture of it.
+            cached = app.cache.get_message(data["id"])
+        if cached is not None:
+            message = copy.copy(cached)
+        else:
+            author_data = data.get("author")
+            if author_data is not None:
+                author = _resolve_user(app, author_data)
+            else:
+                author = before.author if before is not None else None
+            message = Message(data, author=author, cache=getattr(app, "cache", None))
+        self.message: Message = message
+        #: The message as it was before the edit, if it was in the message cache.
+        self.before: Message | None = before
+        self._changes: frozenset[str] | None = None
 
     @classmethod
     def event_name(cls) -> str:
         return "MESSAGE_UPDATE"
 
     @property
-    def channel_id(self) -> str:
+    def changes(self) -> frozenset[str]:
+        """
+        Names of the `Message` fields that changed (ie ``"content"``), or an
+        empty set if the old message wasn't cached.
+        """
+        if self._changes is None:
+            if self.before is None:
+                self._changes = frozenset()
+            else:
+                self._changes = _changed_fields(self.before, self.message, _UPDATABLE_FIELDS)
+        return self._changes
+
+    @property
+    def channel_id(self) -> Snowflake:
         """The ID of the channel containing the edited message."""
         return self.message.channel_id
 
     @property
-    def guild_id(self) -> str | None:
+    def guild_id(self) -> Snowflake | None:
         """The ID of the guild, if this was a guild message."""
         return self.message.guild_id
 
@@ -98,13 +158,17 @@ class MessageUpdateEvent(Event):
 class MessageDeleteEvent(Event):
     """Fired when a message is deleted."""
 
-    __slots__ = ("message_id", "channel_id", "guild_id")
+    __slots__ = ("message_id", "channel_id", "guild_id", "message")
 
-    def __init__(self, app: Any, data: dict[str, Any]) -> None:
+    def __init__(
+        self, app: Any, data: dict[str, Any], message: Message | None = None
+    ) -> None:
         super().__init__(app)
-        self.message_id: str = data["id"]
-        self.channel_id: str = data["channel_id"]
-        self.guild_id: str | None = data.get("guild_id")
+        self.message_id: Snowflake = Snowflake(data["id"])
+        self.channel_id: Snowflake = Snowflake(data["channel_id"])
+        self.guild_id: Snowflake | None = _optional_snowflake(data.get("guild_id"))
+        #: The deleted message, if it was in the message cache.
+        self.message: Message | None = message
 
     @classmethod
     def event_name(cls) -> str:
@@ -0,0 +1,63 @@
+"""
+Synthetic moderation events, fired by `fluxcrystal.detection` rather than
+the gateway.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fluxcrystal.events.base import Event
+from fluxcrystal.models.snowflake import Snowflake, _optional_snowflake
+
+
+class SpamDetectedEvent(Event):
+    """
+    Fired by a `fluxcrystal.SpamDetector` when a user sends too many
+    messages, or the same message too many times, too quickly.
+    """
+
+    __slots__ = ("guild_id", "channel_id", "user_id", "reason", "message_ids")
+
+    def __init__(self, app: Any, data: dict[str, Any]) -> None:
+        super().__init__(app)
+        self.guild_id: Snowflake | None = _optional_snowflake(data.get("guild_id"))
+        #: The channel the last offending message was sent in.
+        self.channel_id: Snowflake = Snowflake(data["channel_id"])
+        self.user_id: Snowflake = Snowflake(data["user_id"])
+        #: ``"flood"`` for too many messages, ``"duplicate"`` for repeats.
+        self.reason: str = data["reason"]
+        #: The messages that tripped the detector, oldest first.
+        self.message_ids: list[Snowflake] = [Snowflake(m) for m in data["message_ids"]]
+
+    @classmethod
+    def event_name(cls) -> str:
+        return "SPAM_DETECTED"
+
+    def __repr__(self) -> str:
+        return (
+            f"<SpamDetectedEvent user_id={self.user_id!r} reason={self.reason!r} "
+            f"messages={len(self.message_ids)}>"
+        )
+
+
+class RaidDetectedEvent(Event):
+    """
+    Fired by a `fluxcrystal.RaidDetector` when too many members join a
+    guild too quickly.
+    """
+
+    __slots__ = ("guild_id", "user_ids")
+
+    def __init__(self, app: Any, data: dict[str, Any]) -> None:
+        super().__init__(app)
+        self.guild_id: Snowflake = Snowflake(data["guild_id"])
+        #: The users who joined during the burst, oldest first.
+        self.user_ids: list[Snowflake] = [Snowflake(u) for u in data["user_ids"]]
+
+    @classmethod
+    def event_name(cls) -> str:
+        return "RAID_DETECTED"
+
+    def __repr__(self) -> str:
+        return f"<RaidDetectedEvent guild_id={self.guild_id!r} joins={len(self.user_ids)}>"
@@ -0,0 +1,319 @@
+"""
+Keyword and regex filters for automod.
+
+    filters = fluxcrystal.FilterEngine()
+    filters.set_rules(guild_id, [
+        fluxcrystal.FilterRule("slurs", keywords=("badword", "worseword")),
+        fluxcrystal.FilterRule("invites", patterns=(r"discord\\.gg/\\w+",)),
+    ])
+
+    @bot.listen()
+    async def on_message(event: fluxcrystal.MessageCreateEvent) -> None:
+        hits = filters.match_message(event.message)
+        if "invites" in hits:
+            ...
+
+Each guild's keywords are compiled into a single Aho-Corasick automaton
+and its regexes into one combined pattern, so checking a message is one
+pass over its content however many rules there are. Guilds with the same
+rules share compiled matchers, and changing one rule only recompiles the
+half (keywords or regexes) it touched.
+"""
+
+from __future__ import annotations
+
+import re
+import weakref
+from collections import deque
+from collections.abc import Hashable, Iterable
+from typing import TYPE_CHECKING
+
+from fluxcrystal.models.snowflake import Snowflake, SnowflakeLike
+
+if TYPE_CHECKING:
+    from fluxcrystal.models.messages import Message
+
+_NO_MATCHES: frozenset[Hashable] = frozenset()
+
+# Patterns that use backreferences or named groups can't be merged into the
+# combined regex (group numbers/names would clash), and global inline flags
+# like ``(?i)`` are only allowed at the very start of one, so those patterns
+# run on their own.
+_UNMERGEABLE_RE = re.compile(r"\\[1-9]|\(\?P[<=]|^\(\?[aiLmsux]+\)")
+
+
+class FilterRule:
+    """
+    One automod rule.
+
+    Args:
+        id: What `FilterEngine.match` reports when this rule hits.
+        keywords: Literal strings to look for anywhere in the content
+            (case-insensitive).
+        patterns: Regular expressions to search for. They're merged into
+            one big pattern; ones with global flags like ``(?i)`` still work
+            but are run separately, so prefer scoped ones (``(?i:...)``).
+    """
+
+    __slots__ = ("id", "keywords", "patterns")
+
+    def __init__(
+        self,
+        id: Hashable,
+        *,
+        keywords: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+    ) -> None:
+        self.id: Hashable = id
+        self.keywords: tuple[str, ...] = tuple(k.casefold() for k in keywords if k)
+        self.patterns: tuple[str, ...] = tuple(patterns)
+        for pattern in self.patterns:
+            re.compile(pattern)  # fail now rather than when the matcher is built
+
+    def __repr__(self) -> str:
+        return (
+            f"<FilterRule id={self.id!r} keywords={len(self.keywords)} "
+            f"patterns={len(self.patterns)}>"
+        )
+
+
+class _KeywordMatcher:
+    """Aho-Corasick automaton over (keyword, rule id) pairs."""
+
+    __slots__ = ("_goto", "_fail", "_out", "__weakref__")
+
+    def __init__(self, pairs: Iterable[tuple[str, Hashable]]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        out: list[set[Hashable]] = [set()]
+        for keyword, rule_id in pairs:
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    out.append(set())
+                state = next_state
+            out[state].add(rule_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+                # Fold the fallback state's outputs in so matching never has
+                # to walk the fail chain to collect them.
+                out[next_state] |= out[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out: list[frozenset[Hashable] | None] = [
+            frozenset(o) if o else None for o in out
+        ]
+
+    def match(self, text: str) -> set[Hashable]:
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: set[Hashable] = set()
+        state = 0
+        for char in text.casefold():
+            while True:
+                next_state = goto[state].get(char)
+                if next_state is not None:
+                    state = next_state
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            found = out[state]
+            if found is not None:
+                hits |= found
+        return hits
+
+
+class _PatternMatcher:
+    """Regexes merged into one alternation, with each rule as a named group."""
+
+    __slots__ = ("_combined", "_group_rules", "_singles", "_standalone", "__weakref__")
+
+    def __init__(self, pairs: Iterable[tuple[str, Hashable]]) -> None:
+        merged: list[str] = []
+        self._group_rules: dict[str, Hashable] = {}
+        self._singles: dict[Hashable, list[re.Pattern[str]]] = {}
+        self._standalone: list[tuple[re.Pattern[str], Hashable]] = []
+        for i, (pattern, rule_id) in enumerate(pairs):
+            compiled = re.compile(pattern)
+            if _UNMERGEABLE_RE.search(pattern):
+                self._standalone.append((compiled, rule_id))
+                continue
+            group = f"_f{i}"
+            merged.append(f"(?P<{group}>{pattern})")
+            self._group_rules[group] = rule_id
+            self._singles.setdefault(rule_id, []).append(compiled)
+        try:
+            self._combined: re.Pattern[str] | None = (
+                re.compile("|".join(merged)) if merged else None
+            )
+        except re.error:
+            # Something we didn't spot can't be merged; run them all alone.
+            self._combined = None
+            for rule_id, patterns in self._singles.items():
+                self._standalone.extend((p, rule_id) for p in patterns)
+            self._group_rules = {}
+            self._singles = {}
+
+    def match(self, text: str) -> set[Hashable]:
+        hits: set[Hashable] = set()
+        combined = self._combined
+        if combined is not None:
+            for m in combined.finditer(text):
+                group = m.lastgroup
+                if group is not None and group in self._group_rules:
+                    hits.add(self._group_rules[group])
+            if hits:
+                # finditer doesn't report matches that overlap an earlier
+                # one, so rules it didn't see get their own search - but only
+                # for messages that hit something, which is rare.
+                for rule_id, patterns in self._singles.items():
+                    if rule_id not in hits and any(p.search(text) for p in patterns):
+                        hits.add(rule_id)
+        for pattern, rule_id in self._standalone:
+            if rule_id not in hits and pattern.search(text):
+                hits.add(rule_id)
+        return hits
+
+
+class _CompiledRules:
+    __slots__ = ("keyword_key", "keywords", "pattern_key", "patterns")
+
+    def __init__(
+        self,
+        keyword_key: frozenset[tuple[str, Hashable]],
+        keywords: _KeywordMatcher | None,
+        pattern_key: tuple[tuple[str, Hashable], ...],
+        patterns: _PatternMatcher | None,
+    ) -> None:
+        self.keyword_key = keyword_key
+        self.keywords = keywords
+        self.pattern_key = pattern_key
+        self.patterns = patterns
+
+
+class FilterEngine:
+    """
+    Per-guild automod rules, compiled for matching many rules at once.
+
+    Rules registered under ``None`` apply to messages outside guilds (DMs).
+    """
+
+    def __init__(self) -> None:
+        self._rules: dict[Snowflake | None, dict[Hashable, FilterRule]] = {}
+        self._compiled: dict[Snowflake | None, _CompiledRules] = {}
+        # Shared between guilds with identical rules; dropped once unused.
+        self._keyword_matchers: weakref.WeakValueDictionary[
+            frozenset[tuple[str, Hashable]], _KeywordMatcher
+        ] = weakref.WeakValueDictionary()
+        self._pattern_matchers: weakref.WeakValueDictionary[
+            tuple[tuple[str, Hashable], ...], _PatternMatcher
+        ] = weakref.WeakValueDictionary()
+
+    def set_rules(self, guild_id: SnowflakeLike | None, rules: Iterable[FilterRule]) -> None:
+        """Replace all of a guild's rules."""
+        key = _guild_key(guild_id)
+        self._commit(key, {rule.id: rule for rule in rules})
+
+    def add_rule(self, guild_id: SnowflakeLike | None, rule: FilterRule) -> None:
+        """Add a rule to a guild, replacing any existing rule with the same ID."""
+        key = _guild_key(guild_id)
+        self._commit(key, {**self._rules.get(key, {}), rule.id: rule})
+
+    def remove_rule(self, guild_id: SnowflakeLike | None, rule_id: Hashable) -> FilterRule | None:
+        """Remove one of a guild's rules by ID, returning it if it existed."""
+        key = _guild_key(guild_id)
+        rules = dict(self._rules.get(key, {}))
+        rule = rules.pop(rule_id, None)
+        if rule is not None:
+            self._commit(key, rules)
+        return rule
+
+    def clear(self, guild_id: SnowflakeLike | None) -> None:
+        """Remove all of a guild's rules."""
+        key = _guild_key(guild_id)
+        self._rules.pop(key, None)
+        self._compiled.pop(key, None)
+
+    def rules(self, guild_id: SnowflakeLike | None) -> list[FilterRule]:
+        """A guild's current rules."""
+        return list(self._rules.get(_guild_key(guild_id), {}).values())
+
+    def match(self, guild_id: SnowflakeLike | None, content: str) -> frozenset[Hashable]:
+        """The IDs of every one of the guild's rules that `content` hits."""
+        compiled = self._compiled.get(_guild_key(guild_id))
+        if compiled is None or not content:
+            return _NO_MATCHES
+        hits: set[Hashable] = set()
+        if compiled.keywords is not None:
+            hits = compiled.keywords.match(content)
+        if compiled.patterns is not None:
+            hits |= compiled.patterns.match(content)
+        return frozenset(hits) if hits else _NO_MATCHES
+
+    def match_message(self, message: Message) -> frozenset[Hashable]:
+        """`match` against a message's content, using its guild's rules."""
+        return self.match(message.guild_id, message.content)
+
+    def _commit(self, key: Snowflake | None, rules: dict[Hashable, FilterRule]) -> None:
+        """
+        Compile `rules` and only then store them as the guild's rules, so a
+        rule that fails to compile leaves the old ones in place.
+        """
+        if not rules:
+            self._rules.pop(key, None)
+            self._compiled.pop(key, None)
+            return
+        compiled = self._compile(rules, self._compiled.get(key))
+        self._rules[key] = rules
+        self._compiled[key] = compiled
+
+    def _compile(
+        self, rules: dict[Hashable, FilterRule], current: _CompiledRules | None
+    ) -> _CompiledRules:
+        keyword_key = frozenset(
+            (keyword, rule.id) for rule in rules.values() for keyword in rule.keywords
+        )
+        # Sorted so the same rules added in a different order still share.
+        pattern_key = tuple(
+            sorted(
+                ((pattern, rule.id) for rule in rules.values() for pattern in rule.patterns),
+                key=repr,
+            )
+        )
+        if current is not None and current.keyword_key == keyword_key:
+            keywords = current.keywords
+        elif not keyword_key:
+            keywords = None
+        else:
+            keywords = self._keyword_matchers.get(keyword_key)
+            if keywords is None:
+                keywords = self._keyword_matchers[keyword_key] = _KeywordMatcher(keyword_key)
+
+        if current is not None and current.pattern_key == pattern_key:
+            patterns = current.patterns
+        elif not pattern_key:
+            patterns = None
+        else:
+            patterns = self._pattern_matchers.get(pattern_key)
+            if patterns is None:
+                patterns = self._pattern_matchers[pattern_key] = _PatternMatcher(pattern_key)
+
+        return _CompiledRules(keyword_key, keywords, pattern_key, patterns)
+
+
+def _guild_key(guild_id: SnowflakeLike | None) -> Snowflake | None:
+    return None if guild_id is None else Snowflake(guild_id)
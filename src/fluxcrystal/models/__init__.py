@@ -2,9 +2,17 @@
 fluxcrystal model types.
 """
 
-from fluxcrystal.models.channels import Channel as Channel
+from fluxcrystal.models.channels import Channel as Channel, PermissionOverwrite as PermissionOverwrite
 from fluxcrystal.models.guilds import Guild as Guild, GuildMember as GuildMember, Role as Role
-from fluxcrystal.models.messages import Message as Message, RichEmbed as RichEmbed
+from fluxcrystal.models.messages import (
+    EmbedBuilder as EmbedBuilder,
+    EmbedTemplate as EmbedTemplate,
+    Message as Message,
+    RichEmbed as RichEmbed,
+)
+from fluxcrystal.models.permissions import Permissions as Permissions
+from fluxcrystal.models.serialization import decode_model as decode_model, encode_model as encode_model
+from fluxcrystal.models.snowflake import Snowflake as Snowflake, SnowflakeLike as SnowflakeLike
 from fluxcrystal.models.upload import Attachment as Attachment, AttachmentUpload as AttachmentUpload
 from fluxcrystal.models.users import User as User
 
@@ -15,7 +23,15 @@ __all__ = [
     "Guild",
     "GuildMember",
     "Message",
+    "PermissionOverwrite",
+    "Permissions",
     "RichEmbed",
+    "EmbedBuilder",
+    "EmbedTemplate",
     "Role",
+    "Snowflake",
+    "SnowflakeLike",
     "User",
+    "decode_model",
+    "encode_model",
 ]
@@ -0,0 +1,95 @@
+"""
+Shared helpers for the slotted model types.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+from typing import Any
+
+from fluxcrystal.models.snowflake import _optional_snowflake
+
+
+class _Unparsed:
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        # Pickle by reference so `is _UNPARSED` still holds after a round trip.
+        return "_UNPARSED"
+
+
+# Marks a cached datetime slot that hasn't been parsed yet (None is a real
+# value for optional timestamps).
+_UNPARSED: Any = _Unparsed()
+
+
+def _apply_fields(
+    obj: object,
+    data: dict[str, Any],
+    fields: tuple[str, ...],
+    *,
+    snowflakes: tuple[str, ...] = (),
+) -> bool:
+    """
+    Copy each of `fields` that is present in `data` onto `obj`, skipping
+    values that haven't changed. `snowflakes` are ID fields that get
+    converted to `Snowflake` on the way.
+
+    Returns True if anything was written.
+    """
+    changed = False
+    for field in fields:
+        if field in data:
+            value = data[field]
+            if getattr(obj, field) != value:
+                setattr(obj, field, value)
+                changed = True
+    for field in snowflakes:
+        if field in data:
+            value = _optional_snowflake(data[field])
+            if getattr(obj, field) != value:
+                setattr(obj, field, value)
+                changed = True
+    return changed
+
+
+@functools.cache
+def _all_slots(cls: type) -> tuple[str, ...]:
+    """Every slot on `cls`, including inherited ones, base classes first."""
+    slots: list[str] = []
+    for klass in reversed(cls.__mro__):
+        slots.extend(klass.__dict__.get("__slots__", ()))
+    return tuple(slots)
+
+
+def _reduce_slots(obj: object) -> tuple[Any, ...]:
+    """
+    `__reduce__` for slotted models: the state is a flat tuple of slot
+    values, which pickles much smaller and faster than the default
+    ``(None, {slot: value})`` state.
+    """
+    cls = type(obj)
+    return _restore_slots, (cls, tuple([getattr(obj, s) for s in _all_slots(cls)]))
+
+
+def _restore_slots(cls: type, state: tuple[Any, ...]) -> Any:
+    obj = cls.__new__(cls)
+    for slot, value in zip(_all_slots(cls), state):
+        object.__setattr__(obj, slot, value)
+    return obj
+
+
+def _parse_timestamp(value: str | None) -> datetime.datetime | None:
+    """Parse an ISO 8601 timestamp from a payload into an aware datetime."""
+    if not value:
+        return None
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _snowflake_str(value: int | None) -> str | None:
+    """IDs go back out as strings, like the API sends them."""
+    return None if value is None else str(value)
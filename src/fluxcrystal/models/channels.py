@@ -6,6 +6,53 @@ from __future__ import annotations
 
 from typing import Any
 
+from fluxcrystal.models.base import _apply_fields, _reduce_slots, _snowflake_str
+from fluxcrystal.models.permissions import Permissions
+from fluxcrystal.models.snowflake import Snowflake, _optional_snowflake
+
+
+class PermissionOverwrite:
+    """A per-channel permission override for a role (type 0) or member (type 1)."""
+
+    __slots__ = ("id", "type", "allow", "deny")
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.id: Snowflake = Snowflake(data["id"])
+        self.type: int = data.get("type", 0)
+        self.allow: Permissions = Permissions.parse(data.get("allow"))
+        self.deny: Permissions = Permissions.parse(data.get("deny"))
+
+    def to_dict(self) -> dict[str, Any]:
+        """This overwrite as an API-style payload dict."""
+        return {
+            "id": str(self.id),
+            "type": self.type,
+            "allow": str(int(self.allow)),
+            "deny": str(int(self.deny)),
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PermissionOverwrite):
+            return (
+                self.id == other.id
+                and self.type == other.type
+                and self.allow == other.allow
+                and self.deny == other.deny
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.id, self.allow, self.deny))
+
+    def __repr__(self) -> str:
+        return (
+            f"<PermissionOverwrite id={self.id!r} type={self.type!r} "
+            f"allow={int(self.allow)} deny={int(self.deny)}>"
+        )
+
 
 class Channel:
     """Any type of channel."""
@@ -21,19 +68,69 @@ class Channel:
         "position",
         "parent_id",
         "rate_limit_per_user",
+        "permission_overwrites",
     )
 
     def __init__(self, data: dict[str, Any]) -> None:
-        self.id: str = data["id"]
+        self.id: Snowflake = Snowflake(data["id"])
         self.type: int = data["type"]
-        self.guild_id: str | None = data.get("guild_id")
+        self.guild_id: Snowflake | None = _optional_snowflake(data.get("guild_id"))
         self.name: str | None = data.get("name")
         self.topic: str | None = data.get("topic")
         self.nsfw: bool = data.get("nsfw", False)
-        self.last_message_id: str | None = data.get("last_message_id")
+        self.last_message_id: Snowflake | None = _optional_snowflake(
+            data.get("last_message_id")
+        )
         self.position: int | None = data.get("position")
-        self.parent_id: str | None = data.get("parent_id")
+        self.parent_id: Snowflake | None = _optional_snowflake(data.get("parent_id"))
         self.rate_limit_per_user: int | None = data.get("rate_limit_per_user")
+        # Keyed by role/user ID so permission resolution is a dict lookup per role.
+        self.permission_overwrites: dict[Snowflake, PermissionOverwrite] = {}
+        for overwrite_data in data.get("permission_overwrites", []):
+            overwrite = PermissionOverwrite(overwrite_data)
+            self.permission_overwrites[overwrite.id] = overwrite
+
+    def _apply(self, data: dict[str, Any]) -> bool:
+        """
+        Patch this channel in place with the fields present in `data`
+        (ie a CHANNEL_UPDATE). Returns True if anything changed.
+        """
+        changed = _apply_fields(
+            self,
+            data,
+            ("type", "name", "topic", "nsfw", "position", "rate_limit_per_user"),
+            snowflakes=("guild_id", "last_message_id", "parent_id"),
+        )
+        if "permission_overwrites" in data:
+            overwrites: dict[Snowflake, PermissionOverwrite] = {}
+            for overwrite_data in data["permission_overwrites"]:
+                overwrite = PermissionOverwrite(overwrite_data)
+                overwrites[overwrite.id] = overwrite
+            if overwrites != self.permission_overwrites:
+                self.permission_overwrites = overwrites
+                changed = True
+        return changed
+
+    def to_dict(self) -> dict[str, Any]:
+        """This channel as an API-style payload dict."""
+        return {
+            "id": str(self.id),
+            "type": self.type,
+            "guild_id": _snowflake_str(self.guild_id),
+            "name": self.name,
+            "topic": self.topic,
+            "nsfw": self.nsfw,
+            "last_message_id": _snowflake_str(self.last_message_id),
+            "position": self.position,
+            "parent_id": _snowflake_str(self.parent_id),
+            "rate_limit_per_user": self.rate_limit_per_user,
+            "permission_overwrites": [
+                overwrite.to_dict() for overwrite in self.permission_overwrites.values()
+            ],
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
 
     def __repr__(self) -> str:
         return (
@@ -4,8 +4,18 @@ Guild and guild-member model types.
 
 from __future__ import annotations
 
+import datetime
 from typing import Any
 
+from fluxcrystal.models.base import (
+    _UNPARSED,
+    _apply_fields,
+    _parse_timestamp,
+    _reduce_slots,
+    _snowflake_str,
+)
+from fluxcrystal.models.permissions import Permissions
+from fluxcrystal.models.snowflake import Snowflake, _optional_snowflake
 from fluxcrystal.models.users import User
 
 
@@ -23,14 +33,45 @@ class Role:
     )
 
     def __init__(self, data: dict[str, Any]) -> None:
-        self.id: str = data["id"]
+        self.id: Snowflake = Snowflake(data["id"])
         self.name: str = data["name"]
         self.color: int = data.get("color", 0)
         self.hoist: bool = data.get("hoist", False)
         self.position: int = data.get("position", 0)
-        self.permissions: str = data.get("permissions", "0")
+        # Sent as a decimal string; parsed once here so checks are plain bit ops.
+        self.permissions: Permissions = Permissions.parse(data.get("permissions"))
         self.mentionable: bool = data.get("mentionable", False)
 
+    def _apply(self, data: dict[str, Any]) -> bool:
+        """
+        Patch this role in place with the fields present in `data`.
+        Returns True if anything changed.
+        """
+        changed = _apply_fields(
+            self, data, ("name", "color", "hoist", "position", "mentionable")
+        )
+        if "permissions" in data:
+            permissions = Permissions.parse(data["permissions"])
+            if permissions != self.permissions:
+                self.permissions = permissions
+                changed = True
+        return changed
+
+    def to_dict(self) -> dict[str, Any]:
+        """This role as an API-style payload dict."""
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "color": self.color,
+            "hoist": self.hoist,
+            "position": self.position,
+            "permissions": str(int(self.permissions)),
+            "mentionable": self.mentionable,
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
+
     def __repr__(self) -> str:
         return f"<Role id={self.id!r} name={self.name!r}>"
 
@@ -54,18 +95,86 @@ class GuildMember:
         "deaf",
         "mute",
         "communication_disabled_until",
+        # Parsed forms of the two timestamps, filled in on first access.
+        "_joined_datetime",
+        "_timed_out_until",
     )
 
-    def __init__(self, data: dict[str, Any]) -> None:
-        self.user: User = User(data["user"])
+    def __init__(self, data: dict[str, Any], *, user: User | None = None) -> None:
+        # The cache passes in its own shared User so members don't hold copies.
+        self.user: User = user if user is not None else User(data["user"])
         self.nick: str | None = data.get("nick")
-        self.roles: list[str] = data.get("roles", [])
+        self.roles: list[Snowflake] = [Snowflake(r) for r in data.get("roles", [])]
         self.joined_at: str = data["joined_at"]
         self.deaf: bool = data.get("deaf", False)
         self.mute: bool = data.get("mute", False)
         self.communication_disabled_until: str | None = data.get(
             "communication_disabled_until"
         )
+        self._joined_datetime: datetime.datetime | None = _UNPARSED
+        self._timed_out_until: datetime.datetime | None = _UNPARSED
+
+    def _apply(self, data: dict[str, Any]) -> bool:
+        """
+        Patch this member in place with the fields present in `data`.
+        Returns True if anything changed.
+        """
+        changed = _apply_fields(
+            self,
+            data,
+            ("nick", "joined_at", "deaf", "mute", "communication_disabled_until"),
+        )
+        if changed:
+            self._joined_datetime = _UNPARSED
+            self._timed_out_until = _UNPARSED
+        if "roles" in data:
+            roles = [Snowflake(r) for r in data["roles"]]
+            if set(roles) != set(self.roles):  # a reorder isn't a change
+                self.roles = roles
+                changed = True
+        return changed
+
+    def to_dict(self) -> dict[str, Any]:
+        """This member as an API-style payload dict."""
+        return {
+            "user": self.user.to_dict(),
+            "nick": self.nick,
+            "roles": [str(r) for r in self.roles],
+            "joined_at": self.joined_at,
+            "deaf": self.deaf,
+            "mute": self.mute,
+            "communication_disabled_until": self.communication_disabled_until,
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
+
+    @property
+    def joined_datetime(self) -> datetime.datetime | None:
+        """`joined_at` as an aware datetime (parsed once, then cached)."""
+        joined = self._joined_datetime
+        if joined is _UNPARSED:
+            joined = self._joined_datetime = _parse_timestamp(self.joined_at)
+        return joined
+
+    @property
+    def timed_out_until(self) -> datetime.datetime | None:
+        """
+        `communication_disabled_until` as an aware datetime (parsed once, then
+        cached), or None if the member has never been timed out.
+        """
+        until = self._timed_out_until
+        if until is _UNPARSED:
+            until = self._timed_out_until = _parse_timestamp(
+                self.communication_disabled_until
+            )
+        return until
+
+    @property
+    def is_timed_out(self) -> bool:
+        """True if the member is currently timed out."""
+        until = self.timed_out_until
+        return until is not None and until > datetime.datetime.now(datetime.timezone.utc)
 
     @property
     def display_name(self) -> str:
@@ -99,15 +208,16 @@ class Guild:
         "mfa_level",
         "system_channel_id",
         "rules_channel_id",
+        "roles",
     )
 
     def __init__(self, data: dict[str, Any]) -> None:
-        self.id: str = data["id"]
+        self.id: Snowflake = Snowflake(data["id"])
         # Unavailable guilds (sent during READY / GUILD_CREATE before the full
         # payload arrives) only carry id + unavailable=True.
         self.name: str = data.get("name", "")
         self.icon: str | None = data.get("icon")
-        self.owner_id: str = data.get("owner_id", "")
+        self.owner_id: Snowflake = Snowflake(data.get("owner_id", 0))
         self.features: list[str] = data.get("features", [])
         self.verification_level: int = data.get("verification_level", 0)
         self.default_message_notifications: int = data.get(
@@ -115,8 +225,81 @@ class Guild:
         )
         self.explicit_content_filter: int = data.get("explicit_content_filter", 0)
         self.mfa_level: int = data.get("mfa_level", 0)
-        self.system_channel_id: str | None = data.get("system_channel_id")
-        self.rules_channel_id: str | None = data.get("rules_channel_id")
+        self.system_channel_id: Snowflake | None = _optional_snowflake(
+            data.get("system_channel_id")
+        )
+        self.rules_channel_id: Snowflake | None = _optional_snowflake(
+            data.get("rules_channel_id")
+        )
+        self.roles: dict[Snowflake, Role] = {}
+        for role_data in data.get("roles", []):
+            role = Role(role_data)
+            self.roles[role.id] = role
+
+    def _apply(self, data: dict[str, Any]) -> bool:
+        """
+        Patch this guild in place with the fields present in `data`
+        (ie a GUILD_UPDATE). Known roles are patched rather than rebuilt.
+        Returns True if anything changed.
+        """
+        changed = _apply_fields(
+            self,
+            data,
+            (
+                "name",
+                "icon",
+                "features",
+                "verification_level",
+                "default_message_notifications",
+                "explicit_content_filter",
+                "mfa_level",
+            ),
+            snowflakes=("owner_id", "system_channel_id", "rules_channel_id"),
+        )
+        if "roles" in data:
+            changed = self._apply_roles(data["roles"]) or changed
+        return changed
+
+    def _apply_roles(self, roles_data: list[dict[str, Any]]) -> bool:
+        changed = False
+        roles: dict[Snowflake, Role] = {}
+        for role_data in roles_data:
+            role = self.roles.get(int(role_data["id"]))
+            if role is None:
+                role = Role(role_data)
+                changed = True
+            elif role._apply(role_data):
+                changed = True
+            roles[role.id] = role
+        if changed or len(roles) != len(self.roles):
+            self.roles = roles
+            return True
+        return False
+
+    def to_dict(self) -> dict[str, Any]:
+        """This guild (and its roles) as an API-style payload dict."""
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "icon": self.icon,
+            "owner_id": str(self.owner_id),
+            "features": list(self.features),
+            "verification_level": self.verification_level,
+            "default_message_notifications": self.default_message_notifications,
+            "explicit_content_filter": self.explicit_content_filter,
+            "mfa_level": self.mfa_level,
+            "system_channel_id": _snowflake_str(self.system_channel_id),
+            "rules_channel_id": _snowflake_str(self.rules_channel_id),
+            "roles": [role.to_dict() for role in self.roles.values()],
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
+
+    @property
+    def default_role(self) -> Role | None:
+        """The ``@everyone`` role, which shares the guild's ID."""
+        return self.roles.get(self.id)
 
     def __repr__(self) -> str:
         return f"<Guild id={self.id!r} name={self.name!r}>"
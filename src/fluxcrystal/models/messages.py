@@ -4,12 +4,25 @@ Message model types.
 
 from __future__ import annotations
 
+import datetime
+from collections.abc import Iterable
+from string import Formatter
 from typing import Any, TypedDict, TYPE_CHECKING
 from copy import deepcopy
 
+from fluxcrystal.errors import EmbedTooLargeError
+from fluxcrystal.models.base import (
+    _UNPARSED,
+    _apply_fields,
+    _parse_timestamp,
+    _reduce_slots,
+    _snowflake_str,
+)
+from fluxcrystal.models.snowflake import Snowflake, SnowflakeLike, _optional_snowflake
 from fluxcrystal.models.users import User
 
 if TYPE_CHECKING:
+    from fluxcrystal.cache import Cache
     from fluxcrystal.models.upload import Attachment
 
 class MessageReference(TypedDict):
@@ -26,6 +39,13 @@ class EmbedField:
         self.value: str = data["value"]
         self.inline: bool = data.get("inline", False)
 
+    def to_dict(self) -> dict[str, Any]:
+        """This field as an API-style payload dict."""
+        return {"name": self.name, "value": self.value, "inline": self.inline}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
+
     def __repr__(self) -> str:
         return f"<EmbedField name={self.name!r} value={self.value!r} inline={self.inline!r}>"
 
@@ -73,6 +93,27 @@ class Embed:
             EmbedField(f) for f in data.get("fields", [])
         ]
 
+    def to_dict(self) -> dict[str, Any]:
+        """This embed as an API-style payload dict."""
+        return {
+            "title": self.title,
+            "type": self.type,
+            "description": self.description,
+            "url": self.url,
+            "timestamp": self.timestamp,
+            "color": self.color,
+            "footer": self.footer,
+            "image": self.image,
+            "thumbnail": self.thumbnail,
+            "video": self.video,
+            "provider": self.provider,
+            "author": self.author,
+            "fields": [f.to_dict() for f in self.fields],
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
+
     def __repr__(self) -> str:
         return f"<Embed title={self.title!r} description={self.description!r}>"
 
@@ -95,12 +136,95 @@ class Embed:
             )
         return NotImplemented
 
+# Limits the API enforces on embeds; checked by `to_payload` so we fail
+# before spending a request on it.
+_MAX_EMBED_FIELDS = 25
+_MAX_EMBED_TITLE = 256
+_MAX_EMBED_DESCRIPTION = 4096
+_MAX_EMBED_FIELD_NAME = 256
+_MAX_EMBED_FIELD_VALUE = 1024
+_MAX_EMBED_FOOTER_TEXT = 2048
+_MAX_EMBED_AUTHOR_NAME = 256
+_MAX_EMBED_TOTAL = 6000
+
+_DEFAULT_FOOTER: dict[str, Any] = {"text": "Made with `fluxcrystal`~ <3"}
+
+_EMBED_KEYS = (
+    "title",
+    "description",
+    "url",
+    "timestamp",
+    "color",
+    "footer",
+    "image",
+    "thumbnail",
+    "video",
+    "provider",
+    "author",
+)
+
+
+def _check_length(what: str, value: str | None, limit: int) -> int:
+    if value is None:
+        return 0
+    if len(value) > limit:
+        raise EmbedTooLargeError(f"Embed {what} is {len(value)} characters (max {limit})")
+    return len(value)
+
+
+def _finish_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Validate an embed payload against the API's limits and return it."""
+    fields: list[dict[str, Any]] = payload.get("fields", [])
+    if len(fields) > _MAX_EMBED_FIELDS:
+        raise EmbedTooLargeError(
+            f"Embed has {len(fields)} fields (max {_MAX_EMBED_FIELDS})"
+        )
+    total = _check_length("title", payload.get("title"), _MAX_EMBED_TITLE)
+    total += _check_length(
+        "description", payload.get("description"), _MAX_EMBED_DESCRIPTION
+    )
+    footer = payload.get("footer")
+    if footer:
+        total += _check_length("footer text", footer.get("text"), _MAX_EMBED_FOOTER_TEXT)
+    author = payload.get("author")
+    if author:
+        total += _check_length("author name", author.get("name"), _MAX_EMBED_AUTHOR_NAME)
+    for field in fields:
+        total += _check_length("field name", field["name"], _MAX_EMBED_FIELD_NAME)
+        total += _check_length("field value", field["value"], _MAX_EMBED_FIELD_VALUE)
+    if total > _MAX_EMBED_TOTAL:
+        raise EmbedTooLargeError(
+            f"Embed has {total} characters in total (max {_MAX_EMBED_TOTAL})"
+        )
+    return payload
+
+
+def _media(url: str, height: int | None, width: int | None) -> dict[str, Any]:
+    media: dict[str, Any] = {"url": url}
+    if height is not None:
+        media["height"] = height
+    if width is not None:
+        media["width"] = width
+    return media
+
+
 # FIXME: this is so fucking janky please save me from my suffering
 class RichEmbed(Embed):
+    """
+    An embed you can send. Every ``with_*`` call returns a new embed and
+    leaves the original alone. Only the top-level containers are copied;
+    the strings and `EmbedField`s in them are shared.
+
+    If you're adding lots of fields in a loop, or sending the same embed
+    over and over, `EmbedBuilder` is cheaper.
+    """
+
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__({
             "type": "rich",
-            "footer": {"text": "Made with `fluxcrystal`~ <3"}
+            "footer": dict(_DEFAULT_FOOTER),
         })
         self.type = "rich"
 
@@ -112,156 +236,388 @@ class RichEmbed(Embed):
         embed.type = "rich"
         return embed
 
-    def _copy_state(self) -> dict[str, Any]:
-        """Create a copy of the current embed state for building a new instance."""
-        return {
-            "type": self.type,
-            "title": self.title,
-            "description": self.description,
-            "url": self.url,
-            "timestamp": self.timestamp,
-            "color": self.color,
-            "footer": self.footer.copy() if self.footer else None,
-            "image": self.image.copy() if self.image else None,
-            "thumbnail": self.thumbnail.copy() if self.thumbnail else None,
-            "video": self.video.copy() if self.video else None,
-            "provider": self.provider.copy() if self.provider else None,
-            "author": self.author.copy() if self.author else None,
-            "fields": [{"name": f.name, "value": f.value, "inline": f.inline} for f in self.fields],
-        }
+    def _derive(self, **changes: Any) -> "RichEmbed":
+        """
+        Make a new embed with `changes` applied. The fields list and nested
+        dicts get shallow copies, so mutating one embed's can't leak into
+        the other.
+        """
+        embed = object.__new__(RichEmbed)
+        for slot in Embed.__slots__:
+            value = changes[slot] if slot in changes else getattr(self, slot)
+            if slot not in changes and isinstance(value, (list, dict)):
+                value = value.copy()
+            setattr(embed, slot, value)
+        return embed
+
+    def to_payload(self) -> dict[str, Any]:
+        """
+        The JSON-ready payload for this embed, checked against the API's
+        size limits. Built fresh on every call, so changes made in place
+        (ie ``embed.fields.append(...)``) always show up. Nested dicts are
+        shared with the embed, so don't mutate them.
+
+        Raises:
+            EmbedTooLargeError: If the embed is over any of the limits.
+        """
+        payload: dict[str, Any] = {"type": self.type}
+        for key in _EMBED_KEYS:
+            value = getattr(self, key)
+            if value is not None:
+                payload[key] = value
+        payload["fields"] = [
+            {"name": f.name, "value": f.value, "inline": f.inline} for f in self.fields
+        ]
+        return _finish_payload(payload)
 
     def with_title(self, title: str) -> "RichEmbed":
         """Set the title of the embed."""
-        state = self._copy_state()
-        state["title"] = title
-        return RichEmbed.from_data(state)
+        return self._derive(title=title)
 
     def with_description(self, description: str) -> "RichEmbed":
         """Set the description of the embed."""
-        state = self._copy_state()
-        state["description"] = description
-        return RichEmbed.from_data(state)
+        return self._derive(description=description)
 
     def with_url(self, url: str) -> "RichEmbed":
         """Set the URL of the embed (makes the title clickable)."""
-        state = self._copy_state()
-        state["url"] = url
-        return RichEmbed.from_data(state)
+        return self._derive(url=url)
 
     def with_timestamp(self, timestamp: str) -> "RichEmbed":
         """Set the timestamp of the embed (ISO 8601 format)."""
-        state = self._copy_state()
-        state["timestamp"] = timestamp
-        return RichEmbed.from_data(state)
+        return self._derive(timestamp=timestamp)
 
     def with_color(self, color: int) -> "RichEmbed":
         """Set the color of the embed (decimal color value)."""
-        state = self._copy_state()
-        state["color"] = color
-        return RichEmbed.from_data(state)
+        return self._derive(color=color)
 
     def with_footer(self, text: str, icon_url: str | None = None) -> "RichEmbed":
         """Set the footer of the embed."""
-        state = self._copy_state()
-        state["footer"] = {"text": text, "icon_url": icon_url} if icon_url else {"text": text}
-        return RichEmbed.from_data(state)
+        return self._derive(
+            footer={"text": text, "icon_url": icon_url} if icon_url else {"text": text}
+        )
 
     def with_image(self, url: str, height: int | None = None, width: int | None = None) -> "RichEmbed":
         """Set the image of the embed."""
-        state = self._copy_state()
-        image_dict: dict[str, Any] = {"url": url}
-        if height is not None:
-            image_dict["height"] = height
-        if width is not None:
-            image_dict["width"] = width
-        state["image"] = image_dict
-        return RichEmbed.from_data(state)
+        return self._derive(image=_media(url, height, width))
 
     def with_thumbnail(self, url: str, height: int | None = None, width: int | None = None) -> "RichEmbed":
         """Set the thumbnail of the embed."""
-        state = self._copy_state()
-        thumb_dict: dict[str, Any] = {"url": url}
-        if height is not None:
-            thumb_dict["height"] = height
-        if width is not None:
-            thumb_dict["width"] = width
-        state["thumbnail"] = thumb_dict
-        return RichEmbed.from_data(state)
+        return self._derive(thumbnail=_media(url, height, width))
 
     def with_video(self, url: str, height: int | None = None, width: int | None = None) -> "RichEmbed":
         """Set the video of the embed."""
-        state = self._copy_state()
-        video_dict: dict[str, Any] = {"url": url}
-        if height is not None:
-            video_dict["height"] = height
-        if width is not None:
-            video_dict["width"] = width
-        state["video"] = video_dict
-        return RichEmbed.from_data(state)
+        return self._derive(video=_media(url, height, width))
 
     def with_provider(self, name: str | None = None, url: str | None = None) -> "RichEmbed":
         """Set the provider of the embed."""
-        state = self._copy_state()
         provider_dict: dict[str, Any] = {}
         if name is not None:
             provider_dict["name"] = name
         if url is not None:
             provider_dict["url"] = url
-        state["provider"] = provider_dict if provider_dict else None
-        return RichEmbed.from_data(state)
+        return self._derive(provider=provider_dict if provider_dict else None)
 
     def with_author(self, name: str, url: str | None = None, icon_url: str | None = None) -> "RichEmbed":
         """Set the author of the embed."""
-        state = self._copy_state()
         author_dict: dict[str, Any] = {"name": name}
         if url is not None:
             author_dict["url"] = url
         if icon_url is not None:
             author_dict["icon_url"] = icon_url
-        state["author"] = author_dict
-        return RichEmbed.from_data(state)
+        return self._derive(author=author_dict)
 
     def with_field(self, name: str, value: str, inline: bool = False) -> "RichEmbed":
         """Add a field to the embed."""
-        state = self._copy_state()
-        state["fields"] = state["fields"] + [{"name": name, "value": value, "inline": inline}]
-        return RichEmbed.from_data(state)
+        field = EmbedField({"name": name, "value": value, "inline": inline})
+        return self._derive(fields=[*self.fields, field])
 
     def with_fields(self, fields: list[dict[str, Any]]) -> "RichEmbed":
         """Set all fields of the embed (replaces existing fields)."""
-        state = self._copy_state()
-        state["fields"] = fields
-        return RichEmbed.from_data(state)
+        return self._derive(fields=[EmbedField(f) for f in fields])
 
     def clear_fields(self) -> "RichEmbed":
         """Clear all fields from the embed."""
-        state = self._copy_state()
-        state["fields"] = []
-        return RichEmbed.from_data(state)
+        return self._derive(fields=[])
 
     def clear_author(self) -> "RichEmbed":
         """Clear the author from the embed."""
-        state = self._copy_state()
-        state["author"] = None
-        return RichEmbed.from_data(state)
+        return self._derive(author=None)
 
     def clear_footer(self) -> "RichEmbed":
         """Clear the footer from the embed."""
-        state = self._copy_state()
-        state["footer"] = None
-        return RichEmbed.from_data(state)
+        return self._derive(footer=None)
 
     def clear_image(self) -> "RichEmbed":
         """Clear the image from the embed."""
-        state = self._copy_state()
-        state["image"] = None
-        return RichEmbed.from_data(state)
+        return self._derive(image=None)
 
     def clear_thumbnail(self) -> "RichEmbed":
         """Clear the thumbnail from the embed."""
-        state = self._copy_state()
-        state["thumbnail"] = None
-        return RichEmbed.from_data(state)
+        return self._derive(thumbnail=None)
+
+
+class EmbedBuilder:
+    """
+    A mutable alternative to `RichEmbed` for when you're building big embeds
+    over and over (ie leaderboards). The ``with_*`` methods match
+    `RichEmbed`'s but change the builder in place and return it, so adding a
+    field is O(1) instead of copying the whole embed.
+
+        payload = (
+            EmbedBuilder()
+            .with_title("Leaderboard")
+            .with_fields_from(rows)
+            .to_payload()
+        )
+
+    Pass it straight to `RESTClient.create_message`, or call `build` to get a
+    `RichEmbed`.
+    """
+
+    __slots__ = ("_data", "_fields", "_payload")
+
+    def __init__(self, embed: RichEmbed | None = None) -> None:
+        self._data: dict[str, Any] = {}
+        self._fields: list[dict[str, Any]] = []
+        self._payload: dict[str, Any] | None = None
+        if embed is None:
+            self._data["footer"] = dict(_DEFAULT_FOOTER)
+        else:
+            for key in _EMBED_KEYS:
+                value = getattr(embed, key)
+                if value is not None:
+                    self._data[key] = value
+            self._fields = [
+                {"name": f.name, "value": f.value, "inline": f.inline} for f in embed.fields
+            ]
+
+    def _set(self, key: str, value: Any) -> EmbedBuilder:
+        if value is None:
+            self._data.pop(key, None)
+        else:
+            self._data[key] = value
+        self._payload = None
+        return self
+
+    def with_title(self, title: str) -> EmbedBuilder:
+        """Set the title of the embed."""
+        return self._set("title", title)
+
+    def with_description(self, description: str) -> EmbedBuilder:
+        """Set the description of the embed."""
+        return self._set("description", description)
+
+    def with_url(self, url: str) -> EmbedBuilder:
+        """Set the URL of the embed (makes the title clickable)."""
+        return self._set("url", url)
+
+    def with_timestamp(self, timestamp: str) -> EmbedBuilder:
+        """Set the timestamp of the embed (ISO 8601 format)."""
+        return self._set("timestamp", timestamp)
+
+    def with_color(self, color: int) -> EmbedBuilder:
+        """Set the color of the embed (decimal color value)."""
+        return self._set("color", color)
+
+    def with_footer(self, text: str, icon_url: str | None = None) -> EmbedBuilder:
+        """Set the footer of the embed."""
+        return self._set(
+            "footer", {"text": text, "icon_url": icon_url} if icon_url else {"text": text}
+        )
+
+    def with_image(self, url: str, height: int | None = None, width: int | None = None) -> EmbedBuilder:
+        """Set the image of the embed."""
+        return self._set("image", _media(url, height, width))
+
+    def with_thumbnail(self, url: str, height: int | None = None, width: int | None = None) -> EmbedBuilder:
+        """Set the thumbnail of the embed."""
+        return self._set("thumbnail", _media(url, height, width))
+
+    def with_video(self, url: str, height: int | None = None, width: int | None = None) -> EmbedBuilder:
+        """Set the video of the embed."""
+        return self._set("video", _media(url, height, width))
+
+    def with_provider(self, name: str | None = None, url: str | None = None) -> EmbedBuilder:
+        """Set the provider of the embed."""
+        provider_dict: dict[str, Any] = {}
+        if name is not None:
+            provider_dict["name"] = name
+        if url is not None:
+            provider_dict["url"] = url
+        return self._set("provider", provider_dict if provider_dict else None)
+
+    def with_author(self, name: str, url: str | None = None, icon_url: str | None = None) -> EmbedBuilder:
+        """Set the author of the embed."""
+        author_dict: dict[str, Any] = {"name": name}
+        if url is not None:
+            author_dict["url"] = url
+        if icon_url is not None:
+            author_dict["icon_url"] = icon_url
+        return self._set("author", author_dict)
+
+    def with_field(self, name: str, value: str, inline: bool = False) -> EmbedBuilder:
+        """Add a field to the embed."""
+        self._fields.append({"name": name, "value": value, "inline": inline})
+        self._payload = None
+        return self
+
+    def with_fields(self, fields: list[dict[str, Any]]) -> EmbedBuilder:
+        """Set all fields of the embed (replaces existing fields)."""
+        self._fields = [
+            {"name": f["name"], "value": f["value"], "inline": f.get("inline", False)}
+            for f in fields
+        ]
+        self._payload = None
+        return self
+
+    def with_fields_from(self, fields: Iterable[tuple[str, str] | tuple[str, str, bool]]) -> EmbedBuilder:
+        """Append a field for each ``(name, value)`` or ``(name, value, inline)`` tuple."""
+        for field in fields:
+            self._fields.append(
+                {"name": field[0], "value": field[1], "inline": field[2] if len(field) > 2 else False}
+            )
+        self._payload = None
+        return self
+
+    def clear_fields(self) -> EmbedBuilder:
+        """Clear all fields from the embed."""
+        self._fields = []
+        self._payload = None
+        return self
+
+    def clear_author(self) -> EmbedBuilder:
+        """Clear the author from the embed."""
+        return self._set("author", None)
+
+    def clear_footer(self) -> EmbedBuilder:
+        """Clear the footer from the embed."""
+        return self._set("footer", None)
+
+    def clear_image(self) -> EmbedBuilder:
+        """Clear the image from the embed."""
+        return self._set("image", None)
+
+    def clear_thumbnail(self) -> EmbedBuilder:
+        """Clear the thumbnail from the embed."""
+        return self._set("thumbnail", None)
+
+    def to_payload(self) -> dict[str, Any]:
+        """
+        The JSON-ready payload for this embed, checked against the API's
+        size limits. Cached until the builder changes again, so don't mutate it.
+
+        Raises:
+            EmbedTooLargeError: If the embed is over any of the limits.
+        """
+        payload = self._payload
+        if payload is None:
+            payload = {"type": "rich", **self._data, "fields": list(self._fields)}
+            self._payload = payload = _finish_payload(payload)
+        return payload
+
+    def build(self) -> RichEmbed:
+        """Freeze the builder's current state into a `RichEmbed`."""
+        return RichEmbed.from_data({**self._data, "fields": self._fields})
+
+    def __len__(self) -> int:
+        """The number of fields added so far."""
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return f"<EmbedBuilder title={self._data.get('title')!r} fields={len(self._fields)}>"
+
+
+class EmbedTemplate:
+    """
+    An embed compiled once and rendered many times with different values.
+
+    Write ``{name}`` placeholders into any of the embed's text and compile
+    it; `render` then fills them in and gives back a JSON-ready payload
+    without building any models:
+
+        RANK = EmbedTemplate(
+            RichEmbed()
+            .with_title("{user}'s rank")
+            .with_field("Level", "{level}", inline=True)
+        )
+
+        await bot.rest.create_message(channel_id, embeds=[RANK.render(user=name, level=7)])
+
+    Only the parts of the payload that actually have placeholders are copied
+    on each render; everything else is shared with the template. Use ``{{``
+    and ``}}`` for literal braces.
+    """
+
+    __slots__ = ("_payload", "_plan", "placeholders")
+
+    def __init__(self, embed: RichEmbed | EmbedBuilder) -> None:
+        self._payload: dict[str, Any] = embed.to_payload()
+        names: set[str] = set()
+        plan = _compile_template(self._payload, names)
+        # A tree with the same shape as the payload, containing only the
+        # branches that lead to a string with placeholders in it.
+        self._plan: dict[Any, Any] = plan or {}
+        #: Names of all the placeholders `render` expects.
+        self.placeholders: frozenset[str] = frozenset(names)
+
+    def render(self, **values: Any) -> dict[str, Any]:
+        """
+        Fill in the placeholders and return the embed payload, ready to pass
+        to `RESTClient.create_message`. Like `RichEmbed.to_payload`, the
+        result shares parts with the template, so don't mutate it.
+
+        Raises:
+            KeyError: If a placeholder wasn't given a value.
+            EmbedTooLargeError: If the filled-in embed is over any of the limits.
+        """
+        if not self._plan:
+            return self._payload
+        return _finish_payload(_render_template(self._payload, self._plan, values))
+
+    def __repr__(self) -> str:
+        return f"<EmbedTemplate placeholders={sorted(self.placeholders)!r}>"
+
+
+def _compile_template(node: Any, names: set[str]) -> Any:
+    """
+    Build the render plan for one node of an embed payload: the format
+    string for a string with placeholders, a dict of child plans for a
+    container with any in it, or None for a fully static node.
+    """
+    if isinstance(node, str):
+        if "{" not in node and "}" not in node:
+            return None
+        # Strings with only escaped braces still go through format_map to
+        # turn ``{{`` back into ``{``.
+        for _, name, _, _ in Formatter().parse(node):
+            if name is None:
+                continue
+            if not name.isidentifier():
+                raise ValueError(f"Embed placeholders must be named, got {{{name}}} in {node!r}")
+            names.add(name)
+        return node
+    if isinstance(node, dict):
+        items: Iterable[tuple[Any, Any]] = node.items()
+    elif isinstance(node, list):
+        items = enumerate(node)
+    else:
+        return None
+    plan = {}
+    for key, child in items:
+        child_plan = _compile_template(child, names)
+        if child_plan is not None:
+            plan[key] = child_plan
+    return plan or None
+
+
+def _render_template(node: Any, plan: dict[Any, Any], values: dict[str, Any]) -> Any:
+    out = node.copy()
+    for key, child_plan in plan.items():
+        if isinstance(child_plan, str):
+            out[key] = child_plan.format_map(values)
+        else:
+            out[key] = _render_template(node[key], child_plan, values)
+    return out
 
 
 class Message:
@@ -271,7 +627,6 @@ class Message:
         "id",
         "channel_id",
         "guild_id",
-        "author",
         "content",
         "timestamp",
         "edited_timestamp",
@@ -282,33 +637,254 @@ class Message:
         "nonce",
         "webhook_id",
         "flags",
-        "attachments",
-        "embeds",
+        # author/attachments/embeds are kept raw and only built on first access;
+        # most handlers never look at them.
+        "_author_data",
+        "_author",
+        "_attachments_data",
+        "_attachments",
+        "_embeds_data",
+        "_embeds",
+        # Parsed forms of timestamp/edited_timestamp, filled in on first access.
+        "_created_at",
+        "_edited_at",
+        # Mentions and the referenced message are also raw until first use.
+        "_mentions_data",
+        "_mention_ids",
+        "_mention_roles_data",
+        "_mention_role_ids",
+        "_mention_channels_data",
+        "_mention_channel_ids",
+        "_referenced_data",
+        "_referenced",
+        # Where the author is looked up; kept last so pickling can drop it.
+        "_cache",
     )
 
-    def __init__(self, data: dict[str, Any]) -> None:
-        from fluxcrystal.models.upload import Attachment
-        
-        self.id: str = data["id"]
-        self.channel_id: str = data["channel_id"]
-        self.guild_id: str | None = data.get("guild_id")
-        self.author: User = User(data["author"])
+    def __init__(
+        self, data: dict[str, Any], *, author: User | None = None, cache: Cache | None = None
+    ) -> None:
+        self.id: Snowflake = Snowflake(data["id"])
+        self.channel_id: Snowflake = Snowflake(data["channel_id"])
+        self.guild_id: Snowflake | None = _optional_snowflake(data.get("guild_id"))
         self.content: str = data.get("content", "")
-        self.timestamp: str = data["timestamp"]
+        self.timestamp: str = data.get("timestamp", "")
         self.edited_timestamp: str | None = data.get("edited_timestamp")
         self.type: int = data.get("type", 0)
         self.tts: bool = data.get("tts", False)
         self.mention_everyone: bool = data.get("mention_everyone", False)
         self.pinned: bool = data.get("pinned", False)
         self.nonce: str | None = data.get("nonce")
-        self.webhook_id: str | None = data.get("webhook_id")
+        self.webhook_id: Snowflake | None = _optional_snowflake(data.get("webhook_id"))
         self.flags: int = data.get("flags", 0)
-        self.attachments: list[Attachment] = [
-            Attachment(a) for a in data.get("attachments", [])
-        ]
-        self.embeds: list[Embed] = [
-            Embed(e) for e in data.get("embeds", [])
-        ]
+        # Partial MESSAGE_UPDATEs can leave the author out.
+        self._author_data: dict[str, Any] = data.get("author") or {}
+        # The cache passes in its shared User so we don't build a duplicate.
+        self._author: User | None = author
+        self._attachments_data: list[dict[str, Any]] = data.get("attachments", [])
+        self._attachments: list[Attachment] | None = None
+        self._embeds_data: list[dict[str, Any]] = data.get("embeds", [])
+        self._embeds: list[Embed] | None = None
+        self._created_at: datetime.datetime = _UNPARSED
+        self._edited_at: datetime.datetime | None = _UNPARSED
+        self._mentions_data: list[dict[str, Any]] = data.get("mentions", [])
+        self._mention_ids: frozenset[Snowflake] | None = None
+        self._mention_roles_data: list[str] = data.get("mention_roles", [])
+        self._mention_role_ids: frozenset[Snowflake] | None = None
+        self._mention_channels_data: list[dict[str, Any]] = data.get("mention_channels", [])
+        self._mention_channel_ids: frozenset[Snowflake] | None = None
+        self._referenced_data: dict[str, Any] | None = data.get("referenced_message")
+        self._referenced: Message | None = None
+        self._cache: Cache | None = cache
+
+    @property
+    def author(self) -> User | None:
+        """
+        The user who sent the message. Only None for a partial edit of a
+        message that wasn't cached, where the API left the author out.
+        """
+        author = self._author
+        if author is None and self._author_data:
+            cache = self._cache
+            if cache is None:
+                author = User(self._author_data)
+            else:
+                # The cache's shared User, so `is` checks against it hold.
+                author = cache.get_user(self._author_data["id"])
+                if author is None:
+                    author = cache._store_user(self._author_data)
+            self._author = author
+        return author
+
+    @property
+    def attachments(self) -> list[Attachment]:
+        """Files attached to the message."""
+        attachments = self._attachments
+        if attachments is None:
+            from fluxcrystal.models.upload import Attachment
+
+            attachments = self._attachments = [
+                Attachment(a) for a in self._attachments_data
+            ]
+        return attachments
+
+    @property
+    def embeds(self) -> list[Embed]:
+        """Embeds in the message."""
+        embeds = self._embeds
+        if embeds is None:
+            embeds = self._embeds = [Embed(e) for e in self._embeds_data]
+        return embeds
+
+    @property
+    def created_at(self) -> datetime.datetime:
+        """
+        When the message was sent, as an aware datetime (parsed once, then
+        cached). Falls back to the time in the message's ID if the payload
+        had no timestamp.
+        """
+        created = self._created_at
+        if created is _UNPARSED:
+            created = _parse_timestamp(self.timestamp) or self.id.created_at
+            self._created_at = created
+        return created
+
+    @property
+    def edited_at(self) -> datetime.datetime | None:
+        """When the message was last edited (parsed once, then cached), or None."""
+        edited = self._edited_at
+        if edited is _UNPARSED:
+            edited = self._edited_at = _parse_timestamp(self.edited_timestamp)
+        return edited
+
+    @property
+    def mentioned_user_ids(self) -> frozenset[Snowflake]:
+        """IDs of the users mentioned in the message."""
+        ids = self._mention_ids
+        if ids is None:
+            ids = self._mention_ids = frozenset(
+                [Snowflake(u["id"]) for u in self._mentions_data]
+            )
+        return ids
+
+    @property
+    def mentioned_role_ids(self) -> frozenset[Snowflake]:
+        """IDs of the roles mentioned in the message."""
+        ids = self._mention_role_ids
+        if ids is None:
+            ids = self._mention_role_ids = frozenset(
+                [Snowflake(r) for r in self._mention_roles_data]
+            )
+        return ids
+
+    @property
+    def mentioned_channel_ids(self) -> frozenset[Snowflake]:
+        """IDs of the channels mentioned in the message."""
+        ids = self._mention_channel_ids
+        if ids is None:
+            ids = self._mention_channel_ids = frozenset(
+                [Snowflake(c["id"]) for c in self._mention_channels_data]
+            )
+        return ids
+
+    def mentions_user(self, user_id: SnowflakeLike) -> bool:
+        """True if the message mentions the given user."""
+        if not self._mentions_data:
+            return False
+        return Snowflake(user_id) in self.mentioned_user_ids
+
+    def mentions_role(self, role_id: SnowflakeLike) -> bool:
+        """True if the message mentions the given role."""
+        if not self._mention_roles_data:
+            return False
+        return Snowflake(role_id) in self.mentioned_role_ids
+
+    @property
+    def mentions_me(self) -> bool:
+        """
+        True if the message mentions the bot's own user. Always False for
+        messages that didn't come through the cache (ie fetched over REST).
+        """
+        if not self._mentions_data or self._cache is None:
+            return False
+        me = self._cache.me
+        return me is not None and me.id in self.mentioned_user_ids
+
+    @property
+    def referenced_message(self) -> Message | None:
+        """The message this one replies to or forwards, if the API sent it along."""
+        referenced = self._referenced
+        if referenced is None and self._referenced_data is not None:
+            referenced = self._referenced = Message(self._referenced_data, cache=self._cache)
+        return referenced
+
+    def _apply(self, data: dict[str, Any]) -> bool:
+        """
+        Patch this message in place with the fields present in `data`
+        (ie a MESSAGE_UPDATE). Returns True if anything changed.
+        """
+        changed = _apply_fields(
+            self,
+            data,
+            ("content", "edited_timestamp", "tts", "mention_everyone", "pinned", "flags"),
+        )
+        if changed:
+            self._edited_at = _UNPARSED
+        if "attachments" in data and data["attachments"] != self._attachments_data:
+            self._attachments_data = data["attachments"]
+            self._attachments = None
+            changed = True
+        if "embeds" in data and data["embeds"] != self._embeds_data:
+            self._embeds_data = data["embeds"]
+            self._embeds = None
+            changed = True
+        if "mentions" in data and data["mentions"] != self._mentions_data:
+            self._mentions_data = data["mentions"]
+            self._mention_ids = None
+            changed = True
+        if "mention_roles" in data and data["mention_roles"] != self._mention_roles_data:
+            self._mention_roles_data = data["mention_roles"]
+            self._mention_role_ids = None
+            changed = True
+        if (
+            "mention_channels" in data
+            and data["mention_channels"] != self._mention_channels_data
+        ):
+            self._mention_channels_data = data["mention_channels"]
+            self._mention_channel_ids = None
+            changed = True
+        return changed
+
+    def to_dict(self) -> dict[str, Any]:
+        """This message as an API-style payload dict."""
+        author = self._author
+        return {
+            "id": str(self.id),
+            "channel_id": str(self.channel_id),
+            "guild_id": _snowflake_str(self.guild_id),
+            "author": author.to_dict() if author is not None else self._author_data,
+            "content": self.content,
+            "timestamp": self.timestamp,
+            "edited_timestamp": self.edited_timestamp,
+            "type": self.type,
+            "tts": self.tts,
+            "mention_everyone": self.mention_everyone,
+            "pinned": self.pinned,
+            "nonce": self.nonce,
+            "webhook_id": _snowflake_str(self.webhook_id),
+            "flags": self.flags,
+            "attachments": self._attachments_data,
+            "embeds": self._embeds_data,
+            "mentions": self._mentions_data,
+            "mention_roles": self._mention_roles_data,
+            "mention_channels": self._mention_channels_data,
+            "referenced_message": self._referenced_data,
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        restore, (cls, state) = _reduce_slots(self)
+        # The cache doesn't travel with the message.
+        return restore, (cls, (*state[:-1], None))
 
     @property
     def is_webhook(self) -> bool:
@@ -323,8 +899,8 @@ class Message:
         """
         return {
             "type": 0,
-            "message_id": self.id,
-            "channel_id": self.channel_id,
+            "message_id": str(self.id),
+            "channel_id": str(self.channel_id),
         }
     
     def into_forward(self) -> MessageReference:
@@ -336,8 +912,8 @@ class Message:
         """
         return {
             "type": 1,
-            "message_id": self.id,
-            "channel_id": self.channel_id,
+            "message_id": str(self.id),
+            "channel_id": str(self.channel_id),
         }
 
     def __repr__(self) -> str:
@@ -0,0 +1,61 @@
+"""
+Permission bit flags.
+"""
+
+from __future__ import annotations
+
+import enum
+
+
+class Permissions(enum.IntFlag):
+    """Bitwise permission flags for roles and channel overwrites."""
+
+    NONE = 0
+    CREATE_INSTANT_INVITE = 1 << 0
+    KICK_MEMBERS = 1 << 1
+    BAN_MEMBERS = 1 << 2
+    ADMINISTRATOR = 1 << 3
+    MANAGE_CHANNELS = 1 << 4
+    MANAGE_GUILD = 1 << 5
+    ADD_REACTIONS = 1 << 6
+    VIEW_AUDIT_LOG = 1 << 7
+    PRIORITY_SPEAKER = 1 << 8
+    STREAM = 1 << 9
+    VIEW_CHANNEL = 1 << 10
+    SEND_MESSAGES = 1 << 11
+    SEND_TTS_MESSAGES = 1 << 12
+    MANAGE_MESSAGES = 1 << 13
+    EMBED_LINKS = 1 << 14
+    ATTACH_FILES = 1 << 15
+    READ_MESSAGE_HISTORY = 1 << 16
+    MENTION_EVERYONE = 1 << 17
+    USE_EXTERNAL_EMOJIS = 1 << 18
+    CONNECT = 1 << 20
+    SPEAK = 1 << 21
+    MUTE_MEMBERS = 1 << 22
+    DEAFEN_MEMBERS = 1 << 23
+    MOVE_MEMBERS = 1 << 24
+    USE_VAD = 1 << 25
+    CHANGE_NICKNAME = 1 << 26
+    MANAGE_NICKNAMES = 1 << 27
+    MANAGE_ROLES = 1 << 28
+    MANAGE_WEBHOOKS = 1 << 29
+    MANAGE_EXPRESSIONS = 1 << 30
+    MODERATE_MEMBERS = 1 << 40
+
+    @classmethod
+    def all(cls) -> Permissions:
+        """Every known permission bit set (what owners and administrators get)."""
+        return _ALL_PERMISSIONS
+
+    @classmethod
+    def parse(cls, value: str | int | None) -> Permissions:
+        """Parse the decimal string (or int) the API sends permissions as."""
+        if not value:
+            return cls.NONE
+        return cls(int(value))
+
+
+_ALL_PERMISSIONS = Permissions(0)
+for _flag in Permissions:
+    _ALL_PERMISSIONS |= _flag
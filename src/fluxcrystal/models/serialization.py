@@ -0,0 +1,77 @@
+"""
+Compact binary encoding for moving models between processes.
+
+Needs the ``msgpack`` extra (``pip install fluxcrystal[msgpack]``). For
+same-process snapshots plain `pickle` works too; every model pickles as a
+flat tuple of its slots.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from fluxcrystal.models.channels import Channel, PermissionOverwrite
+from fluxcrystal.models.guilds import Guild, GuildMember, Role
+from fluxcrystal.models.messages import Embed, EmbedField, Message, RichEmbed
+from fluxcrystal.models.upload import Attachment
+from fluxcrystal.models.users import User
+
+if TYPE_CHECKING:
+    from typing import TypeAlias
+
+    Model: TypeAlias = (
+        Attachment
+        | Channel
+        | Embed
+        | EmbedField
+        | Guild
+        | GuildMember
+        | Message
+        | PermissionOverwrite
+        | Role
+        | User
+    )
+
+# Tags are part of the wire format, so only ever add to this.
+_MODEL_TAGS: dict[type, int] = {
+    User: 1,
+    Guild: 2,
+    GuildMember: 3,
+    Role: 4,
+    Channel: 5,
+    PermissionOverwrite: 6,
+    Message: 7,
+    Attachment: 8,
+    Embed: 9,
+    RichEmbed: 10,
+    EmbedField: 11,
+}
+_TAG_BUILDERS: dict[int, Any] = {tag: cls for cls, tag in _MODEL_TAGS.items()}
+_TAG_BUILDERS[_MODEL_TAGS[RichEmbed]] = RichEmbed.from_data
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError(
+            "Binary model encoding needs msgpack: pip install fluxcrystal[msgpack]"
+        ) from None
+    return msgpack
+
+
+def encode_model(model: Model) -> bytes:
+    """Encode a model (from its `to_dict` payload) into msgpack bytes."""
+    tag = _MODEL_TAGS.get(type(model))
+    if tag is None:
+        raise TypeError(f"Can't encode {type(model).__name__}")
+    return _msgpack().packb((tag, model.to_dict()))
+
+
+def decode_model(data: bytes) -> Model:
+    """Rebuild a model from bytes made by `encode_model`."""
+    tag, payload = _msgpack().unpackb(data)
+    builder = _TAG_BUILDERS.get(tag)
+    if builder is None:
+        raise ValueError(f"Unknown model tag {tag}")
+    return builder(payload)
@@ -0,0 +1,77 @@
+"""
+Snowflake ID type.
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+#: Milliseconds since the Unix epoch that snowflake timestamps count from.
+FLUXER_EPOCH = 1420070400000
+
+#: Anything that can be turned into a `Snowflake` - the API sends IDs as strings.
+SnowflakeLike = int | str
+
+
+class Snowflake(int):
+    """
+    A unique ID for a user, message, channel, guild, etc.
+
+    Snowflakes are plain ints (so they hash and compare fast, and sort
+    chronologically) with helpers for pulling apart the parts packed into
+    them:
+
+        timestamp (42 bits) | worker (5 bits) | process (5 bits) | increment (12 bits)
+
+    Like any int, a snowflake never equals the string form of the same ID;
+    compare against ints, or convert with ``Snowflake(...)`` first.
+    """
+
+    __slots__ = ()
+
+    @property
+    def timestamp(self) -> int:
+        """Milliseconds since the Unix epoch when this ID was generated."""
+        return (self >> 22) + FLUXER_EPOCH
+
+    @property
+    def created_at(self) -> datetime.datetime:
+        """When this ID was generated, as an aware UTC datetime."""
+        return datetime.datetime.fromtimestamp(self.timestamp / 1000, tz=datetime.timezone.utc)
+
+    @property
+    def worker_id(self) -> int:
+        """The ID of the worker that generated this snowflake."""
+        return (self >> 17) & 0x1F
+
+    @property
+    def process_id(self) -> int:
+        """The ID of the process that generated this snowflake."""
+        return (self >> 12) & 0x1F
+
+    @property
+    def increment(self) -> int:
+        """Per-process counter, incremented for every ID generated."""
+        return self & 0xFFF
+
+    @classmethod
+    def from_datetime(cls, when: datetime.datetime) -> Snowflake:
+        """
+        The smallest snowflake that could have been generated at `when`.
+
+        Handy for ``before=``/``after=`` bounds on history endpoints. Naive
+        datetimes are treated as UTC.
+        """
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        ms = int(when.timestamp() * 1000) - FLUXER_EPOCH
+        return cls(max(ms, 0) << 22)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return Snowflake, (int(self),)
+
+
+def _optional_snowflake(value: Any) -> Snowflake | None:
+    """Convert a possibly-null ID from a payload."""
+    return None if value is None else Snowflake(value)
@@ -6,6 +6,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, TypedDict, NotRequired
 
+from fluxcrystal.models.base import _reduce_slots
+from fluxcrystal.models.snowflake import Snowflake
+
 if TYPE_CHECKING:
     from fluxcrystal.models.users import User
 
@@ -50,7 +53,7 @@ class Attachment:
     )
 
     def __init__(self, data: dict[str, Any]) -> None:
-        self.id: str = data["id"]
+        self.id: Snowflake = Snowflake(data["id"])
         self.filename: str = data["filename"]
         self.title: str | None = data.get("title")
         self.description: str | None = data.get("description")
@@ -62,6 +65,25 @@ class Attachment:
         self.height: int | None = data.get("height")
         self.ephemeral: bool = data.get("ephemeral", False)
 
+    def to_dict(self) -> dict[str, Any]:
+        """This attachment as an API-style payload dict."""
+        return {
+            "id": str(self.id),
+            "filename": self.filename,
+            "title": self.title,
+            "description": self.description,
+            "content_type": self.content_type,
+            "size": self.size,
+            "url": self.url,
+            "proxy_url": self.proxy_url,
+            "width": self.width,
+            "height": self.height,
+            "ephemeral": self.ephemeral,
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
+
     @property
     def is_image(self) -> bool:
         """Check if the attachment is an image."""
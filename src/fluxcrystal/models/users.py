@@ -6,6 +6,9 @@ from __future__ import annotations
 
 from typing import Any
 
+from fluxcrystal.models.base import _apply_fields, _reduce_slots
+from fluxcrystal.models.snowflake import Snowflake
+
 
 class User:
     """A user, either a regular user or a bot account."""
@@ -23,7 +26,7 @@ class User:
     )
 
     def __init__(self, data: dict[str, Any]) -> None:
-        self.id: str = data["id"]
+        self.id: Snowflake = Snowflake(data["id"])
         self.username: str = data["username"]
         self.discriminator: str = data["discriminator"]
         self.global_name: str | None = data.get("global_name")
@@ -33,6 +36,43 @@ class User:
         self.system: bool = data.get("system", False)
         self.flags: int = data.get("flags", 0)
 
+    def _apply(self, data: dict[str, Any]) -> bool:
+        """
+        Patch this user in place with the fields present in `data`.
+        Returns True if anything changed.
+        """
+        return _apply_fields(
+            self,
+            data,
+            (
+                "username",
+                "discriminator",
+                "global_name",
+                "avatar",
+                "avatar_color",
+                "bot",
+                "system",
+                "flags",
+            ),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """This user as an API-style payload dict."""
+        return {
+            "id": str(self.id),
+            "username": self.username,
+            "discriminator": self.discriminator,
+            "global_name": self.global_name,
+            "avatar": self.avatar,
+            "avatar_color": self.avatar_color,
+            "bot": self.bot,
+            "system": self.system,
+            "flags": self.flags,
+        }
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _reduce_slots(self)
+
     @property
     def display_name(self) -> str:
         """What is shown in the UI for this user (global_name if they set one, otherwise username)"""
@@ -0,0 +1,344 @@
+"""
+Client-side tracking of REST rate limit buckets.
+
+The API reports its limits in ``X-RateLimit-*`` response headers. We
+remember them per route so requests wait *before* they'd get a 429,
+instead of finding out afterwards.
+"""
+
+from __future__ import annotations
+
+import enum
+import itertools
+import logging
+import time
+from collections.abc import Mapping
+from contextvars import ContextVar
+from typing import Any
+
+import anyio
+
+log = logging.getLogger("fluxcrystal.ratelimits")
+
+# Path segments whose IDs get their own buckets (a channel's limits don't
+# affect another channel's).
+_MAJOR_PARAMETERS = frozenset(("channels", "guilds", "webhooks"))
+
+
+class Priority(enum.IntEnum):
+    """
+    How urgent a REST request is. When requests are waiting on the same
+    rate limit bucket, higher priorities go first.
+    """
+
+    #: Replies and other things a user is waiting on.
+    HIGH = 0
+    #: The default.
+    NORMAL = 1
+    #: Background jobs (archiving, mass role syncs...).
+    LOW = 2
+
+
+# The priority requests made in the current context get (see `RESTClient.priority`).
+_current_priority: ContextVar[Priority] = ContextVar(
+    "fluxcrystal_priority", default=Priority.NORMAL
+)
+
+# A waiting request's priority goes up one class for every this many
+# seconds it waits, so low priority work can't be starved forever.
+_AGING_INTERVAL = 5.0
+
+# Low priority requests leave this share of a bucket's window for others.
+_LOW_PRIORITY_RESERVE = 0.2
+
+# Idle buckets are swept out at most this often (in seconds), so per-channel
+# and per-guild routes don't pile up forever in long-running bots.
+_PRUNE_INTERVAL = 60.0
+
+
+def route_key(method: str, path: str) -> str:
+    """
+    The key requests are bucketed under: the method and path with every ID
+    except major parameters replaced, ie
+    ``"DELETE /channels/123/messages/:id"``.
+    """
+    parts = path.strip("/").split("/")
+    previous = ""
+    for i, part in enumerate(parts):
+        if previous == "reactions":
+            parts[i] = ":emoji"
+        elif part.isdigit() and previous not in _MAJOR_PARAMETERS:
+            parts[i] = ":id"
+        previous = part
+    return f"{method} /{'/'.join(parts)}"
+
+
+class WaitStats:
+    """How long requests of one priority class have waited on rate limits."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        #: Requests that went through.
+        self.count: int = 0
+        #: Seconds spent waiting, summed.
+        self.total: float = 0.0
+        #: The longest single wait, in seconds.
+        self.max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Average wait in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def _record(self, waited: float) -> None:
+        self.count += 1
+        self.total += waited
+        if waited > self.max:
+            self.max = waited
+
+    def __repr__(self) -> str:
+        return f"<WaitStats count={self.count} mean={self.mean:.3f}s max={self.max:.3f}s>"
+
+
+class _Waiter:
+    __slots__ = ("key", "bucket", "priority", "since", "order", "wakeup")
+
+    def __init__(
+        self, key: str, bucket: _Bucket, priority: Priority, since: float, order: int
+    ) -> None:
+        self.key = key
+        #: The bucket this is queued on; changes if the route's bucket does.
+        self.bucket = bucket
+        self.priority = priority
+        self.since = since
+        self.order = order
+        self.wakeup = anyio.Event()
+
+    def rank(self, now: float) -> tuple[float, int]:
+        return (self.priority - (now - self.since) / _AGING_INTERVAL, self.order)
+
+    def effective(self, now: float) -> Priority:
+        """The class this waiter has aged into."""
+        aged = self.priority - int((now - self.since) // _AGING_INTERVAL)
+        return Priority(max(aged, Priority.HIGH))
+
+
+class _Bucket:
+    __slots__ = ("id", "limit", "remaining", "reset_at", "window", "waiters")
+
+    def __init__(self) -> None:
+        #: The API's hash for this bucket, once we've seen one.
+        self.id: str | None = None
+        #: None until a response tells us the limit.
+        self.limit: int | None = None
+        self.remaining: int = 0
+        #: `time.monotonic()` when the current window ends.
+        self.reset_at: float = 0.0
+        #: Length of a window, for guessing when the next one ends.
+        self.window: float = 1.0
+        #: Requests queued for a slot.
+        self.waiters: list[_Waiter] = []
+
+    def __repr__(self) -> str:
+        return f"<Bucket id={self.id!r} remaining={self.remaining}/{self.limit}>"
+
+
+class RateLimiter:
+    """
+    Per-bucket rate limit state shared by everything using one `RESTClient`.
+
+    Routes start out unlimited and pick up their limits from the first
+    response. Routes the API says share a bucket (same
+    ``X-RateLimit-Bucket``) share state here too.
+
+    Requests that have to wait are queued per bucket and let through by
+    `Priority` (then arrival order). Waiting requests slowly gain priority
+    so low priority ones do eventually run, and low priority requests never
+    take the last few slots of a window, so a reply can still get through
+    during a sync.
+
+    Buckets nobody is using (no waiters, window over) are dropped every so
+    often, so one bucket per channel doesn't add up forever.
+    """
+
+    def __init__(self) -> None:
+        self._routes: dict[str, _Bucket] = {}
+        self._by_id: dict[str, _Bucket] = {}
+        self._global_reset_at: float = 0.0
+        self._next_prune: float = time.monotonic() + _PRUNE_INTERVAL
+        self._order = itertools.count()
+        #: Time spent waiting on rate limits, per priority class.
+        self.stats: dict[Priority, WaitStats] = {p: WaitStats() for p in Priority}
+
+    def bucket(self, key: str) -> _Bucket:
+        bucket = self._routes.get(key)
+        if bucket is None:
+            now = time.monotonic()
+            if now >= self._next_prune:
+                self._prune(now)
+            bucket = self._routes[key] = _Bucket()
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        """
+        Forget buckets nobody is waiting on whose window has run out; a
+        route that comes back just learns its limits again.
+        """
+        self._next_prune = now + _PRUNE_INTERVAL
+        routes = self._routes
+        for key in [k for k, b in routes.items() if not b.waiters and b.reset_at <= now]:
+            del routes[key]
+        live = {id(b) for b in routes.values()}
+        self._by_id = {i: b for i, b in self._by_id.items() if id(b) in live}
+
+    def capacity(self, key: str) -> int | None:
+        """How many requests the route's bucket allows per window, if known."""
+        bucket = self._routes.get(key)
+        return None if bucket is None else bucket.limit
+
+    def _take(self, bucket: _Bucket, priority: Priority, now: float) -> float:
+        """
+        Take a slot from `bucket` if one is free to a request of `priority`
+        and return 0, otherwise return how long until one might be.
+        """
+        if self._global_reset_at > now:
+            return self._global_reset_at - now
+        if bucket.limit is None:
+            return 0.0
+        if bucket.reset_at <= now:
+            # New window; the API will correct us if we guessed it wrong.
+            bucket.remaining = bucket.limit
+            bucket.reset_at = now + bucket.window
+        reserved = int(bucket.limit * _LOW_PRIORITY_RESERVE) if priority >= Priority.LOW else 0
+        if bucket.remaining > reserved:
+            bucket.remaining -= 1
+            return 0.0
+        return bucket.reset_at - now
+
+    async def acquire(self, key: str, priority: Priority | None = None) -> None:
+        """
+        Wait until a request on `key` is allowed, and count it. `priority`
+        defaults to the one set with `RESTClient.priority`.
+        """
+        if priority is None:
+            priority = _current_priority.get()
+        start = time.monotonic()
+        bucket = self.bucket(key)
+        if not bucket.waiters and self._take(bucket, priority, start) <= 0:
+            self.stats[priority]._record(0.0)
+            return
+
+        waiter = _Waiter(key, bucket, priority, start, next(self._order))
+        bucket.waiters.append(waiter)
+        try:
+            while True:
+                # `update` may have moved us to a shared bucket while we slept.
+                bucket = waiter.bucket
+                now = time.monotonic()
+                timeout = _AGING_INTERVAL
+                if min(bucket.waiters, key=lambda w: w.rank(now)) is waiter:
+                    # Use the class we've aged into: once we're at the head,
+                    # everyone behind us is that urgent or less, so holding
+                    # back the reserve would only leave it unused.
+                    wait = self._take(bucket, waiter.effective(now), now)
+                    if wait <= 0:
+                        break
+                    timeout = wait
+                    log.debug("Waiting %.2fs for rate limit on %s (%s)", wait, key, priority.name)
+                # Sleep until our turn might have come: the window resets,
+                # the waiter ahead of us leaves, or we've aged a bit.
+                waiter.wakeup = anyio.Event()
+                with anyio.move_on_after(timeout):
+                    await waiter.wakeup.wait()
+        finally:
+            bucket = waiter.bucket
+            bucket.waiters.remove(waiter)
+            _wake_head(bucket)
+        self.stats[priority]._record(time.monotonic() - start)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Every known route's bucket state and the wait stats, as plain data."""
+        now = time.monotonic()
+        routes = {}
+        for key, bucket in self._routes.items():
+            fresh = bucket.limit is not None and bucket.reset_at <= now
+            routes[key] = {
+                "bucket": bucket.id,
+                "limit": bucket.limit,
+                "remaining": bucket.limit if fresh else bucket.remaining,
+                "reset_after": max(bucket.reset_at - now, 0.0),
+                "waiting": len(bucket.waiters),
+            }
+        return {
+            "global_reset_after": max(self._global_reset_at - now, 0.0),
+            "routes": routes,
+            "wait_stats": {
+                p.name: {"count": s.count, "mean": s.mean, "max": s.max}
+                for p, s in self.stats.items()
+            },
+        }
+
+    def update(self, key: str, headers: Mapping[str, str]) -> None:
+        """Record the limits a response reported."""
+        limit = headers.get("x-ratelimit-limit")
+        if limit is None:
+            return
+        bucket = self.bucket(key)
+        bucket_id = headers.get("x-ratelimit-bucket")
+        if bucket_id is not None and bucket.id != bucket_id:
+            shared = self._by_id.get(bucket_id)
+            if shared is None:
+                bucket.id = bucket_id
+                self._by_id[bucket_id] = bucket
+            else:
+                self._routes[key] = shared
+                self._move_waiters(key, bucket, shared)
+                bucket = shared
+
+        now = time.monotonic()
+        remaining = int(headers.get("x-ratelimit-remaining", 0))
+        reset_after = float(headers.get("x-ratelimit-reset-after", bucket.window))
+        if bucket.limit is None or bucket.reset_at <= now:
+            # We weren't counting a window, so the API's count is all we have.
+            bucket.remaining = remaining
+        else:
+            # Requests still in flight have already taken their slots here,
+            # and responses can arrive out of order, so only ever go down.
+            bucket.remaining = min(bucket.remaining, remaining)
+        bucket.limit = int(limit)
+        bucket.reset_at = now + reset_after
+        if reset_after > 0 and (remaining == bucket.limit - 1 or reset_after > bucket.window):
+            # Only the first request of a window sees all of it; later ones
+            # see what's left, which would have us open windows early.
+            bucket.window = reset_after
+
+    def _move_waiters(self, key: str, old: _Bucket, new: _Bucket) -> None:
+        """Requeue `key`'s waiters from `old` onto `new`, its bucket from now on."""
+        moving = [w for w in old.waiters if w.key == key]
+        if not moving:
+            return
+        old.waiters = [w for w in old.waiters if w.key != key]
+        for waiter in moving:
+            waiter.bucket = new
+        new.waiters.extend(moving)
+        # Both queues may have a new head now.
+        _wake_head(old)
+        _wake_head(new)
+
+    def rate_limited(self, key: str, retry_after: float, *, is_global: bool = False) -> None:
+        """Record a 429 so other requests wait it out too."""
+        reset_at = time.monotonic() + retry_after
+        if is_global:
+            self._global_reset_at = max(self._global_reset_at, reset_at)
+            return
+        bucket = self.bucket(key)
+        bucket.remaining = 0
+        bucket.reset_at = max(bucket.reset_at, reset_at)
+
+
+def _wake_head(bucket: _Bucket) -> None:
+    """Wake whichever of `bucket`'s waiters should go next."""
+    if bucket.waiters:
+        now = time.monotonic()
+        min(bucket.waiters, key=lambda w: w.rank(now)).wakeup.set()
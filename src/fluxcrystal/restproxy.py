@@ -0,0 +1,327 @@
+"""
+A local HTTP proxy for sharing one set of REST rate limits between
+processes.
+
+Each `RESTClient` only knows about its own requests, so several worker
+processes using the same token will happily blow through limits together.
+Run one proxy instead:
+
+    python -m fluxcrystal.restproxy --port 8765
+
+and point every process at it:
+
+    bot = fluxcrystal.GatewayBot(token, base_url="http://127.0.0.1:8765")
+
+The proxy keeps the only authoritative bucket state (per token), holds
+persistent connections to the API, and hands out each bucket's slots
+round-robin between clients, so one busy process can't starve the others.
+Clients are told apart by the ``X-FluxCrystal-Client`` header `RESTClient`
+sends, otherwise by their host (not host and port, since one process keeps
+several connections open).
+
+``GET /_proxy/buckets`` returns the current bucket state as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+from collections import OrderedDict, deque
+from typing import Any
+from urllib.parse import unquote
+
+import anyio
+import h11
+import httpx
+from anyio.abc import SocketAttribute, SocketStream, TaskStatus
+
+from fluxcrystal.ratelimits import RateLimiter, route_key
+
+log = logging.getLogger("fluxcrystal.restproxy")
+
+_STATE_PATH = "/_proxy/buckets"
+_CLIENT_HEADER = b"x-fluxcrystal-client"
+
+# Hop-by-hop headers (and ones httpx works out itself) that aren't forwarded.
+_SKIP_REQUEST_HEADERS = frozenset(
+    (b"host", b"connection", b"keep-alive", b"content-length", b"transfer-encoding", _CLIENT_HEADER)
+)
+_SKIP_RESPONSE_HEADERS = frozenset(
+    ("connection", "keep-alive", "content-length", "transfer-encoding", "content-encoding")
+)
+
+
+def _error_response(status: int, message: str) -> tuple[int, list[tuple[str, str]], bytes]:
+    body = json.dumps({"message": message}).encode()
+    return status, [("content-type", "application/json")], body
+
+
+class _FairQueue:
+    """
+    Hands out turns at a bucket round-robin between clients, first come
+    first served within each client.
+    """
+
+    __slots__ = ("_clients", "_busy")
+
+    def __init__(self) -> None:
+        self._clients: OrderedDict[str, deque[anyio.Event]] = OrderedDict()
+        self._busy = False
+
+    async def turn(self, client: str) -> None:
+        """Wait for `client`'s turn. Call `release` once done with it."""
+        if not self._busy:
+            self._busy = True
+            return
+        event = anyio.Event()
+        self._clients.setdefault(client, deque()).append(event)
+        try:
+            await event.wait()
+        except BaseException:
+            if event.is_set():
+                self.release()  # got the turn just as we were cancelled
+            else:
+                waiting = self._clients[client]
+                waiting.remove(event)
+                if not waiting:
+                    del self._clients[client]
+            raise
+
+    def release(self) -> None:
+        if not self._clients:
+            self._busy = False
+            return
+        client, waiting = next(iter(self._clients.items()))
+        event = waiting.popleft()
+        if waiting:
+            self._clients.move_to_end(client)
+        else:
+            del self._clients[client]
+        event.set()
+
+
+class RESTProxy:
+    """
+    The proxy server. Usually run with ``python -m fluxcrystal.restproxy``.
+
+    Args:
+        upstream: The API to forward to.
+        host: Interface to listen on.
+        port: Port to listen on (0 picks a free one, see `port` once serving).
+        transport: A custom httpx transport for upstream requests.
+    """
+
+    def __init__(
+        self,
+        upstream: str = "https://api.fluxer.app/v1",
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.upstream = upstream
+        self.host = host
+        self.port = port
+        self._base = httpx.URL(upstream.rstrip("/") + "/")
+        self._transport = transport
+        # Authorization header → that token's limits
+        self._limiters: dict[bytes, RateLimiter] = {}
+        self._queues: dict[tuple[bytes, str], _FairQueue] = {}
+        self._client: httpx.AsyncClient | None = None
+
+    async def serve(self, *, task_status: TaskStatus[None] = anyio.TASK_STATUS_IGNORED) -> None:
+        """Run until cancelled."""
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0), transport=self._transport
+        ) as self._client:
+            listener = await anyio.create_tcp_listener(
+                local_host=self.host, local_port=self.port
+            )
+            async with listener:
+                self.port = listener.extra(SocketAttribute.local_port)
+                log.info("Proxying %s on http://%s:%d", self.upstream, self.host, self.port)
+                task_status.started()
+                await listener.serve(self._handle_connection)
+
+    def state(self) -> dict[str, Any]:
+        """Bucket state for every token seen so far (tokens are hashed)."""
+        return {
+            hashlib.sha256(auth).hexdigest()[:12]: limiter.snapshot()
+            for auth, limiter in self._limiters.items()
+        }
+
+    async def _handle_connection(self, stream: SocketStream) -> None:
+        address = stream.extra(SocketAttribute.remote_address)
+        peer = ":".join(map(str, address)) if isinstance(address, tuple) else str(address)
+        async with stream:
+            try:
+                await self._serve_connection(stream, peer)
+            except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+                pass
+            except Exception:
+                # Whatever this was, it only takes down this connection.
+                log.exception("Error on connection from %s", peer)
+
+    async def _serve_connection(self, stream: SocketStream, peer: str) -> None:
+        conn = h11.Connection(h11.SERVER)
+        while True:
+            try:
+                request, body = await self._read_request(conn, stream)
+            except h11.RemoteProtocolError as e:
+                log.debug("Bad request from %s: %s", peer, e)
+                await self._respond(conn, stream, *_error_response(400, "Bad request"))
+                return
+            if request is None:
+                return
+            try:
+                status, headers, content = await self._handle_request(request, body, peer)
+            except Exception:
+                log.exception("Error proxying %r from %s", request.target, peer)
+                status, headers, content = _error_response(502, "Proxy error")
+            await self._respond(conn, stream, status, headers, content)
+            if conn.our_state is h11.MUST_CLOSE:
+                return
+            conn.start_next_cycle()
+
+    async def _read_request(
+        self, conn: h11.Connection, stream: SocketStream
+    ) -> tuple[h11.Request | None, bytes]:
+        request = None
+        body = bytearray()
+        while True:
+            event = conn.next_event()
+            if event is h11.NEED_DATA:
+                try:
+                    data = await stream.receive()
+                except anyio.EndOfStream:
+                    data = b""
+                conn.receive_data(data)
+            elif isinstance(event, h11.Request):
+                request = event
+            elif isinstance(event, h11.Data):
+                body += event.data
+            elif isinstance(event, h11.EndOfMessage):
+                return request, bytes(body)
+            else:  # ConnectionClosed
+                return None, b""
+
+    async def _respond(
+        self,
+        conn: h11.Connection,
+        stream: SocketStream,
+        status: int,
+        headers: list[tuple[str, str]],
+        content: bytes,
+    ) -> None:
+        headers = [*headers, ("content-length", str(len(content)))]
+        await stream.send(conn.send(h11.Response(status_code=status, headers=headers)))
+        await stream.send(conn.send(h11.Data(data=content)))
+        await stream.send(conn.send(h11.EndOfMessage()))
+
+    async def _handle_request(
+        self, request: h11.Request, body: bytes, peer: str
+    ) -> tuple[int, list[tuple[str, str]], bytes]:
+        method = request.method.decode("ascii", errors="replace")
+        target = request.target.decode("ascii", errors="replace")
+        path = target.partition("?")[0]
+        if path == _STATE_PATH:
+            return 200, [("content-type", "application/json")], json.dumps(self.state()).encode()
+        url = self._upstream_url(target)
+        if url is None:
+            log.debug("Rejected target %r from %s", target, peer)
+            return _error_response(400, "Only paths under the API are proxied")
+
+        headers: list[tuple[bytes, bytes]] = []
+        auth = b""
+        # Drop the port: every pooled connection from a process is one client.
+        client = peer.rpartition(":")[0] or peer
+        for name, value in request.headers:
+            if name == b"authorization":
+                auth = value
+            elif name == _CLIENT_HEADER:
+                client = value.decode(errors="replace")
+            if name not in _SKIP_REQUEST_HEADERS:
+                headers.append((name, value))
+
+        limiter = self._limiters.get(auth)
+        if limiter is None:
+            limiter = self._limiters[auth] = RateLimiter()
+        key = route_key(method, path)
+        queue = self._queues.get((auth, key))
+        if queue is None:
+            queue = self._queues[(auth, key)] = _FairQueue()
+
+        await queue.turn(client)
+        try:
+            await limiter.acquire(key)
+        finally:
+            queue.release()
+
+        assert self._client is not None
+        try:
+            response = await self._client.request(method, url, headers=headers, content=body)
+        except httpx.HTTPError as e:
+            log.warning("Upstream error on %s %s: %s", method, path, e)
+            return _error_response(502, f"Upstream error: {e}")
+
+        limiter.update(key, response.headers)
+        if response.status_code == 429:
+            self._record_rate_limit(limiter, key, response)
+        return (
+            response.status_code,
+            [(k, v) for k, v in response.headers.items() if k not in _SKIP_RESPONSE_HEADERS],
+            response.content,
+        )
+
+    def _upstream_url(self, target: str) -> httpx.URL | None:
+        """
+        Where `target` goes upstream, or None unless it's an origin-form
+        path (``/users/123?x=y``) that stays under the API base.
+        """
+        if not target.startswith("/") or target.startswith("//"):
+            return None
+        path = target.partition("?")[0]
+        if "\\" in path or any(s in (".", "..") for s in unquote(path).split("/")):
+            return None
+        base = self._base
+        url = httpx.URL(str(base) + target[1:])
+        if (url.scheme, url.host, url.port) != (base.scheme, base.host, base.port):
+            return None
+        if not url.raw_path.startswith(base.raw_path):
+            return None
+        return url
+
+    def _record_rate_limit(self, limiter: RateLimiter, key: str, response: httpx.Response) -> None:
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        retry_after = float(body.get("retry_after", response.headers.get("retry-after", 1.0)))
+        is_global = bool(body.get("global")) or response.headers.get("x-ratelimit-global") == "true"
+        log.warning("Rate limited on %s for %.2fs (global=%s)", key, retry_after, is_global)
+        limiter.rate_limited(key, retry_after, is_global=is_global)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m fluxcrystal.restproxy",
+        description="Share REST rate limits between bot processes.",
+    )
+    parser.add_argument("--upstream", default="https://api.fluxer.app/v1", help="API to forward to")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper())
+    proxy = RESTProxy(args.upstream, host=args.host, port=args.port)
+    try:
+        anyio.run(proxy.serve)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from fluxcrystal.endpoint_client import RESTClient
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture(params=["asyncio", "trio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    if request.param == "trio":
+        pytest.importorskip("trio")
+    return request.param
+
+
+@pytest.fixture
+def make_rest() -> Callable[[Handler], RESTClient]:
+    """A `RESTClient` whose requests go to `handler` instead of the network."""
+
+    def make(handler: Handler) -> RESTClient:
+        rest = RESTClient("http://api.test", token="t", edit_flush_interval=0.05)
+        rest._client = httpx.AsyncClient(
+            base_url="http://api.test", transport=httpx.MockTransport(handler)
+        )
+        return rest
+
+    return make
@@ -0,0 +1,129 @@
+import anyio
+import httpx
+import pytest
+
+from fluxcrystal.errors import FluxCrystalError
+
+pytestmark = pytest.mark.anyio
+
+
+def _user(request: httpx.Request) -> httpx.Response:
+    user_id = request.url.path.rsplit("/", 1)[1]
+    if user_id == "404":
+        return httpx.Response(404, json={"code": 10013, "message": "Unknown User"})
+    return httpx.Response(200, json={"id": user_id, "username": f"u{user_id}", "discriminator": "0"})
+
+
+async def test_identical_calls_are_sent_once(make_rest) -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return _user(request)
+
+    rest = make_rest(handler)
+    async with rest.batch() as batch:
+        first = batch.fetch_user(1)
+        second = batch.fetch_user("1")
+        batch.fetch_user(2)
+    assert first is second
+    assert sorted(seen) == ["/users/1", "/users/2"]
+    assert len(batch.results) == 3
+
+
+async def test_identical_writes_are_all_sent(make_rest) -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(204)
+
+    rest = make_rest(handler)
+    async with rest.batch() as batch:
+        first = batch.add_member_role(1, 2, 3)
+        second = batch.add_member_role(1, 2, 3)
+    assert first is not second
+    assert seen == ["/guilds/1/members/2/roles/3"] * 2
+
+
+async def test_results_keep_call_order(make_rest) -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        # Later calls finish first.
+        await anyio.sleep(0.01 * (10 - int(request.url.path.rsplit("/", 1)[1])))
+        return _user(request)
+
+    rest = make_rest(handler)
+    async with rest.batch() as batch:
+        for user_id in range(1, 6):
+            batch.fetch_user(user_id)
+    assert [r.value.id for r in batch.results] == [1, 2, 3, 4, 5]
+
+
+async def test_iterating_yields_each_distinct_call(make_rest) -> None:
+    rest = make_rest(_user)
+    async with rest.batch() as batch:
+        for user_id in (1, 2, 2, 3):
+            batch.fetch_user(user_id)
+        streamed = [result async for result in batch]
+    assert sorted(r.value.id for r in streamed) == [1, 2, 3]
+
+
+async def test_one_failure_doesnt_sink_the_rest(make_rest) -> None:
+    rest = make_rest(_user)
+    async with rest.batch() as batch:
+        ok = batch.fetch_user(1)
+        missing = batch.fetch_user(404)
+    assert ok.ok and ok.value.id == 1
+    assert not missing.ok
+    assert isinstance(missing.error, FluxCrystalError)
+    with pytest.raises(FluxCrystalError):
+        missing.unwrap()
+
+
+async def test_exception_in_block_cancels_and_propagates(make_rest) -> None:
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await anyio.sleep(1)
+        return _user(request)
+
+    class Boom(Exception):
+        pass
+
+    rest = make_rest(slow)
+    with anyio.fail_after(0.5), pytest.raises(Boom):
+        async with rest.batch() as batch:
+            result = batch.fetch_user(1)
+            raise Boom
+    assert not result.done
+
+
+async def test_routes_sharing_a_bucket_share_its_concurrency(make_rest) -> None:
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await anyio.sleep(0.02)
+        in_flight -= 1
+        headers = {
+            "x-ratelimit-limit": "2",
+            "x-ratelimit-remaining": "2",
+            "x-ratelimit-reset-after": "0.001",
+            "x-ratelimit-bucket": "shared",
+        }
+        user = _user(request).json()
+        if request.url.path.startswith("/guilds"):
+            member = {"user": user, "roles": [], "joined_at": "2024-01-01T00:00:00+00:00"}
+            return httpx.Response(200, json=member, headers=headers)
+        return httpx.Response(200, json=user, headers=headers)
+
+    rest = make_rest(handler)
+    await rest.fetch_user(100)
+    await rest.fetch_guild_member(1, 100)
+    peak = 0
+    async with rest.batch() as batch:
+        for user_id in range(1, 5):
+            batch.fetch_user(user_id)
+            batch.fetch_guild_member(1, user_id)
+    assert all(r.ok for r in batch.results)
+    assert peak == 2
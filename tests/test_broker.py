@@ -0,0 +1,64 @@
+import anyio
+import pytest
+
+from fluxcrystal.bot import GatewayBot
+from fluxcrystal.broker import EventPublisher, WorkerBot
+from fluxcrystal.events.messages import MessageCreateEvent
+
+pytestmark = pytest.mark.anyio
+
+
+def _message(message_id: str, content: str) -> dict[str, object]:
+    return {
+        "id": message_id,
+        "channel_id": "2",
+        "author": {"id": "3", "username": "someone", "discriminator": "0"},
+        "content": content,
+        "timestamp": "2024-01-01T00:00:00+00:00",
+    }
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    with anyio.fail_after(timeout):
+        while not condition():
+            await anyio.sleep(0.01)
+
+
+async def test_worker_gets_dispatches_it_listens_for(tmp_path) -> None:
+    path = tmp_path / "broker.sock"
+    bot = GatewayBot("t")
+    publisher = EventPublisher(bot, path)
+    worker = WorkerBot("t", path, filter=lambda name, data: data.get("content") != "skip")
+    received: list[str] = []
+    raw: list[str] = []
+
+    @worker.listen()
+    async def on_message(event: MessageCreateEvent) -> None:
+        received.append(event.message.content)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(publisher.serve)
+        await _wait_for(path.exists)
+        tg.start_soon(worker.start)
+        await _wait_for(lambda: publisher.workers == 1)
+        await _wait_for(lambda: publisher._workers[0].events == {"MESSAGE_CREATE"})
+
+        async def on_typing(event_name: str, data: dict[str, object]) -> None:
+            raw.append(event_name)
+
+        worker.subscribe_raw(on_typing, "TYPING_START")
+        await bot._on_raw_dispatch("TYPING_START", {"channel_id": "2", "user_id": "3"})
+        await bot._on_raw_dispatch("MESSAGE_CREATE", _message("10", "skip"))
+        await bot._on_raw_dispatch("MESSAGE_CREATE", _message("11", "hello"))
+        await _wait_for(lambda: received == ["hello"])
+        # Not subscribed to when it connected, so never sent.
+        assert raw == []
+
+        await worker.resubscribe()
+        await _wait_for(lambda: "TYPING_START" in publisher._workers[0].events)
+        await bot._on_raw_dispatch("TYPING_START", {"channel_id": "2", "user_id": "3"})
+        await _wait_for(lambda: raw == ["TYPING_START"])
+        tg.cancel_scope.cancel()
+
+    assert not path.exists()
+    assert publisher.workers == 0
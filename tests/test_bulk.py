@@ -0,0 +1,68 @@
+import anyio
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+IDS = list(range(1, 8))
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(204)
+
+
+async def test_leaving_block_waits_for_everything(make_rest) -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return _ok(request)
+
+    rest = make_rest(handler)
+    async with rest.bulk_ban(1, IDS) as op:
+        pass
+    assert len(seen) == len(IDS)
+    assert op.succeeded == len(IDS)
+    assert op.remaining == []
+
+
+async def test_exception_in_block_cancels(make_rest) -> None:
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await anyio.sleep(1)
+        return _ok(request)
+
+    class Boom(Exception):
+        pass
+
+    rest = make_rest(slow)
+    with pytest.raises(Boom):
+        async with rest.bulk_kick(1, IDS) as op:
+            raise Boom
+    assert len(op.remaining) == len(IDS)
+
+
+async def test_cancel_stops_the_rest(make_rest) -> None:
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await anyio.sleep(1)
+        return _ok(request)
+
+    rest = make_rest(slow)
+    with anyio.fail_after(0.5):
+        async with rest.bulk_kick(1, IDS) as op:
+            op.cancel()
+    assert op.succeeded == 0
+    assert op.remaining == [*map(int, IDS)]
+
+
+async def test_failures_are_reported_per_id(make_rest) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/3"):
+            return httpx.Response(403, json={"code": 50013, "message": "Missing Permissions"})
+        return _ok(request)
+
+    rest = make_rest(handler)
+    async with rest.bulk_ban(1, IDS) as op:
+        results = await op.wait()
+    assert len(results) == len(IDS)
+    assert [r.id for r in op.failed] == [3]
+    assert op.succeeded == len(IDS) - 1
@@ -0,0 +1,61 @@
+import datetime
+import json
+
+import httpx
+import pytest
+
+from fluxcrystal.models.snowflake import Snowflake
+
+pytestmark = pytest.mark.anyio
+
+BULK_PATH = "/channels/1/messages/bulk-delete"
+
+
+def _ids(count: int, *, age: datetime.timedelta) -> list[Snowflake]:
+    base = Snowflake.from_datetime(datetime.datetime.now(datetime.timezone.utc) - age)
+    return [Snowflake(base + i) for i in range(count)]
+
+
+def _recorder() -> tuple[list[list[str]], list[str], object]:
+    bulk: list[list[str]] = []
+    single: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == BULK_PATH:
+            bulk.append(json.loads(request.content)["messages"])
+        else:
+            single.append(request.url.path.rsplit("/", 1)[1])
+        return httpx.Response(204)
+
+    return bulk, single, handler
+
+
+async def test_recent_messages_go_in_chunks_of_100(make_rest) -> None:
+    bulk, single, handler = _recorder()
+    ids = _ids(250, age=datetime.timedelta(minutes=5))
+    results = await make_rest(handler).bulk_delete_messages(1, ids)
+    assert sorted(map(len, bulk)) == [50, 100, 100]
+    assert single == []
+    assert [r.id for r in results] == ids
+    assert all(r.ok for r in results)
+
+
+async def test_old_messages_and_leftovers_are_deleted_one_by_one(make_rest) -> None:
+    bulk, single, handler = _recorder()
+    old = _ids(2, age=datetime.timedelta(days=15))
+    recent = _ids(101, age=datetime.timedelta(minutes=5))
+    await make_rest(handler).bulk_delete_messages(1, [*old, *recent])
+    assert [len(chunk) for chunk in bulk] == [100]
+    assert sorted(single) == sorted(str(m) for m in [*old, recent[-1]])
+
+
+async def test_failed_chunk_fails_each_message(make_rest) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == BULK_PATH:
+            return httpx.Response(403, json={"code": 50013, "message": "Missing Permissions"})
+        return httpx.Response(204)
+
+    ids = _ids(3, age=datetime.timedelta(minutes=5))
+    results = await make_rest(handler).bulk_delete_messages(1, [*ids, ids[0]])
+    assert len(results) == 3
+    assert not any(r.ok for r in results)
@@ -0,0 +1,270 @@
+from typing import Any
+
+import pytest
+
+from fluxcrystal.cache import Cache
+from fluxcrystal.models.permissions import Permissions
+from fluxcrystal.models.snowflake import Snowflake
+
+GUILD = "100"
+
+
+def _user(user_id: str) -> dict[str, Any]:
+    return {"id": user_id, "username": f"u{user_id}", "discriminator": "0"}
+
+
+def _member(user_id: str, *roles: str, guild_id: str = GUILD) -> dict[str, Any]:
+    return {
+        "guild_id": guild_id,
+        "user": _user(user_id),
+        "roles": list(roles),
+        "joined_at": "2024-01-01T00:00:00+00:00",
+    }
+
+
+def _role(role_id: str, permissions: int) -> dict[str, Any]:
+    return {"id": role_id, "name": f"r{role_id}", "permissions": str(permissions)}
+
+
+def _guild(**overrides: Any) -> dict[str, Any]:
+    return {"id": GUILD, "name": "guild", "owner_id": "1", "roles": [], **overrides}
+
+
+def test_members_share_cached_users() -> None:
+    cache = Cache()
+    cache._update("GUILD_CREATE", _guild(members=[_member("2")]))
+    cache._update("GUILD_MEMBER_ADD", _member("2", guild_id="101"))
+    first = cache.get_member(GUILD, 2)
+    second = cache.get_member(101, "2")
+    assert first is not None and second is not None
+    assert first.user is second.user is cache.get_user(2)
+
+    cache._update("GUILD_MEMBER_UPDATE", {**_member("2"), "user": {**_user("2"), "username": "new"}})
+    assert second.user.username == "new"
+
+
+def test_member_remove_and_guild_delete() -> None:
+    cache = Cache()
+    cache._update("GUILD_CREATE", _guild(members=[_member("2"), _member("3")]))
+    cache._update("GUILD_MEMBER_REMOVE", {"guild_id": GUILD, "user": _user("2")})
+    assert cache.get_member(GUILD, 2) is None
+    assert [m.user.id for m in cache.iter_members(GUILD)] == [3]
+
+    cache._update("GUILD_DELETE", {"id": GUILD})
+    assert cache.members == {}
+    assert list(cache.iter_members(GUILD)) == []
+
+
+def _permission_cache() -> Cache:
+    cache = Cache()
+    cache._update(
+        "GUILD_CREATE",
+        _guild(
+            roles=[
+                _role(GUILD, Permissions.VIEW_CHANNEL),
+                _role("200", Permissions.SEND_MESSAGES),
+                _role("201", Permissions.ADMINISTRATOR),
+            ],
+            members=[_member("2", "200"), _member("3", "201"), _member("4")],
+        ),
+    )
+    return cache
+
+
+def test_permissions_combine_roles() -> None:
+    cache = _permission_cache()
+    assert cache.compute_permissions(GUILD, 2) == Permissions.VIEW_CHANNEL | Permissions.SEND_MESSAGES
+    assert cache.compute_permissions(GUILD, 4) == Permissions.VIEW_CHANNEL
+    assert cache.compute_permissions(GUILD, 3) == Permissions.all()
+    assert cache.compute_permissions(GUILD, 1) is None  # owner, but not a cached member
+    assert cache.compute_permissions(GUILD, 99) is None
+
+
+def test_permission_memo_ignores_role_order() -> None:
+    cache = _permission_cache()
+    cache._update("GUILD_MEMBER_ADD", _member("5", "200", "201"))
+    cache._update("GUILD_MEMBER_ADD", _member("6", "201", "200"))
+    assert cache.compute_permissions(GUILD, 5) == cache.compute_permissions(GUILD, 6)
+    assert len(cache._permission_memo[Snowflake(GUILD)][1]) == 1
+
+
+def test_role_changes_invalidate_permissions() -> None:
+    cache = _permission_cache()
+    assert not cache.compute_permissions(GUILD, 2) & Permissions.KICK_MEMBERS
+    cache._update(
+        "GUILD_ROLE_UPDATE",
+        {"guild_id": GUILD, "role": _role("200", Permissions.SEND_MESSAGES | Permissions.KICK_MEMBERS)},
+    )
+    assert cache.compute_permissions(GUILD, 2) & Permissions.KICK_MEMBERS
+    cache._update("GUILD_ROLE_DELETE", {"guild_id": GUILD, "role_id": "200"})
+    assert cache.compute_permissions(GUILD, 2) == Permissions.VIEW_CHANNEL
+    assert cache.members_with_role(GUILD, 200) == []
+    assert 200 not in cache._role_members[Snowflake(GUILD)]
+    # Dropping the deleted role from the member later is fine too.
+    cache._update("GUILD_MEMBER_UPDATE", _member("2"))
+    assert cache.get_member(GUILD, 2).roles == []
+
+
+def test_members_with_role_follows_updates() -> None:
+    cache = _permission_cache()
+    assert [m.user.id for m in cache.members_with_role(GUILD, 200)] == [2]
+    cache._update("GUILD_MEMBER_UPDATE", _member("2", "201"))
+    assert cache.members_with_role(GUILD, 200) == []
+    assert sorted(m.user.id for m in cache.members_with_role(GUILD, 201)) == [2, 3]
+    assert cache.compute_permissions(GUILD, 2) == Permissions.all()
+
+
+def test_channel_overwrites() -> None:
+    cache = _permission_cache()
+    cache._update(
+        "CHANNEL_CREATE",
+        {
+            "id": "300",
+            "type": 0,
+            "guild_id": GUILD,
+            "permission_overwrites": [
+                {"id": GUILD, "type": 0, "allow": "0", "deny": str(Permissions.VIEW_CHANNEL)},
+                {"id": "200", "type": 0, "allow": str(Permissions.VIEW_CHANNEL), "deny": "0"},
+                {"id": "2", "type": 1, "allow": "0", "deny": str(Permissions.SEND_MESSAGES)},
+            ],
+        },
+    )
+    assert cache.compute_channel_permissions(300, 2) == Permissions.VIEW_CHANNEL
+    assert cache.compute_channel_permissions(300, 4) == Permissions(0)
+    assert cache.compute_channel_permissions(300, 3) == Permissions.all()
+
+
+def _channel(channel_id: str, *, parent: str | None = None, position: int = 0) -> dict[str, Any]:
+    return {"id": channel_id, "type": 0, "guild_id": GUILD, "parent_id": parent, "position": position}
+
+
+def test_channel_indexes() -> None:
+    cache = Cache()
+    cache._update(
+        "GUILD_CREATE",
+        _guild(channels=[
+            {"id": "300", "type": 4, "position": 0},
+            _channel("301", parent="300", position=2),
+            _channel("302", parent="300", position=1),
+        ]),
+    )
+    assert sorted(c.id for c in cache.guild_channels(GUILD)) == [300, 301, 302]
+    assert [c.id for c in cache.children(300)] == [302, 301]
+
+    # Moving a channel keeps both indexes in sync.
+    cache._update("CHANNEL_UPDATE", {"id": "302", "position": 5})
+    assert [c.id for c in cache.children(300)] == [301, 302]
+    cache._update("CHANNEL_UPDATE", {"id": "301", "parent_id": None})
+    assert [c.id for c in cache.children(300)] == [302]
+
+    cache._update("CHANNEL_DELETE", {"id": "302"})
+    assert cache.children(300) == []
+    assert sorted(c.id for c in cache.guild_channels(GUILD)) == [300, 301]
+
+    cache._update("GUILD_DELETE", {"id": GUILD})
+    assert cache.guild_channels(GUILD) == []
+    assert cache.channels == {}
+
+
+def test_deleting_a_category_drops_its_children_index() -> None:
+    cache = Cache()
+    cache._update("CHANNEL_CREATE", {"id": "300", "type": 4, "guild_id": GUILD})
+    cache._update("CHANNEL_CREATE", _channel("301", parent="300"))
+    cache._update("CHANNEL_DELETE", {"id": "300"})
+    assert cache.children(300) == []
+    assert 300 not in cache._channel_children
+
+
+def _message(message_id: int, channel_id: str = "2", **overrides: Any) -> dict[str, Any]:
+    return {
+        "id": str(message_id),
+        "channel_id": channel_id,
+        "author": _user("3"),
+        "content": f"m{message_id}",
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        **overrides,
+    }
+
+
+def test_messages_are_only_cached_on_request() -> None:
+    cache = Cache()
+    cache._update("MESSAGE_CREATE", _message(1))
+    assert cache.get_message(1) is None
+    assert cache.get_user(3) is not None
+
+
+def test_per_channel_limit_evicts_oldest() -> None:
+    cache = Cache(max_messages=100, max_messages_per_channel=3)
+    for message_id in range(1, 6):
+        cache._update("MESSAGE_CREATE", _message(message_id))
+    cache._update("MESSAGE_CREATE", _message(6, channel_id="7"))
+    assert [m.id for m in cache.channel_messages(2)] == [3, 4, 5]
+    assert cache.get_message(2) is None
+    assert len(cache._messages) == 4
+
+
+def test_global_limit_evicts_oldest_across_channels() -> None:
+    cache = Cache(max_messages=3, max_messages_per_channel=10)
+    cache._update("MESSAGE_CREATE", _message(1, channel_id="7"))
+    for message_id in range(2, 5):
+        cache._update("MESSAGE_CREATE", _message(message_id))
+    assert cache.get_message(1) is None
+    assert cache.channel_messages(7) == []
+    assert 7 not in cache._channel_messages
+    assert [m.id for m in cache.channel_messages(2)] == [2, 3, 4]
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"max_messages": -1}, {"max_messages_per_channel": 0}, {"max_messages_per_channel": -5}]
+)
+def test_bad_message_limits_are_rejected(kwargs: dict[str, int]) -> None:
+    with pytest.raises(ValueError):
+        Cache(**kwargs)
+
+
+def test_message_deletes_unlink_from_channel() -> None:
+    cache = Cache(max_messages=10)
+    for message_id in range(1, 5):
+        cache._update("MESSAGE_CREATE", _message(message_id))
+    deleted = cache._update("MESSAGE_DELETE", {"id": "2", "channel_id": "2"})
+    assert deleted is not None and deleted.id == 2
+    cache._update("MESSAGE_DELETE_BULK", {"ids": ["1", "4"], "channel_id": "2"})
+    assert [m.id for m in cache.channel_messages(2)] == [3]
+    cache._update("CHANNEL_DELETE", {"id": "2"})
+    assert cache._messages == {}
+
+
+def test_updates_patch_in_place_and_return_snapshots() -> None:
+    cache = Cache()
+    cache._update("GUILD_CREATE", _guild(roles=[_role("200", 0)], members=[_member("2")]))
+    guild = cache.get_guild(GUILD)
+    role = cache.get_role(GUILD, 200)
+
+    before = cache._update("GUILD_UPDATE", {"id": GUILD, "name": "renamed", "roles": [_role("200", 8)]})
+    assert cache.get_guild(GUILD) is guild and guild.name == "renamed"
+    assert cache.get_role(GUILD, 200) is role and role.permissions == 8
+    assert before.name == "guild"
+    assert before.roles[200].permissions == 0
+
+    member = cache.get_member(GUILD, 2)
+    before = cache._update(
+        "GUILD_MEMBER_UPDATE", {**_member("2"), "nick": "nick", "user": {**_user("2"), "username": "new"}}
+    )
+    assert cache.get_member(GUILD, 2) is member and member.nick == "nick"
+    assert before.nick is None and before.user.username == "u2"
+
+    cache._update("CHANNEL_CREATE", _channel("301"))
+    channel = cache.get_channel(301)
+    before = cache._update("CHANNEL_UPDATE", {"id": "301", "name": "general"})
+    assert cache.get_channel(301) is channel and channel.name == "general"
+    assert before.name is None and before.type == 0
+
+
+def test_message_update_keeps_unsent_fields() -> None:
+    cache = Cache(max_messages=10)
+    cache._update("MESSAGE_CREATE", _message(1))
+    message = cache.get_message(1)
+    before = cache._update("MESSAGE_UPDATE", {"id": "1", "channel_id": "2", "content": "edited"})
+    assert cache.get_message(1) is message
+    assert message.content == "edited" and message.author.id == 3
+    assert before.content == "m1"
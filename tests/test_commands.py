@@ -0,0 +1,133 @@
+import pytest
+
+from fluxcrystal.bot import GatewayBot
+from fluxcrystal.commands import Command, CommandRouter, Context
+from fluxcrystal.errors import ArgumentError, CommandError
+
+
+async def _noop(ctx: Context) -> None:
+    pass
+
+
+def _router(**kwargs: object) -> CommandRouter:
+    return CommandRouter(GatewayBot("t"), prefixes=("!", "?"), **kwargs)  # type: ignore[arg-type]
+
+
+def test_resolve_prefixes_and_rest() -> None:
+    router = _router()
+    ping = router.command()(_noop)
+    assert router.resolve("!_noop hello there") == (ping, "!", "_noop", "hello there")
+    assert router.resolve("?_noop")[:3] == (ping, "?", "_noop")  # type: ignore[index]
+    assert router.resolve("_noop") is None
+    assert router.resolve("! _noop") is None
+    assert router.resolve("!missing") is None
+
+
+def test_subcommands() -> None:
+    router = _router()
+    tag = router.command("tag")(_noop)
+    add = tag.command("add", aliases=("new",))(_noop)
+    assert router.resolve("!tag add x y")[0] is add  # type: ignore[index]
+    assert router.resolve("!tag new x")[0] is add  # type: ignore[index]
+    assert router.resolve("!tag other")[0] is tag  # type: ignore[index]
+    assert add.qualified_name == "tag add"
+
+
+def test_case_insensitive_subcommands() -> None:
+    router = _router(case_insensitive=True)
+    tag = router.command("Tag")(_noop)
+    add = tag.command("Add")(_noop)
+    deep = add.command("Many")(_noop)
+    assert router.resolve("!TAG ADD x")[0] is add  # type: ignore[index]
+    assert router.resolve("!tag add many")[0] is deep  # type: ignore[index]
+
+
+def test_case_insensitive_router_rekeys_existing_children() -> None:
+    router = _router(case_insensitive=True)
+    tag = Command(_noop, name="Tag")
+    add = tag.command("Add")(_noop)
+    router.add_command(tag)
+    assert router.resolve("!tag add")[0] is add  # type: ignore[index]
+
+
+def test_case_sensitive_by_default() -> None:
+    router = _router()
+    tag = router.command("tag")(_noop)
+    tag.command("Add")(_noop)
+    assert router.resolve("!tag add")[0] is tag  # type: ignore[index]
+    assert router.resolve("!TAG") is None
+
+
+def _message(content: str) -> dict[str, object]:
+    return {
+        "id": "10",
+        "channel_id": "2",
+        "author": {"id": "3", "username": "someone", "discriminator": "0"},
+        "content": content,
+        "timestamp": "2024-01-01T00:00:00+00:00",
+    }
+
+
+@pytest.mark.anyio
+async def test_optional_arguments_fall_back_to_their_default() -> None:
+    router = _router()
+    calls: list[tuple[int, str]] = []
+    errors: list[CommandError] = []
+
+    @router.command()
+    async def echo(ctx: Context, times: int = 1, *, text: str) -> None:
+        calls.append((times, text))
+
+    @router.on_error
+    async def on_error(ctx: Context, error: CommandError) -> None:
+        errors.append(error)
+
+    await router._on_message_create("MESSAGE_CREATE", _message("!echo hello world"))
+    await router._on_message_create("MESSAGE_CREATE", _message("!echo 3 hi"))
+    await router._on_message_create("MESSAGE_CREATE", _message("!echo"))
+    assert calls == [(1, "hello world"), (3, "hi")]
+    assert len(errors) == 1 and "text" in str(errors[0])
+
+
+@pytest.mark.anyio
+async def test_required_arguments_still_fail_to_convert() -> None:
+    router = _router()
+    errors: list[CommandError] = []
+
+    @router.command()
+    async def repeat(ctx: Context, times: int, text: str) -> None:
+        raise AssertionError("shouldn't run")
+
+    @router.on_error
+    async def on_error(ctx: Context, error: CommandError) -> None:
+        errors.append(error)
+
+    await router._on_message_create("MESSAGE_CREATE", _message("!repeat hello world"))
+    (error,) = errors
+    assert isinstance(error, ArgumentError) and "times" in str(error)
+
+
+@pytest.mark.anyio
+async def test_optional_argument_reports_a_word_nothing_takes() -> None:
+    router = _router()
+    calls: list[object] = []
+    errors: list[CommandError] = []
+
+    @router.command()
+    async def purge(ctx: Context, count: int = 100) -> None:
+        calls.append(count)
+
+    @router.command()
+    async def slowmode(ctx: Context, seconds: int | None = None) -> None:
+        calls.append(seconds)
+
+    @router.on_error
+    async def on_error(ctx: Context, error: CommandError) -> None:
+        errors.append(error)
+
+    await router._on_message_create("MESSAGE_CREATE", _message("!purge abc"))
+    await router._on_message_create("MESSAGE_CREATE", _message("!purge"))
+    await router._on_message_create("MESSAGE_CREATE", _message("!slowmode abc"))
+    assert calls == [100, None]
+    (error,) = errors
+    assert isinstance(error, ArgumentError) and "count" in str(error)
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+from fluxcrystal.bot import GatewayBot
+from fluxcrystal.cooldowns import BucketType, Cooldown, FixedWindowCooldown, TokenBucketCooldown
+from fluxcrystal.events.base import Event
+from fluxcrystal.events.guilds import GuildMemberAddEvent, GuildMemberRemoveEvent
+
+
+def _member_add(user_id: str) -> GuildMemberAddEvent:
+    data = {
+        "guild_id": "1",
+        "user": {"id": user_id, "username": "u", "discriminator": "0"},
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "roles": [],
+    }
+    return GuildMemberAddEvent(SimpleNamespace(cache=None), data)
+
+
+def test_fixed_window() -> None:
+    cooldown = FixedWindowCooldown(2, 10.0)
+    user = SimpleNamespace(user_id=1)
+    assert cooldown.hit(user, now=0.0) == 0.0
+    assert cooldown.hit(user, now=1.0) == 0.0
+    assert cooldown.hit(user, now=2.0) == 8.0
+    assert cooldown.hit(user, now=10.5) == 0.0
+
+
+def test_token_bucket_refills() -> None:
+    cooldown = TokenBucketCooldown(2, 10.0)
+    user = SimpleNamespace(user_id=1)
+    assert cooldown.hit(user, now=0.0) == 0.0
+    assert cooldown.hit(user, now=0.0) == 0.0
+    assert cooldown.hit(user, now=0.0) == 5.0
+    assert cooldown.hit(user, now=5.0) == 0.0
+
+
+def test_member_events_are_per_user() -> None:
+    cooldown = FixedWindowCooldown(1, 10.0)
+    assert cooldown.key_for(_member_add("5")) == 5
+    assert cooldown.hit(_member_add("5"), now=0.0) == 0.0
+    assert cooldown.hit(_member_add("6"), now=0.0) == 0.0
+    assert cooldown.hit(_member_add("5"), now=0.0) > 0
+
+
+def test_unknown_key_is_not_limited() -> None:
+    cooldown = FixedWindowCooldown(1, 10.0)
+    anonymous = SimpleNamespace()
+    for _ in range(3):
+        assert cooldown.hit(anonymous, now=0.0) == 0.0
+    assert len(cooldown) == 0
+    member = FixedWindowCooldown(1, 10.0, bucket=BucketType.MEMBER)
+    assert member.hit(anonymous, now=0.0) == member.hit(anonymous, now=0.0) == 0.0
+
+
+def test_global_bucket_is_shared() -> None:
+    cooldown = FixedWindowCooldown(1, 10.0, bucket=BucketType.GLOBAL)
+    assert cooldown.hit(SimpleNamespace(user_id=1), now=0.0) == 0.0
+    assert cooldown.hit(SimpleNamespace(user_id=2), now=0.0) > 0
+
+
+def test_expired_entries_are_dropped() -> None:
+    cooldown = FixedWindowCooldown(1, 1.0)
+    for i in range(10):
+        cooldown.hit(SimpleNamespace(user_id=i), now=0.0)
+    assert len(cooldown) == 10
+    cooldown.hit(SimpleNamespace(user_id=99), now=5.0)
+    assert len(cooldown) == 1
+
+
+def test_base_class_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        Cooldown(1, 1.0)  # type: ignore[abstract]
+
+
+@pytest.mark.anyio
+async def test_listener_cooldowns_are_kept_per_event_type() -> None:
+    bot = GatewayBot("t")
+    seen: list[str] = []
+
+    async def on_member(event: Event) -> None:
+        seen.append(type(event).__name__)
+
+    bot.subscribe(GuildMemberAddEvent, on_member, cooldown=FixedWindowCooldown(1, 60.0))
+    bot.subscribe(GuildMemberRemoveEvent, on_member, cooldown=FixedWindowCooldown(2, 60.0))
+    removed = GuildMemberRemoveEvent(bot, {"guild_id": "1", "user": {"id": "2", "username": "u", "discriminator": "0"}})
+    for _ in range(2):
+        await bot.dispatch(_member_add("2"))
+        await bot.dispatch(removed)
+    assert seen == ["GuildMemberAddEvent", "GuildMemberRemoveEvent", "GuildMemberRemoveEvent"]
+
+    bot.unsubscribe(GuildMemberAddEvent, on_member)
+    assert list(bot._cooldowns) == [(GuildMemberRemoveEvent, on_member)]
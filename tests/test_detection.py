@@ -0,0 +1,90 @@
+import pytest
+
+from fluxcrystal.bot import GatewayBot
+from fluxcrystal.detection import RaidDetector, SpamDetector
+from fluxcrystal.events.moderation import SpamDetectedEvent
+
+pytestmark = pytest.mark.anyio
+
+
+def test_flood_mixed_id_types() -> None:
+    detector = SpamDetector(GatewayBot("t"), message_limit=3, message_window=5.0)
+    assert detector.observe("1", "2", "10", "a", now=0.0) is None
+    assert detector.observe(1, 2, 11, "b", now=1.0) is None
+    reason, ids = detector.observe("1", 2, "12", "c", now=2.0)  # type: ignore[misc]
+    assert reason == "flood"
+    assert ids == [10, 11, 12]
+
+
+def test_duplicates() -> None:
+    detector = SpamDetector(GatewayBot("t"), message_limit=10, duplicate_limit=3)
+    for i in range(2):
+        assert detector.observe(None, 2, i, "Buy now", now=float(i)) is None
+    assert detector.observe(None, 2, 2, "buy NOW ", now=2.0) == ("duplicate", [0, 1, 2])
+
+
+def test_tracked_users_are_bounded() -> None:
+    detector = SpamDetector(GatewayBot("t"), max_tracked_users=2)
+    for user in range(5):
+        detector.observe(1, user, user, "hi", now=0.0)
+    assert len(detector) == 2
+
+
+def test_raid_fires_once_per_burst() -> None:
+    detector = RaidDetector(GatewayBot("t"), join_limit=3, join_window=10.0)
+    assert detector.observe("1", "10", now=0.0) is None
+    assert detector.observe(1, 11, now=1.0) is None
+    assert detector.observe("1", 12, now=2.0) == [10, 11, 12]
+    assert detector.is_raiding(1) and detector.is_raiding("1")
+    assert detector.observe(1, 13, now=3.0) is None
+    assert detector.observe(1, 14, now=30.0) is None
+    assert not detector.is_raiding(1)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"message_limit": 0},
+        {"duplicate_limit": -1},
+        {"message_window": 0},
+        {"duplicate_window": -5.0},
+        {"max_tracked_users": 0},
+    ],
+)
+def test_spam_limits_are_validated(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        SpamDetector(GatewayBot("t"), **kwargs)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"join_limit": 0}, {"join_window": 0}, {"max_tracked_guilds": 0}]
+)
+def test_raid_limits_are_validated(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        RaidDetector(GatewayBot("t"), **kwargs)  # type: ignore[arg-type]
+
+
+async def test_spam_event_dispatched() -> None:
+    bot = GatewayBot("t")
+    SpamDetector(bot, message_limit=2, message_window=5.0)
+    events: list[SpamDetectedEvent] = []
+
+    @bot.listen()
+    async def on_spam(event: SpamDetectedEvent) -> None:
+        events.append(event)
+
+    for i in range(2):
+        await bot._on_raw_dispatch(
+            "MESSAGE_CREATE",
+            {
+                "id": str(100 + i),
+                "channel_id": "5",
+                "guild_id": "1",
+                "author": {"id": "2", "username": "u", "discriminator": "0"},
+                "content": f"m{i}",
+            },
+        )
+    (event,) = events
+    assert event.reason == "flood"
+    assert event.user_id == 2
+    assert event.message_ids == [100, 101]
@@ -0,0 +1,108 @@
+import pickle
+
+import pytest
+
+from fluxcrystal.errors import EmbedTooLargeError
+from fluxcrystal.models.messages import EmbedBuilder, EmbedTemplate, RichEmbed
+
+
+def test_derived_embeds_dont_share_fields() -> None:
+    a = RichEmbed().with_field("a", "1")
+    b = a.with_title("x")
+    b.fields.append(b.fields[0])
+    assert len(a.fields) == 1
+    assert len(b.fields) == 2
+
+
+def test_derived_embeds_dont_share_nested_dicts() -> None:
+    a = RichEmbed().with_author("me")
+    b = a.with_title("x")
+    assert b.author is not None
+    b.author["name"] = "you"
+    assert a.author == {"name": "me"}
+    c = RichEmbed()
+    assert c.footer is not None
+    c.footer["text"] = "changed"
+    assert RichEmbed().footer != c.footer
+
+
+def test_assignment_invalidates_cached_payload() -> None:
+    embed = RichEmbed().with_title("before")
+    assert embed.to_payload()["title"] == "before"
+    embed.title = "changed"
+    assert embed.to_payload()["title"] == "changed"
+
+
+def test_in_place_changes_show_up_in_payload() -> None:
+    embed = RichEmbed().with_title("t").with_field("a", "1")
+    assert len(embed.to_payload()["fields"]) == 1
+    embed.fields.append(embed.fields[0])
+    assert embed.footer is not None
+    embed.footer["text"] = "changed"
+    payload = embed.to_payload()
+    assert len(payload["fields"]) == 2
+    assert payload["footer"]["text"] == "changed"
+
+
+def test_with_field_leaves_original_alone() -> None:
+    base = RichEmbed().with_title("t")
+    for i in range(3):
+        base.with_field(str(i), "v")
+    assert base.fields == []
+
+
+def test_limits_are_checked() -> None:
+    embed = RichEmbed()
+    for i in range(26):
+        embed = embed.with_field(str(i), "v")
+    with pytest.raises(EmbedTooLargeError):
+        embed.to_payload()
+    with pytest.raises(EmbedTooLargeError):
+        RichEmbed().with_title("x" * 257).to_payload()
+
+
+def test_builder_matches_rich_embed() -> None:
+    rich = RichEmbed().with_title("t").with_field("a", "1", inline=True)
+    built = EmbedBuilder().with_title("t").with_field("a", "1", inline=True)
+    assert built.to_payload() == rich.to_payload()
+    assert built.build().to_payload() == rich.to_payload()
+
+
+def test_pickle_round_trip() -> None:
+    embed = RichEmbed().with_title("t").with_field("a", "1")
+    assert pickle.loads(pickle.dumps(embed)).to_payload() == embed.to_payload()
+
+
+def test_template_renders_placeholders() -> None:
+    template = EmbedTemplate(
+        RichEmbed()
+        .with_title("{user}'s rank")
+        .with_description("Literal {{braces}}")
+        .with_field("Level", "{level}", inline=True)
+        .with_field("Static", "unchanged")
+    )
+    assert template.placeholders == {"user", "level"}
+    first = template.render(user="ann", level=7)
+    second = template.render(user="bob", level=8)
+    assert first["title"] == "ann's rank"
+    assert first["description"] == "Literal {braces}"
+    assert [f["value"] for f in first["fields"]] == ["7", "unchanged"]
+    assert second["fields"][0]["value"] == "8"
+    # Static parts are shared with the template rather than copied.
+    assert first["fields"][1] is second["fields"][1]
+
+
+def test_template_errors() -> None:
+    template = EmbedTemplate(RichEmbed().with_title("{title}"))
+    with pytest.raises(KeyError):
+        template.render()
+    with pytest.raises(EmbedTooLargeError):
+        template.render(title="x" * 1000)
+    with pytest.raises(ValueError):
+        EmbedTemplate(RichEmbed().with_title("{0}"))
+
+
+def test_static_template_returns_one_payload() -> None:
+    template = EmbedTemplate(RichEmbed().with_title("hello"))
+    assert template.placeholders == frozenset()
+    assert template.render() is template.render()
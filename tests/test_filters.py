@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+from fluxcrystal.filters import FilterEngine, FilterRule
+
+
+def test_keywords_and_patterns() -> None:
+    engine = FilterEngine()
+    engine.set_rules(1, [
+        FilterRule("slurs", keywords=("badword", "worse")),
+        FilterRule("invites", patterns=(r"discord\.gg/\w+",)),
+    ])
+    assert engine.match(1, "a BADWORD here") == {"slurs"}
+    assert engine.match(1, "join discord.gg/abc and say worse") == {"slurs", "invites"}
+    assert engine.match(1, "nothing") == frozenset()
+    assert engine.match(2, "badword") == frozenset()
+
+
+def test_global_inline_flags_run_standalone() -> None:
+    engine = FilterEngine()
+    engine.set_rules(1, [
+        FilterRule("caseless", patterns=("(?i)foo",)),
+        FilterRule("plain", patterns=("bar",)),
+    ])
+    assert engine.match(1, "FOO bar") == {"caseless", "plain"}
+
+
+def test_add_rule_with_global_flag_keeps_existing_rules() -> None:
+    engine = FilterEngine()
+    engine.set_rules(1, [FilterRule("plain", patterns=("bar",))])
+    engine.add_rule(1, FilterRule("caseless", patterns=("(?i)foo",)))
+    assert {r.id for r in engine.rules(1)} == {"plain", "caseless"}
+    assert engine.match(1, "Foo") == {"caseless"}
+
+
+def test_failed_compile_leaves_rules_untouched(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = FilterEngine()
+    engine.set_rules(1, [FilterRule("plain", patterns=("bar",))])
+
+    def boom(*args: object) -> None:
+        raise re.error("boom")
+
+    monkeypatch.setattr("fluxcrystal.filters._PatternMatcher", boom)
+    with pytest.raises(re.error):
+        engine.add_rule(1, FilterRule("other", patterns=("baz",)))
+    assert [r.id for r in engine.rules(1)] == ["plain"]
+    assert engine.match(1, "bar") == {"plain"}
+
+
+def test_overlapping_matches_are_all_reported() -> None:
+    engine = FilterEngine()
+    engine.set_rules(1, [
+        FilterRule("a", patterns=("abc",)),
+        FilterRule("b", patterns=("bcd",)),
+    ])
+    assert engine.match(1, "abcd") == {"a", "b"}
+
+
+def test_remove_rule() -> None:
+    engine = FilterEngine()
+    engine.set_rules(1, [FilterRule("a", keywords=("x",)), FilterRule("b", keywords=("y",))])
+    assert engine.remove_rule(1, "a") is not None
+    assert engine.match(1, "x y") == {"b"}
+    assert engine.remove_rule(1, "missing") is None
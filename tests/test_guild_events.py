@@ -0,0 +1,75 @@
+import pytest
+
+from fluxcrystal.bot import GatewayBot
+from fluxcrystal.events.channels import ChannelUpdateEvent
+from fluxcrystal.events.guilds import GuildMemberUpdateEvent, GuildUpdateEvent
+
+pytestmark = pytest.mark.anyio
+
+GUILD = "100"
+USER = {"id": "2", "username": "u2", "discriminator": "0"}
+
+
+def _member(**overrides: object) -> dict[str, object]:
+    return {
+        "guild_id": GUILD,
+        "user": USER,
+        "nick": "nick",
+        "roles": ["200", "201"],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        **overrides,
+    }
+
+
+async def _member_updates(*updates: dict[str, object]) -> list[GuildMemberUpdateEvent]:
+    bot = GatewayBot("t")
+    events: list[GuildMemberUpdateEvent] = []
+
+    @bot.listen()
+    async def on_update(event: GuildMemberUpdateEvent) -> None:
+        events.append(event)
+
+    await bot._on_raw_dispatch(
+        "GUILD_CREATE", {"id": GUILD, "name": "g", "owner_id": "1", "members": [_member()]}
+    )
+    for update in updates:
+        await bot._on_raw_dispatch("GUILD_MEMBER_UPDATE", update)
+    return events
+
+
+async def test_reordered_roles_are_not_a_change() -> None:
+    (event,) = await _member_updates(_member(roles=["201", "200"]))
+    assert event.changes == frozenset()
+
+
+async def test_fields_left_out_are_not_a_change() -> None:
+    dropped_role, renamed = await _member_updates(
+        {"guild_id": GUILD, "user": USER, "roles": ["200"]},
+        {"guild_id": GUILD, "user": USER, "nick": "other"},
+    )
+    assert dropped_role.changes == {"roles"}
+    assert renamed.changes == {"nick"}
+
+
+async def test_update_events_carry_the_cached_instances() -> None:
+    bot = GatewayBot("t")
+    events: list[object] = []
+
+    @bot.listen()
+    async def on_guild(event: GuildUpdateEvent) -> None:
+        events.append(event)
+
+    @bot.listen()
+    async def on_channel(event: ChannelUpdateEvent) -> None:
+        events.append(event)
+
+    await bot._on_raw_dispatch("GUILD_CREATE", {"id": GUILD, "name": "g", "owner_id": "1"})
+    await bot._on_raw_dispatch("CHANNEL_CREATE", {"id": "300", "type": 0, "guild_id": GUILD})
+    await bot._on_raw_dispatch("GUILD_UPDATE", {"id": GUILD, "name": "renamed"})
+    await bot._on_raw_dispatch("CHANNEL_UPDATE", {"id": "300", "name": "general"})
+    guild_event, channel_event = events
+    assert isinstance(guild_event, GuildUpdateEvent) and isinstance(channel_event, ChannelUpdateEvent)
+    assert guild_event.guild is bot.cache.get_guild(GUILD)
+    assert guild_event.guild.name == "renamed" and guild_event.changes == {"name"}
+    assert channel_event.channel is bot.cache.get_channel(300)
+    assert channel_event.channel.name == "general" and channel_event.changes == {"name"}
@@ -0,0 +1,117 @@
+import pytest
+
+from fluxcrystal.bot import GatewayBot
+from fluxcrystal.events.messages import MessageCreateEvent, MessageUpdateEvent
+
+pytestmark = pytest.mark.anyio
+
+AUTHOR = {"id": "3", "username": "someone", "discriminator": "0"}
+
+
+def _message(**overrides: object) -> dict[str, object]:
+    return {
+        "id": "10",
+        "channel_id": "2",
+        "author": AUTHOR,
+        "content": "before",
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        **overrides,
+    }
+
+
+def _collect(bot: GatewayBot) -> list[MessageUpdateEvent]:
+    events: list[MessageUpdateEvent] = []
+
+    @bot.listen()
+    async def on_update(event: MessageUpdateEvent) -> None:
+        events.append(event)
+
+    return events
+
+
+async def test_partial_update_of_cached_message() -> None:
+    bot = GatewayBot("t", max_messages=10)
+    events = _collect(bot)
+    await bot._on_raw_dispatch("MESSAGE_CREATE", _message())
+    await bot._on_raw_dispatch(
+        "MESSAGE_UPDATE",
+        {"id": "10", "channel_id": "2", "content": "after", "edited_timestamp": "2024-01-01T00:01:00+00:00"},
+    )
+    (event,) = events
+    assert event.before is not None and event.before.content == "before"
+    assert event.message.content == "after"
+    assert event.message.author.id == 3
+    assert event.changes == {"content", "edited_timestamp"}
+
+
+async def test_partial_update_of_uncached_message() -> None:
+    bot = GatewayBot("t")
+    events = _collect(bot)
+    await bot._on_raw_dispatch("MESSAGE_UPDATE", {"id": "10", "channel_id": "2", "content": "after"})
+    (event,) = events
+    assert event.before is None
+    assert event.content == "after"
+    assert event.changes == frozenset()
+    assert event.message.author is None
+    assert "author=None" in repr(event)
+
+
+async def test_full_update_resolves_author() -> None:
+    bot = GatewayBot("t")
+    events = _collect(bot)
+    await bot._on_raw_dispatch("MESSAGE_UPDATE", _message(content="after"))
+    (event,) = events
+    assert event.message.author is bot.cache.get_user(3)
+
+
+async def test_events_share_the_cached_user() -> None:
+    bot = GatewayBot("t")
+    created: list[MessageCreateEvent] = []
+
+    @bot.listen()
+    async def on_create(event: MessageCreateEvent) -> None:
+        created.append(event)
+
+    await bot._on_raw_dispatch("MESSAGE_CREATE", _message())
+    await bot._on_raw_dispatch("MESSAGE_CREATE", _message(id="11", author={**AUTHOR, "username": "renamed"}))
+    first, second = created
+    assert first.message.author is second.message.author is bot.cache.get_user(3)
+    assert first.message.author.username == "renamed"
+
+
+async def test_referenced_message_author_comes_from_the_cache() -> None:
+    bot = GatewayBot("t", max_messages=10)
+    await bot._on_raw_dispatch("MESSAGE_CREATE", _message())
+    await bot._on_raw_dispatch(
+        "MESSAGE_CREATE", _message(id="11", referenced_message=_message(id="9"))
+    )
+    message = bot.cache.get_message(11)
+    assert message is not None and message.referenced_message is not None
+    assert message.referenced_message.author is bot.cache.get_user(3)
+
+
+async def test_create_event_leaves_the_author_unbuilt() -> None:
+    bot = GatewayBot("t")
+    created: list[MessageCreateEvent] = []
+
+    @bot.listen()
+    async def on_create(event: MessageCreateEvent) -> None:
+        created.append(event)
+
+    await bot._on_raw_dispatch("MESSAGE_CREATE", _message())
+    (event,) = created
+    assert event.message._author is None
+    assert event.author is bot.cache.get_user(3)
+
+
+async def test_create_event_reuses_the_cached_message() -> None:
+    bot = GatewayBot("t", max_messages=10)
+    created: list[MessageCreateEvent] = []
+
+    @bot.listen()
+    async def on_create(event: MessageCreateEvent) -> None:
+        created.append(event)
+
+    await bot._on_raw_dispatch("MESSAGE_CREATE", _message())
+    (event,) = created
+    assert event.message is bot.cache.get_message(10)
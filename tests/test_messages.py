@@ -0,0 +1,106 @@
+import datetime
+from typing import Any
+
+from fluxcrystal.cache import Cache
+from fluxcrystal.models.guilds import GuildMember
+from fluxcrystal.models.messages import Message
+from fluxcrystal.models.users import User
+
+AUTHOR = {"id": "3", "username": "someone", "discriminator": "0"}
+
+
+def _message(**overrides: Any) -> dict[str, Any]:
+    return {
+        "id": "10",
+        "channel_id": "2",
+        "author": AUTHOR,
+        "content": "hello",
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        **overrides,
+    }
+
+
+def test_nested_models_are_built_once_on_access() -> None:
+    message = Message(
+        _message(
+            embeds=[{"title": "t"}],
+            attachments=[{"id": "50", "filename": "a.png", "size": 1, "url": "u", "proxy_url": "p"}],
+        )
+    )
+    assert message._author is None and message._embeds is None and message._attachments is None
+    assert message.author is message.author
+    assert message.author.username == "someone"
+    assert message.embeds is message.embeds and message.embeds[0].title == "t"
+    assert message.attachments[0].filename == "a.png"
+
+
+def test_given_author_is_used_as_is() -> None:
+    author = User(AUTHOR)
+    assert Message(_message(), author=author).author is author
+
+
+def test_updates_rebuild_changed_embeds() -> None:
+    message = Message(_message(embeds=[{"title": "old"}]))
+    assert message.embeds[0].title == "old"
+    message._apply({"embeds": [{"title": "new"}]})
+    assert message.embeds[0].title == "new"
+
+
+def test_timestamps_are_parsed_once_and_reparsed_after_edits() -> None:
+    message = Message(_message())
+    assert message.created_at == datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    assert message.created_at is message.created_at
+    assert message.edited_at is None
+    message._apply({"edited_timestamp": "2024-01-02T00:00:00Z"})
+    assert message.edited_at == datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)
+
+
+def test_created_at_falls_back_to_the_id() -> None:
+    message = Message(_message(id=str(1 << 22), timestamp=""))
+    assert message.created_at == message.id.created_at
+
+
+def test_member_timeouts() -> None:
+    later = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+    member = GuildMember({"user": AUTHOR, "joined_at": "2024-01-01T00:00:00+00:00"})
+    assert member.joined_datetime.year == 2024
+    assert not member.is_timed_out
+    member._apply({"communication_disabled_until": later.isoformat()})
+    assert member.timed_out_until == later
+    assert member.is_timed_out
+
+
+def test_mentions() -> None:
+    message = Message(
+        _message(
+            mentions=[AUTHOR],
+            mention_roles=["20"],
+            mention_channels=[{"id": "30", "guild_id": "1", "type": 0, "name": "c"}],
+        )
+    )
+    assert message.mentioned_user_ids == {3}
+    assert message.mentions_user("3") and not message.mentions_user(4)
+    assert message.mentions_role(20) and not message.mentions_role(21)
+    assert message.mentioned_channel_ids == {30}
+    assert not Message(_message()).mentions_user(3)
+
+    message._apply({"mentions": []})
+    assert not message.mentions_user(3)
+
+
+def test_mentions_me() -> None:
+    cache = Cache()
+    data = _message(mentions=[AUTHOR])
+    assert not Message(data).mentions_me
+    assert not Message(data, cache=cache).mentions_me  # not logged in yet
+    cache.me = User(AUTHOR)
+    assert Message(data, cache=cache).mentions_me
+    assert not Message(_message(), cache=cache).mentions_me
+
+
+def test_referenced_message() -> None:
+    assert Message(_message()).referenced_message is None
+    message = Message(_message(referenced_message=_message(id="9", content="original")))
+    referenced = message.referenced_message
+    assert referenced is not None and referenced.id == 9 and referenced.content == "original"
+    assert message.referenced_message is referenced
@@ -0,0 +1,93 @@
+import json
+
+import anyio
+import httpx
+import pytest
+
+from fluxcrystal.errors import FluxCrystalError
+
+pytestmark = pytest.mark.anyio
+
+
+def _message(channel_id: str, message_id: str, content: str) -> dict[str, object]:
+    return {
+        "id": message_id,
+        "channel_id": channel_id,
+        "author": {"id": "9", "username": "bot", "discriminator": "0"},
+        "content": content,
+        "timestamp": "2024-01-01T00:00:00+00:00",
+    }
+
+
+async def test_burst_of_edits_is_one_request(make_rest) -> None:
+    sent: list[dict[str, object]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        sent.append(body)
+        return httpx.Response(200, json=_message("1", "2", body["content"]))
+
+    rest = make_rest(handler)
+    messages = []
+
+    async def edit(content: str) -> None:
+        messages.append(await rest.queue_edit(1, 2, content=content))
+
+    async with anyio.create_task_group() as tg:
+        for i in range(5):
+            tg.start_soon(edit, f"step {i}")
+            await anyio.sleep(0)
+    assert sent == [{"content": "step 4"}]
+    assert [m.content for m in messages] == ["step 4"] * 5
+
+
+async def test_edits_to_other_messages_arent_merged(make_rest) -> None:
+    paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return httpx.Response(200, json=_message("1", request.url.path.rsplit("/", 1)[1], "x"))
+
+    rest = make_rest(handler)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(lambda: rest.queue_edit(1, 2, content="a"))
+        tg.start_soon(lambda: rest.queue_edit(1, 3, content="b"))
+    assert sorted(paths) == ["/channels/1/messages/2", "/channels/1/messages/3"]
+
+
+async def test_failed_edit_reaches_every_caller(make_rest) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(403, json={"code": 50005, "message": "Cannot edit"})
+
+    rest = make_rest(handler)
+    errors: list[Exception] = []
+
+    async def edit(content: str) -> None:
+        try:
+            await rest.queue_edit(1, 2, content=content)
+        except FluxCrystalError as e:
+            errors.append(e)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(edit, "a")
+        tg.start_soon(edit, "b")
+    assert len(errors) == 2
+
+
+async def test_queued_messages_keep_their_order(make_rest) -> None:
+    sent: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        content = json.loads(request.content)["content"]
+        # Earlier messages are slower, so only the queue keeps them in order.
+        await anyio.sleep(0.01 * (5 - int(content)))
+        sent.append(content)
+        return httpx.Response(200, json=_message("1", content, content))
+
+    rest = make_rest(handler)
+    async with anyio.create_task_group() as tg:
+        for i in range(5):
+            tg.start_soon(lambda i=i: rest.queue_message(1, content=str(i)))
+            await anyio.sleep(0)
+    assert sent == ["0", "1", "2", "3", "4"]
+    assert rest._outbox_locks == {}
@@ -0,0 +1,163 @@
+import time
+
+import anyio
+import pytest
+
+from fluxcrystal.ratelimits import Priority, RateLimiter, route_key
+
+pytestmark = pytest.mark.anyio
+
+KEY = "GET /x"
+
+
+def _limits(limit: int, remaining: int, reset_after: float) -> dict[str, str]:
+    return {
+        "x-ratelimit-limit": str(limit),
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-reset-after": str(reset_after),
+    }
+
+
+def test_route_key() -> None:
+    assert route_key("DELETE", "/channels/1/messages/2") == "DELETE /channels/1/messages/:id"
+    assert route_key("GET", "/users/5") == "GET /users/:id"
+
+
+def test_window_is_learned_from_a_windows_first_response() -> None:
+    limiter = RateLimiter()
+    limiter.update(KEY, _limits(5, 4, 0.25))
+    assert limiter.bucket(KEY).window == 0.25
+    limiter.update(KEY, _limits(5, 4, 2.0))
+    assert limiter.bucket(KEY).window == 2.0
+
+
+def test_mid_window_responses_dont_shrink_the_window() -> None:
+    limiter = RateLimiter()
+    limiter.update(KEY, _limits(5, 4, 2.0))
+    limiter.update(KEY, _limits(5, 3, 0.1))
+    assert limiter.bucket(KEY).window == 2.0
+
+
+async def test_responses_dont_hand_back_slots_in_flight() -> None:
+    limiter = RateLimiter()
+    limiter.update(KEY, _limits(5, 4, 2.0))
+    bucket = limiter.bucket(KEY)
+    bucket.reset_at = 0.0  # that window is over
+    for _ in range(3):
+        await limiter.acquire(KEY)
+    assert bucket.remaining == 2
+    # The first of those three comes back from a window the server started a
+    # bit later than our guess; the other two are still in flight.
+    bucket.reset_at -= 1.0
+    limiter.update(KEY, _limits(5, 4, 2.0))
+    assert bucket.remaining == 2
+
+
+async def test_short_windows_are_not_paced_as_one_second() -> None:
+    limiter = RateLimiter()
+    limiter.update(KEY, _limits(2, 1, 0.05))
+    await limiter.acquire(KEY)
+    start = time.monotonic()
+    for _ in range(6):
+        await limiter.acquire(KEY)
+    # Three 50ms windows, not three 1s ones.
+    assert time.monotonic() - start < 0.5
+
+
+async def test_waiters_are_served_by_priority() -> None:
+    limiter = RateLimiter()
+    limiter.update(KEY, _limits(5, 0, 0.1))
+    order: list[Priority] = []
+
+    async def request(priority: Priority) -> None:
+        await limiter.acquire(KEY, priority)
+        order.append(priority)
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(request, Priority.LOW)
+        await anyio.sleep(0.01)
+        for _ in range(2):
+            tg.start_soon(request, Priority.HIGH)
+    assert order[:2] == [Priority.HIGH, Priority.HIGH]
+    assert limiter.stats[Priority.HIGH].count == 2
+    assert limiter.stats[Priority.LOW].count == 3
+
+
+async def test_low_priority_leaves_a_reserve() -> None:
+    limiter = RateLimiter()
+    limiter.update(KEY, _limits(5, 1, 10.0))
+    with anyio.move_on_after(0.05) as scope:
+        await limiter.acquire(KEY, Priority.LOW)
+    assert scope.cancelled_caught
+    with anyio.fail_after(0.05):
+        await limiter.acquire(KEY, Priority.HIGH)
+
+
+def test_snapshot() -> None:
+    limiter = RateLimiter()
+    limiter.update(KEY, {**_limits(5, 4, 1.0), "x-ratelimit-bucket": "abc"})
+    route = limiter.snapshot()["routes"][KEY]
+    assert route["bucket"] == "abc"
+    assert route["remaining"] == 4
+
+
+async def test_aged_low_priority_waiter_can_use_the_reserve() -> None:
+    limiter = RateLimiter()
+    limiter.update(KEY, _limits(5, 1, 10.0))  # only the reserved slot is left
+    bucket = limiter.bucket(KEY)
+    order: list[Priority] = []
+
+    async def request(priority: Priority) -> None:
+        await limiter.acquire(KEY, priority)
+        order.append(priority)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(request, Priority.LOW)
+        await anyio.sleep(0.01)
+        # Waited long enough to be at the head even with a HIGH one behind it.
+        bucket.waiters[0].since -= 15
+        tg.start_soon(request, Priority.HIGH)
+        await anyio.sleep(0.01)
+        bucket.waiters[0].wakeup.set()
+        await anyio.sleep(0.01)
+        tg.cancel_scope.cancel()
+    assert order == [Priority.LOW]
+
+
+async def test_waiters_follow_their_route_to_a_shared_bucket() -> None:
+    limiter = RateLimiter()
+    limiter.update("GET /y", {**_limits(5, 2, 10.0), "x-ratelimit-bucket": "s"})
+    limiter.update(KEY, _limits(5, 0, 10.0))
+    old = limiter.bucket(KEY)
+    shared = limiter.bucket("GET /y")
+
+    with anyio.fail_after(1):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(limiter.acquire, KEY)
+            await anyio.sleep(0.01)
+            assert len(old.waiters) == 1
+            # The API turns out to count this route against the shared bucket.
+            limiter.update(KEY, {**_limits(5, 2, 10.0), "x-ratelimit-bucket": "s"})
+    assert limiter.bucket(KEY) is shared
+    assert not old.waiters and not shared.waiters
+    assert shared.remaining == 1
+
+
+async def test_idle_buckets_are_pruned() -> None:
+    limiter = RateLimiter()
+    for channel in range(3):
+        headers = {**_limits(5, 4, 0.01), "x-ratelimit-bucket": str(channel)}
+        limiter.update(f"GET /channels/{channel}", headers)
+    limiter.update("GET /channels/open", _limits(5, 4, 60.0))
+    limiter.update(KEY, _limits(5, 4, 0.01))
+    limiter.rate_limited(KEY, 60.0, is_global=True)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(limiter.acquire, KEY)  # stuck behind the global limit
+        await anyio.sleep(0.02)
+        limiter._next_prune = 0.0
+        limiter.bucket("GET /channels/new")
+        # A window still open, or someone waiting, keeps a bucket around.
+        assert sorted(limiter._routes) == ["GET /channels/new", "GET /channels/open", KEY]
+        assert limiter._by_id == {}
+        tg.cancel_scope.cancel()
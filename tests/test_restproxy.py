@@ -0,0 +1,164 @@
+import anyio
+import httpx
+import pytest
+
+from fluxcrystal.restproxy import RESTProxy
+
+pytestmark = pytest.mark.anyio
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"url": str(request.url)})
+
+
+async def _raw_request(port: int, request: bytes) -> bytes:
+    async with await anyio.connect_tcp("127.0.0.1", port) as stream:
+        await stream.send(request)
+        response = b""
+        with anyio.move_on_after(2):
+            while b"\r\n\r\n" not in response:
+                response += await stream.receive()
+        return response
+
+
+async def test_forwards_under_api_base() -> None:
+    proxy = RESTProxy("http://api.test/v1", port=0, transport=httpx.MockTransport(_upstream))
+    async with anyio.create_task_group() as tg:
+        await tg.start(proxy.serve)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{proxy.port}") as client:
+            response = await client.get("/users/1", params={"a": "b"})
+        assert response.json() == {"url": "http://api.test/v1/users/1?a=b"}
+        tg.cancel_scope.cancel()
+
+
+@pytest.mark.parametrize(
+    "target",
+    [b"http://other-host/users/1", b"//other-host/users/1", b"/../users/1", b"/%2e%2e/x"],
+)
+async def test_rejects_targets_outside_api_base(target: bytes) -> None:
+    seen: list[httpx.Request] = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return _upstream(request)
+
+    proxy = RESTProxy("http://api.test/v1", port=0, transport=httpx.MockTransport(upstream))
+    async with anyio.create_task_group() as tg:
+        await tg.start(proxy.serve)
+        response = await _raw_request(
+            proxy.port,
+            b"GET " + target + b" HTTP/1.1\r\nHost: x\r\nAuthorization: Bot t\r\n\r\n",
+        )
+        assert response.startswith(b"HTTP/1.1 400")
+        assert not seen
+        tg.cancel_scope.cancel()
+
+
+async def test_bad_client_header_only_fails_its_request() -> None:
+    proxy = RESTProxy("http://api.test/v1", port=0, transport=httpx.MockTransport(_upstream))
+    async with anyio.create_task_group() as tg:
+        await tg.start(proxy.serve)
+        response = await _raw_request(
+            proxy.port,
+            b"GET /users/1 HTTP/1.1\r\nHost: x\r\nX-FluxCrystal-Client: \xff\xfe\r\n\r\n",
+        )
+        assert response.startswith(b"HTTP/1.1 200")
+        # The server is still up for everyone else.
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{proxy.port}") as client:
+            assert (await client.get("/users/2")).status_code == 200
+        tg.cancel_scope.cancel()
+
+
+async def test_handler_errors_stay_on_their_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    proxy = RESTProxy("http://api.test/v1", port=0, transport=httpx.MockTransport(_upstream))
+    original = proxy._handle_request
+
+    async def handle_request(request, body, peer):  # type: ignore[no-untyped-def]
+        if request.target == b"/boom":
+            raise RuntimeError("boom")
+        return await original(request, body, peer)
+
+    monkeypatch.setattr(proxy, "_handle_request", handle_request)
+    async with anyio.create_task_group() as tg:
+        await tg.start(proxy.serve)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{proxy.port}") as client:
+            assert (await client.get("/boom")).status_code == 502
+            assert (await client.get("/users/2")).status_code == 200
+        tg.cancel_scope.cancel()
+
+
+async def test_buckets_endpoint() -> None:
+    def upstream(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={},
+            headers={"x-ratelimit-limit": "5", "x-ratelimit-remaining": "4",
+                     "x-ratelimit-reset-after": "1", "x-ratelimit-bucket": "b"},
+        )
+
+    proxy = RESTProxy("http://api.test/v1", port=0, transport=httpx.MockTransport(upstream))
+    async with anyio.create_task_group() as tg:
+        await tg.start(proxy.serve)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{proxy.port}") as client:
+            await client.get("/users/1", headers={"Authorization": "Bot t"})
+            state = (await client.get("/_proxy/buckets")).json()
+        (limits,) = state.values()
+        assert limits["routes"]["GET /users/:id"]["limit"] == 5
+        tg.cancel_scope.cancel()
+
+
+async def test_clients_take_turns_however_many_connections_they_open() -> None:
+    served: list[str] = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        served.append(request.url.params.get("c", ""))
+        # One request per 50ms window, so everything after the first queues.
+        return httpx.Response(
+            200,
+            json={},
+            headers={"x-ratelimit-limit": "1", "x-ratelimit-remaining": "0",
+                     "x-ratelimit-reset-after": "0.05"},
+        )
+
+    proxy = RESTProxy("http://api.test/v1", port=0, transport=httpx.MockTransport(upstream))
+    async with anyio.create_task_group() as tg:
+        await tg.start(proxy.serve)
+        base_url = f"http://127.0.0.1:{proxy.port}"
+        # No client header, so the proxy goes by address; its connections
+        # all come from one host.
+        busy = httpx.AsyncClient(base_url=base_url)
+        quiet = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"X-FluxCrystal-Client": "quiet"},
+            limits=httpx.Limits(max_connections=1),
+        )
+        async with busy, quiet:
+            await busy.get("/users/1", params={"c": "prime"})
+            served.clear()
+
+            async def quiet_requests() -> None:
+                for _ in range(2):
+                    await quiet.get("/users/1", params={"c": "quiet"})
+
+            with anyio.fail_after(5):
+                async with anyio.create_task_group() as requests:
+                    for _ in range(4):  # concurrent, so on separate connections
+                        requests.start_soon(busy.get, "/users/1?c=busy")
+                    await anyio.sleep(0.01)
+                    requests.start_soon(quiet_requests)
+        tg.cancel_scope.cancel()
+    assert served.count("quiet") == 2
+    # Round-robin between the two clients, not between the five connections.
+    # The first busy request already had the turn; the quiet one goes next.
+    assert served[:4] == ["busy", "busy", "quiet", "busy"]
+
+
+def test_rest_client_identifies_itself_to_a_proxy() -> None:
+    from fluxcrystal.endpoint_client import RESTClient
+
+    proxied = RESTClient("http://127.0.0.1:8765")
+    assert proxied._client.headers["x-fluxcrystal-client"] == proxied.client_id
+    assert RESTClient("http://127.0.0.1:8765", client_id="w1")._client.headers[
+        "x-fluxcrystal-client"
+    ] == "w1"
+    assert "x-fluxcrystal-client" not in RESTClient()._client.headers
@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+
+from fluxcrystal.cache import Cache
+from fluxcrystal.models.messages import Message, RichEmbed
+from fluxcrystal.models.serialization import decode_model, encode_model
+
+MESSAGE = {
+    "id": "10",
+    "channel_id": "2",
+    "guild_id": "100",
+    "author": {"id": "3", "username": "someone", "discriminator": "0"},
+    "content": "hello",
+    "timestamp": "2024-01-01T00:00:00+00:00",
+    "embeds": [{"title": "t", "fields": [{"name": "a", "value": "1", "inline": True}]}],
+}
+
+
+def _cache() -> Cache:
+    cache = Cache()
+    cache._update(
+        "GUILD_CREATE",
+        {
+            "id": "100",
+            "name": "guild",
+            "owner_id": "3",
+            "roles": [{"id": "100", "name": "@everyone", "permissions": "1024"}],
+            "channels": [{"id": "2", "type": 0, "name": "general", "permission_overwrites": [
+                {"id": "100", "type": 0, "allow": "0", "deny": "2048"},
+            ]}],
+            "members": [{
+                "user": MESSAGE["author"],
+                "roles": ["100"],
+                "joined_at": "2024-01-01T00:00:00+00:00",
+            }],
+        },
+    )
+    return cache
+
+
+def _models() -> list[object]:
+    cache = _cache()
+    return [
+        cache.get_guild(100),
+        cache.get_channel(2),
+        cache.get_member(100, 3),
+        cache.get_user(3),
+        cache.get_role(100, 100),
+        Message(MESSAGE),
+        RichEmbed().with_title("x").with_field("a", "1"),
+    ]
+
+
+@pytest.mark.parametrize("model", _models(), ids=lambda m: type(m).__name__)
+def test_pickle_round_trip(model: object) -> None:
+    copy = pickle.loads(pickle.dumps(model))
+    assert type(copy) is type(model)
+    assert copy.to_dict() == model.to_dict()
+
+
+@pytest.mark.parametrize("model", _models(), ids=lambda m: type(m).__name__)
+def test_msgpack_round_trip(model: object) -> None:
+    pytest.importorskip("msgpack")
+    copy = decode_model(encode_model(model))
+    assert type(copy) is type(model)
+    assert copy.to_dict() == model.to_dict()
+
+
+def test_message_keeps_lazy_fields_through_pickle() -> None:
+    message = pickle.loads(pickle.dumps(Message(MESSAGE)))
+    assert message.author.id == 3
+    assert message.embeds[0].fields[0].name == "a"
+    assert message.created_at.year == 2024
+
+
+def test_unknown_models_and_tags() -> None:
+    pytest.importorskip("msgpack")
+    import msgpack
+
+    with pytest.raises(TypeError):
+        encode_model(object())  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        decode_model(msgpack.packb((999, {})))
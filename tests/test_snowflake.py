@@ -0,0 +1,34 @@
+import datetime
+import pickle
+
+from fluxcrystal.models.snowflake import FLUXER_EPOCH, Snowflake, _optional_snowflake
+
+
+def test_parts() -> None:
+    value = Snowflake((1234 << 22) | (3 << 17) | (5 << 12) | 42)
+    assert value.timestamp == FLUXER_EPOCH + 1234
+    assert value.worker_id == 3
+    assert value.process_id == 5
+    assert value.increment == 42
+
+
+def test_behaves_like_an_int() -> None:
+    value = Snowflake("175928847299117063")
+    assert value == 175928847299117063
+    assert {175928847299117063: "x"}[value] == "x"
+    assert str(value) == "175928847299117063"
+    assert pickle.loads(pickle.dumps(value)) == value
+    assert type(pickle.loads(pickle.dumps(value))) is Snowflake
+
+
+def test_datetimes_round_trip() -> None:
+    when = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+    value = Snowflake.from_datetime(when)
+    assert value.created_at == when
+    assert Snowflake.from_datetime(when.replace(tzinfo=None)) == value
+    assert Snowflake.from_datetime(datetime.datetime(2000, 1, 1)) == 0
+
+
+def test_optional() -> None:
+    assert _optional_snowflake(None) is None
+    assert _optional_snowflake("5") == 5